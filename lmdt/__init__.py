@@ -0,0 +1,2 @@
+# LMDT 劳动力市场数字孪生实验平台 —— 可导入的核心代码
+# 页面脚本 (pages/*.py) 只负责界面，算法统一放在 lmdt.engine 中
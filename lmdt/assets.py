@@ -0,0 +1,105 @@
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+# ==========================================
+# 静态资源 (CSS 样式表与本地图片)
+# ==========================================
+# lmdt/styles/<name>.css 压缩后按内容哈希命名写入 STATIC_DIR/css/，由 Streamlit 静态服务
+# (server.enableStaticServing) 提供：文件名随内容变化，浏览器每个版本只下载一次。
+# 页面每次重跑只发送一条 @import 与几个主题色变量，不再发送整段样式表。
+# 未开启静态服务或静态目录不可写时退回内联样式，图片则改由本地文件发送，离线同样可用。
+STYLE_DIR = Path(__file__).resolve().parent / "styles"
+STATIC_DIR = Path(os.environ.get("LMDT_STATIC_DIR", Path(__file__).resolve().parent.parent / "static"))
+STATIC_URL = "app/static"
+
+# 实验室页面的主题色：深色 (标题)、强调色、Banner 渐变起点、阴影、指标数值
+THEMES = {
+    "micro": {"lab-dark": "#1e3a8a", "lab-accent": "#3b82f6", "lab-banner": "#1e3a8a", "lab-glow": "rgba(37, 99, 235, 0.3)",
+              "lab-metric": "#2563eb", "card-lift": "-2px", "card-hover-shadow": "0 10px 15px -3px rgba(0, 0, 0, 0.1)"},
+    "market": {"lab-dark": "#064e3b", "lab-accent": "#10b981", "lab-banner": "#065f46", "lab-glow": "rgba(16, 185, 129, 0.3)",
+               "lab-metric": "#059669"},
+    "macro": {"lab-dark": "#581c87", "lab-accent": "#8b5cf6", "lab-banner": "#4c1d95", "lab-glow": "rgba(139, 92, 246, 0.3)",
+              "lab-metric": "#7c3aed"},
+}
+
+_bundles = {}
+_lock = threading.Lock()
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"\s*:\s*(?=[^{}]*[;}])", ":", css)  # 只压缩声明中的冒号，保留选择器 (如 a :hover) 原样
+    return css.replace(";}", "}").strip()
+
+
+def build_bundle(name, static_dir=STATIC_DIR):
+    """压缩 styles/<name>.css 并写入 css/<name>.<哈希>.css，返回 (相对静态目录的路径或 None, 压缩后的 CSS)。"""
+    css = minify_css((STYLE_DIR / f"{name}.css").read_text(encoding="utf-8"))
+    rel = f"css/{name}.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css"
+    path = Path(static_dir) / rel
+    try:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(css, encoding="utf-8")
+            os.replace(tmp, path)
+            # 旧版本的样式表已无页面引用
+            for old in path.parent.glob(f"{name}.*.css"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+    except OSError:
+        rel = None
+    return rel, css
+
+
+def bundle(name):
+    """进程内只构建一次。"""
+    hit = _bundles.get(name)
+    if hit is None:
+        with _lock:
+            hit = _bundles.get(name)
+            if hit is None:
+                hit = _bundles[name] = build_bundle(name)
+    return hit
+
+
+def _static_serving():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def static_url(rel):
+    """static/ 下文件的站内绝对 URL，带上 server.baseUrlPath (如 /base/app/static/css/...)。
+
+    供 HTML / CSS 中直接引用：不依赖当前页面 URL 的层级，部署在子路径下也能找到。
+    """
+    base = str(st.get_option("server.baseUrlPath") or "").strip("/")
+    return "/" + "/".join(p for p in (base, STATIC_URL, rel) if p)
+
+
+def inject_styles(name, theme=None):
+    """引用共享样式表；theme 为 THEMES 中的页面名。样式只放进事件容器，不占页面位置。"""
+    rel, css = bundle(name)
+    variables = ";".join(f"--{k}:{v}" for k, v in THEMES[theme].items()) if theme else ""
+    rule = f':root{{{variables}}}' if variables else ""
+    if rel is not None and _static_serving():
+        st.html(f'<style>@import url("{static_url(rel)}");{rule}</style>')
+    else:
+        st.html(f"<style>{css}{rule}</style>")
+
+
+def image(rel):
+    """传给 st.image 的 static/ 图片：开启静态服务时返回 URL (浏览器缓存)，否则返回本地路径。
+
+    st.image 只把以 /app/static/ 开头的字符串当作静态 URL 原样下发，前端再拼上服务器地址
+    (含 baseUrlPath)，所以这里不能自行加前缀；在 HTML 中引用图片请用 static_url。
+    """
+    if _static_serving():
+        return f"/{STATIC_URL}/{rel}"
+    return str(STATIC_DIR / rel)
@@ -0,0 +1 @@
+# 离线基准测试：python -m lmdt.bench.loadtest --help
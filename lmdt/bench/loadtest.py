@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+# ==========================================
+# 并发压测 (真实服务器 + WebSocket 客户端)
+# ==========================================
+# 启动一个 streamlit 服务器进程，在本进程内用 asyncio 同时打开 N 条 WebSocket 会话，
+# 按浏览器前端的协议发送 BackMsg、接收 ForwardMsg，不需要浏览器：
+#   python -m lmdt.bench.loadtest --sessions 200 --reruns 20
+# 所有会话同时连到同一个服务器进程，共享进程级缓存、GIL 与脚本线程，与课堂上的真实负载一致。
+# 每个页面为一个阶段：全部会话同时打开该页，再各自随机拖动控件并等待重跑结束。
+# 控件位于 st.fragment 内时按前端的做法只重跑该片段，因此 fragment 页面测到的就是实际延迟。
+#   latency   从发送 BackMsg 到收到 script_finished 的时间 (含排队、脚本执行与传输)
+#   CPU ms    该阶段服务器进程消耗的 CPU 时间 / 该阶段的运行次数 (读取 /proc，仅 Linux)
+#   KB/重跑   该次重跑服务器实际发出的 WebSocket 字节数
+ROOT = Path(__file__).resolve().parents[2]
+PORTAL = "🏠_综合门户首页.py"
+ENTRY = "streamlit_app.py"     # 与部署一致的服务器入口 (含下载路由)
+
+
+def discover_pages():
+    return [ROOT / PORTAL] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def _random_state(widget, rng):
+    """随机取值并按前端的格式序列化为 WidgetState (选项类控件发送格式化后的选项文本)。"""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    state = WidgetState(id=widget.id)
+    proto = widget.proto
+    kind = type(widget).__name__
+    if kind == "Slider":
+        lo, hi, step = proto.min, proto.max, proto.step or 1
+        state.double_array_value.data.append(lo + step * rng.randint(0, int(round((hi - lo) / step))))
+    elif kind == "NumberInput":
+        if proto.data_type == proto.INT:
+            state.double_value = rng.randint(int(proto.min), int(proto.max))
+        else:
+            state.double_value = round(rng.uniform(proto.min, proto.max), 2)
+    elif kind in ("Selectbox", "Radio"):
+        state.string_value = rng.choice(list(proto.options))
+    elif kind == "Multiselect":
+        options = list(proto.options)
+        state.string_array_value.data.extend(rng.sample(options, rng.randint(0, len(options))))
+    return state
+
+
+def _interactive_widgets(tree):
+    widgets = []
+    for group in (tree.slider, tree.number_input, tree.selectbox, tree.radio, tree.multiselect):
+        widgets.extend(group)
+    return widgets
+
+
+def _url_pathname(page):
+    # 与 streamlit 的页面路由一致：门户为根路径，pages/1_👤_个体职业实验室.py → 个体职业实验室
+    page = Path(page)
+    return "" if page.name == PORTAL else page.stem.split("_")[-1]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _server_usage(pid):
+    """服务器进程累计 CPU 秒数与峰值 RSS (MB)。"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_s = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    peak_kb = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                peak_kb = int(line.split()[1])
+    return cpu_s, peak_kb / 1024
+
+
+def start_server(port, timeout=60):
+    """后台启动 streamlit 服务器，等待健康检查通过后返回进程。"""
+    cmd = [sys.executable, "-m", "streamlit", "run", str(ROOT / ENTRY), "--server.headless", "true",
+           "--server.port", str(port), "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"服务器启动失败 (退出码 {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"服务器 {timeout}s 内未就绪")
+
+
+class _Session:
+    """一条浏览器会话：保存已设置的控件值、最近一次整页运行的元素树与控件所属的片段。"""
+
+    def __init__(self, ws, rng, timeout):
+        self.ws, self.rng, self.timeout = ws, rng, timeout
+        self.states = {}
+        self.tree = None
+        self.fragments = {}
+        self.pages = {}
+
+    async def run(self, page_hash, widget=None):
+        """触发一次重跑，返回 (耗时 ms, 收到的字节数, 异常数)。"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        msg = BackMsg()
+        rerun = msg.rerun_script
+        rerun.query_string = ""
+        rerun.page_script_hash = page_hash
+        fragment_id = ""
+        if widget is not None:
+            state = _random_state(widget, self.rng)
+            self.states[state.id] = state
+            fragment_id = self.fragments.get(state.id, "")
+            rerun.fragment_id = fragment_id
+        # 与前端一样每次都带上全部已知控件值
+        rerun.widget_states.widgets.extend(self.states.values())
+
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        messages, received = [], 0
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), self.timeout)
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            messages.append(fwd)
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation":
+                self.pages = {p.url_pathname: p.page_script_hash for p in fwd.navigation.app_pages}
+            # st.rerun 会先以 FINISHED_EARLY_FOR_RERUN 结束，再开始新一轮运行
+            if kind == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        elapsed = (time.perf_counter() - t0) * 1000
+
+        errors = 0
+        for fwd in messages:
+            if fwd.WhichOneof("type") != "delta" or fwd.delta.WhichOneof("type") != "new_element":
+                continue
+            element = fwd.delta.new_element
+            kind = element.WhichOneof("type")
+            errors += kind == "exception"
+            proto = getattr(element, kind)
+            if hasattr(proto, "id") and proto.id:
+                self.fragments[proto.id] = fwd.delta.fragment_id
+        # 片段重跑只发回片段内的元素，控件列表仍以最近一次整页运行为准
+        if not fragment_id:
+            self.tree = parse_tree_from_messages(messages)
+        return elapsed, received, errors
+
+
+async def _connect(port, seed, timeout):
+    import websockets
+
+    ws = await websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None)
+    session = _Session(ws, random.Random(seed), timeout)
+    await session.run("")
+    return session
+
+
+async def _visit(session, page, reruns, stats):
+    page_hash = session.pages[_url_pathname(page)]
+    elapsed, _, errors = await session.run(page_hash)
+    stats["first_ms"].append(elapsed)
+    stats["errors"] += errors
+    for _ in range(reruns):
+        widgets = _interactive_widgets(session.tree)
+        widget = session.rng.choice(widgets) if widgets else None
+        try:
+            elapsed, received, errors = await session.run(page_hash, widget)
+        except asyncio.TimeoutError:
+            # 超时的重跑之后仍会陆续收到旧消息，该会话不再继续本页
+            stats["errors"] += 1
+            break
+        stats["latency_ms"].append(elapsed)
+        stats["bytes"].append(received)
+        stats["errors"] += errors
+
+
+async def _drive(port, pid, sessions, reruns, pages, seed, timeout):
+    clients = await asyncio.gather(*(_connect(port, seed + i, timeout) for i in range(sessions)))
+    results = {}
+    try:
+        for page in pages:
+            stats = {"first_ms": [], "latency_ms": [], "bytes": [], "errors": 0}
+            cpu0, _ = _server_usage(pid)
+            await asyncio.gather(*(_visit(s, page, reruns, stats) for s in clients))
+            cpu1, _ = _server_usage(pid)
+            stats["cpu_ms"] = (cpu1 - cpu0) * 1000 / max(1, len(stats["first_ms"]) + len(stats["latency_ms"]))
+            results[Path(page).name] = stats
+    finally:
+        await asyncio.gather(*(s.ws.close() for s in clients))
+    return results
+
+
+def summarize(results):
+    summary = {"pages": {}}
+    for page, stats in results.items():
+        lat = np.asarray(stats["latency_ms"]) if stats["latency_ms"] else np.zeros(1)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        summary["pages"][page] = {
+            "reruns": len(stats["latency_ms"]),
+            "errors": stats["errors"],
+            "first_render_ms": float(np.mean(stats["first_ms"] or [0])),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "cpu_ms_per_rerun": float(stats["cpu_ms"]),
+            "bytes_per_rerun": float(np.mean(stats["bytes"] or [0])),
+        }
+    return summary
+
+
+def run_loadtest(sessions=50, reruns=10, pages=None, seed=0, timeout=30, port=None):
+    pages = [str(p) for p in (pages or discover_pages())]
+    port = port or _free_port()
+    proc = start_server(port, timeout)
+    try:
+        t0 = time.perf_counter()
+        results = asyncio.run(_drive(port, proc.pid, sessions, reruns, pages, seed, timeout))
+        wall_s = time.perf_counter() - t0
+        _, peak_rss_mb = _server_usage(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    summary = summarize(results)
+    summary.update(sessions=sessions, reruns_per_session=reruns, wall_s=wall_s, peak_rss_mb=peak_rss_mb)
+    return summary
+
+
+def format_summary(summary):
+    lines = [
+        f"会话数 {summary['sessions']} (同时连接同一服务器进程) · 每会话重跑 {summary['reruns_per_session']} 次"
+        f" · 总耗时 {summary['wall_s']:.1f}s · 服务器峰值 RSS {summary['peak_rss_mb']:.0f} MB",
+        f"{'页面':<24}{'重跑':>7}{'错误':>6}{'首屏ms':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'CPU ms':>9}{'KB/重跑':>10}",
+    ]
+    for page, s in summary["pages"].items():
+        lines.append(
+            f"{page[:22]:<24}{s['reruns']:>7}{s['errors']:>6}{s['first_render_ms']:>9.1f}{s['p50_ms']:>9.1f}"
+            f"{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['cpu_ms_per_rerun']:>9.1f}{s['bytes_per_rerun'] / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LMDT 并发压测 (真实服务器 + WebSocket)")
+    parser.add_argument("--sessions", type=int, default=50, help="同时连接的学生会话数")
+    parser.add_argument("--reruns", type=int, default=10, help="每个会话在每个页面上的随机交互次数")
+    parser.add_argument("--page", action="append", help="只测指定页面 (可重复)，默认全部")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=int, default=30, help="单次重跑的超时秒数")
+    parser.add_argument("--port", type=int, help="服务器端口，默认自动选择空闲端口")
+    parser.add_argument("--json", help="把结果另存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    pages = [Path(p).resolve() for p in args.page] if args.page else None
+    summary = run_loadtest(args.sessions, args.reruns, pages, args.seed, args.timeout, args.port)
+    print(format_summary(summary))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
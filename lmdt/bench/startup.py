@@ -0,0 +1,130 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ==========================================
+# 冷启动基准 (每个页面的首屏时间)
+# ==========================================
+#   python -m lmdt.bench.startup --repeat 5 [--prewarm] [--json startup.json]
+# 每次测量都启动一个全新的 Python 进程，模拟重新部署后第一位学生打开页面：
+#   import_ms  导入 streamlit 与 AppTest 的时间 (服务器启动时就已付出，与页面无关)
+#   header_ms  导入 streamlit 之后，再导入实验室页头的 numpy 与 plotly.graph_objects 各自的耗时；
+#              preloaded 列出导入 streamlit 时已经载入的模块 (这部分导入在页面里不再花时间)
+#   prewarm_ms 进程预热 (lmdt.warmup.prewarm) 的时间，仅 --prewarm 时测量；不加 --prewarm 时完全不预热
+#   first_ms   第一个会话的首次渲染 (含页面导入 lmdt 与首张图表的全部一次性开销)
+#   second_ms  同一进程中第二个会话的首次渲染，即一次性开销付清之后的首屏时间
+# 本模块顶层只导入标准库，子进程的计时不受测量代码本身影响。
+ROOT = Path(__file__).resolve().parents[2]
+PORTAL = "🏠_综合门户首页.py"
+HEAVY_MODULES = ("pandas", "pyarrow", "PIL.Image", "kaleido")
+HEADER_MODULES = ("numpy", "plotly.graph_objects")
+
+
+def discover_pages():
+    return [ROOT / PORTAL] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def _measure(page, prewarm=False, timeout=60):
+    """在当前 (全新) 进程中测量一个页面，返回计时 dict。"""
+    t0 = time.perf_counter()
+    import logging
+
+    from streamlit.testing.v1 import AppTest
+    result = {"import_ms": (time.perf_counter() - t0) * 1000, "prewarm_ms": 0.0}
+    result["preloaded"] = [m for m in HEADER_MODULES if m in sys.modules]
+    result["header_ms"] = {}
+    for name in HEADER_MODULES:
+        t0 = time.perf_counter()
+        importlib.import_module(name)
+        result["header_ms"][name] = (time.perf_counter() - t0) * 1000
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, str(ROOT))
+
+    if prewarm:
+        from lmdt.warmup import prewarm as run_prewarm
+
+        t0 = time.perf_counter()
+        run_prewarm(background=False)
+        result["prewarm_ms"] = (time.perf_counter() - t0) * 1000
+
+    errors = 0
+    for name in ("first_ms", "second_ms"):
+        t0 = time.perf_counter()
+        at = AppTest.from_file(str(page), default_timeout=timeout).run()
+        result[name] = (time.perf_counter() - t0) * 1000
+        errors += len(at.exception)
+    result["errors"] = errors
+    result["heavy_modules"] = [m for m in HEAVY_MODULES if m in sys.modules]
+    return result
+
+
+def _spawn(page, prewarm, timeout):
+    cmd = [sys.executable, "-m", "lmdt.bench.startup", "--child", str(page)] + (["--prewarm"] if prewarm else [])
+    # 不预热时同时关闭页面末尾触发的后台预热，避免它与第二个会话争抢 CPU
+    env = {**os.environ, "LMDT_PREWARM": "1" if prewarm else "0"}
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout * 4)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{Path(page).name} 测量失败:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_startup(pages=None, repeat=3, prewarm=False, timeout=60):
+    """每个页面启动 repeat 个全新进程，汇总各项耗时的中位数。"""
+    summary = {"repeat": repeat, "prewarm": prewarm, "pages": {}}
+    for page in pages or discover_pages():
+        runs = [_spawn(page, prewarm, timeout) for _ in range(repeat)]
+        stats = {k: statistics.median(r[k] for r in runs) for k in ("import_ms", "prewarm_ms", "first_ms", "second_ms")}
+        stats["errors"] = sum(r["errors"] for r in runs)
+        stats["heavy_modules"] = sorted({m for r in runs for m in r["heavy_modules"]})
+        stats["preloaded"] = sorted({m for r in runs for m in r["preloaded"]})
+        stats["header_ms"] = {m: statistics.median(r["header_ms"][m] for r in runs) for m in HEADER_MODULES}
+        summary["pages"][Path(page).name] = stats
+    return summary
+
+
+def format_summary(summary):
+    lines = [
+        f"每个页面 {summary['repeat']} 个全新进程取中位数 · 预热 {'开' if summary['prewarm'] else '关'}",
+        f"{'页面':<24}{'导入ms':>9}{'预热ms':>9}{'首屏ms':>9}{'次屏ms':>9}{'错误':>6}  已加载的重型模块",
+    ]
+    for page, s in summary["pages"].items():
+        lines.append(
+            f"{page[:22]:<24}{s['import_ms']:>9.0f}{s['prewarm_ms']:>9.0f}{s['first_ms']:>9.0f}{s['second_ms']:>9.0f}"
+            f"{s['errors']:>6}  {', '.join(s['heavy_modules']) or '-'}"
+        )
+    # 页头导入与页面无关，取第一个页面的测量即可
+    first = next(iter(summary["pages"].values()), None)
+    if first:
+        header = " · ".join(f"{m} {first['header_ms'][m]:.0f} ms" for m in HEADER_MODULES)
+        lines.append(f"导入 streamlit 后的页头导入: {header} · streamlit 已载入: {', '.join(first['preloaded']) or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LMDT 冷启动首屏基准")
+    parser.add_argument("--repeat", type=int, default=3, help="每个页面启动的进程数")
+    parser.add_argument("--page", action="append", help="只测指定页面 (可重复)，默认全部")
+    parser.add_argument("--prewarm", action="store_true", help="首次渲染前先同步执行进程预热")
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--json", help="把结果另存为 JSON 文件")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure(args.child, args.prewarm, args.timeout)))
+        return
+    pages = [Path(p).resolve() for p in args.page] if args.page else None
+    summary = run_startup(pages, args.repeat, args.prewarm, args.timeout)
+    print(format_summary(summary))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+
+from .charts import compact_figure
+
+# ==========================================
+# 进程级结果缓存 (所有会话共享)
+# ==========================================
+# Streamlit 在同一进程内只导入一次模块，所以这里的全局缓存被全部学生会话共享：
+# 同一组(规范化后的)参数只计算一次，之后的请求直接命中。
+
+
+def normalize(value):
+    """把滑块 / 多选框的取值规范化为可哈希、与顺序无关的键。"""
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = round(float(value), 6)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(v) for v in value))
+    if isinstance(value, (list, tuple)):
+        items = [normalize(v) for v in value]
+        # 多选框的选择顺序不影响结果
+        return tuple(sorted(items, key=repr)) if all(isinstance(v, str) for v in items) else tuple(items)
+    if isinstance(value, np.ndarray):
+        return (value.shape, tuple(normalize(v) for v in value.ravel().tolist()))
+    return value
+
+
+def make_key(namespace, **params):
+    return (namespace, tuple(sorted((k, normalize(v)) for k, v in params.items())))
+
+
+def _freeze(value):
+    # 缓存中的结果被多个会话同时读取，禁止原地修改：数组设为只读，
+    # dict 换成只读映射、list 换成 tuple，并逐层递归到其中的值
+    if isinstance(value, np.ndarray):
+        if value.flags.writeable:
+            value.setflags(write=False)
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (tuple, list)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class LRUCache:
+    """线程安全的定长 LRU 缓存，带命中 / 未命中 / 淘汰计数。"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def _lookup(self, key):
+        # 调用方需持有 self._lock
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, self._data[key]
+        return False, None
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # 同一个键只允许一个会话计算，其余会话等待后直接命中
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                self.misses += 1
+            try:
+                value = compute()
+                with self._lock:
+                    self._data[key] = value
+                    self._evict()
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value
+
+    def _evict(self):
+        # 调用方需持有 self._lock
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys):
+        """批量查找，返回 {键: 值} (只含命中的键)，未命中的键计入 misses。"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                hit, value = self._lookup(key)
+                if hit:
+                    found[key] = value
+                else:
+                    self.misses += 1
+        return found
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+RESULTS = LRUCache(maxsize=512)   # 引擎输出 (只读 NumPy 数组与只读映射)
+FIGURES = LRUCache(maxsize=256)   # 已构建的 Plotly 图表
+
+
+def cached_result(namespace, compute, **params):
+    """按参数缓存引擎输出；返回的数组为只读，dict 为只读映射 (需要修改时先 dict(...) 复制)。"""
+    return RESULTS.get_or_compute(make_key(namespace, **params), lambda: _freeze(compute()))
+
+
+def cached_batch(namespace, compute, rows):
+    """按行缓存的批量计算：rows 为参数 dict 的列表，返回与 rows 一一对应的结果 dict。
+
+    只有缓存未命中的行被拼成一批 (每个参数一列) 调用一次 compute(**columns)；compute 返回
+    {名称: 首维为批大小的数组}，按行拆开后逐行写入缓存。新增一行的代价与批中已有多少行无关。
+    """
+    keys = [make_key(namespace, **row) for row in rows]
+    found = RESULTS.get_many(keys)
+    missing = list({key: row for key, row in zip(keys, rows) if key not in found}.items())
+    if missing:
+        columns = {name: [row[name] for _, row in missing] for name in missing[0][1]}
+        batch = compute(**columns)
+        for i, (key, _) in enumerate(missing):
+            found[key] = value = _freeze({name: np.array(arr[i]) for name, arr in batch.items()})
+            RESULTS.put(key, value)
+    return [found[key] for key in keys]
+
+
+def cached_figure(namespace, build, **params):
+    """按参数缓存图表，只做只读使用。
+
+    缓存的是构建好的 go.Figure 本身：st.plotly_chart 对 Figure 只做 to_dict + to_json，
+    而传入 JSON / dict 会触发一次完整的 Figure 校验重建，代价与重新画图相当。
+    入缓存前经 lmdt.charts.compact_figure 瘦身 (降采样、float32、精简模板)，只做一次。
+    """
+    return FIGURES.get_or_compute(make_key(namespace, **params), lambda: compact_figure(build(), uirevision=namespace))
+
+
+def cache_stats():
+    return {"results": RESULTS.stats(), "figures": FIGURES.stats()}
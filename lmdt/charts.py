@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+
+# ==========================================
+# 图表载荷瘦身 (Plotly)
+# ==========================================
+# st.plotly_chart 每次都把完整的图表 JSON 发给浏览器，体积主要来自：
+#   * 模板：plotly_white 带有 24 种图形类型与 3D / 地图 / 极坐标的默认样式，约 7 KB，每张图重复一份
+#   * 数据：float64 的 base64 数组；群体 / 多主体模式下单条曲线可达 10^5 点以上
+# compact_figure 在图表进入 cached_figure 缓存之前处理一次 (之后的会话直接复用)：
+#   1. 模板只保留本图实际用到的图形类型与布局项
+#   2. x 单调的长曲线用 LTTB (Largest-Triangle-Three-Buckets) 降到 CHART_POINTS 点，保留峰谷形状；
+#      共用同一 x 的曲线 (如分位数带的上下沿) 取各自选中点的并集，填充区域仍然对齐
+#   3. 浮点数组改存 float32：屏幕上看不出差别，字节数减半
+#   4. 固定 uirevision：参数变化时浏览器用 Plotly.react 原地更新，保留缩放与图例开关
+# 参数没变的图表由 Streamlit 的消息缓存只发送哈希引用 (见 .streamlit/config.toml 的 minCachedMessageSize)。
+CHART_POINTS = int(os.environ.get("LMDT_CHART_POINTS", 2000))   # 每条曲线最多发送的点数
+
+_LINE_TYPES = {"scatter", "scattergl"}
+_SCALE_TYPES = {"heatmap", "contour", "histogram2d", "histogram2dcontour", "surface"}
+_SUBPLOT_LAYOUT = ("polar", "ternary", "scene", "geo", "mapbox", "map")
+_POINT_ATTRS = ("customdata", "text", "hovertext")
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 降采样，返回保留点的下标 (含首尾两点，升序)。
+
+    首尾两点单独成桶，其余点按下标均分为 n_out - 2 个桶；每个桶保留与
+    "上一个保留点、下一个桶的均值点" 构成三角形面积最大的点。
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)   # 第 b 个桶为 [edges[b], edges[b+1])
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # 最后一个桶的 "下一个桶" 是末点
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - mean_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return keep
+
+
+def _downsample_lines(fig, n_out):
+    groups = {}
+    for trace in fig.data:
+        if trace.type not in _LINE_TYPES or trace.x is None or trace.y is None:
+            continue
+        x, y = np.asarray(trace.x), np.asarray(trace.y)
+        if len(y) <= n_out or len(x) != len(y) or x.dtype.kind not in "iuf" or y.dtype.kind not in "iuf":
+            continue
+        if not (np.isfinite(y).all() and np.all(np.diff(x) >= 0)):
+            continue
+        groups.setdefault((len(x), x.tobytes()), (x, []))[1].append(trace)
+
+    for x, traces in groups.values():
+        keep = np.unique(np.concatenate([lttb(x, t.y, n_out) for t in traces]))
+        n = len(x)
+        for trace in traces:
+            trace.x, trace.y = x[keep], np.asarray(trace.y)[keep]
+            for attr in _POINT_ATTRS:
+                value = trace[attr]
+                if value is not None and not isinstance(value, str) and len(value) == n:
+                    trace[attr] = np.asarray(value)[keep]
+
+
+def _to_float32(fig):
+    for trace in fig.data:
+        for attr in ("x", "y", "z"):
+            value = trace[attr] if attr in trace else None
+            if isinstance(value, np.ndarray) and value.dtype == np.float64:
+                trace[attr] = value.astype(np.float32)
+
+
+def _uses_colorscale(trace):
+    if trace.type in _SCALE_TYPES:
+        return True
+    marker = trace["marker"] if "marker" in trace else None
+    color = marker.color if marker is not None else None
+    return color is not None and not isinstance(color, str) and marker.colorscale is None
+
+
+def _slim_template(fig):
+    template = fig.layout.template
+    if template is None:
+        return
+    template = template.to_plotly_json()
+    types = {trace.type for trace in fig.data}
+    layout = {k: v for k, v in template.get("layout", {}).items() if k not in _SUBPLOT_LAYOUT}
+    if not any(_uses_colorscale(trace) for trace in fig.data):
+        layout.pop("colorscale", None)
+        layout.pop("coloraxis", None)
+    fig.layout.template = {"layout": layout, "data": {k: v for k, v in template.get("data", {}).items() if k in types}}
+
+
+def compact_figure(fig, uirevision=None, max_points=CHART_POINTS):
+    """原地瘦身并返回 fig；uirevision 一般取图表的缓存命名空间，同一位置的图表保持不变。"""
+    _downsample_lines(fig, max_points)
+    _to_float32(fig)
+    _slim_template(fig)
+    if uirevision is not None and fig.layout.uirevision is None:
+        fig.layout.uirevision = uirevision
+    return fig
+
+
+def sign_marker(values, negative="#ef4444", positive="#10b981"):
+    """按正负着色的柱形：发送一个 int8 数组加两色色阶，代替逐根柱子的颜色字符串列表。"""
+    return dict(color=(np.asarray(values) >= 0).astype(np.int8), colorscale=[[0, negative], [1, positive]],
+                cmin=0, cmax=1)
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+# ==========================================
+# 课堂实时汇总 (进程级，所有会话共享)
+# ==========================================
+# 每个会话只保存自己当前的取值；取值变化时在对应计数器上 -1 / +1，
+# 看板读取计数器即可，无需遍历全部会话。
+# 会话按最近活动时间排在 OrderedDict 中，超过 ACTIVE_TIMEOUT 秒未操作的会话从队首移出并撤销其计数，
+# 每次更新的均摊代价为 O(1)。
+ACTIVE_TIMEOUT = float(os.environ.get("LMDT_ACTIVE_TIMEOUT", 900))
+REFRESH_INTERVAL = float(os.environ.get("LMDT_DASHBOARD_INTERVAL", 5))   # 讲师看板刷新间隔 (秒)
+_MISSING = object()
+
+
+def _hashable(value):
+    # multiselect 的列表与顺序无关，按排序后的元组计数
+    return tuple(sorted(value)) if isinstance(value, (list, tuple, set)) else value
+
+
+class ClassAggregates:
+    def __init__(self, timeout=ACTIVE_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()          # session -> [最近活动时间, {字段: 取值}]
+        self._counts = defaultdict(Counter)     # 字段 -> {取值: 会话数}
+
+    def _set(self, values, field, value):
+        old = values.get(field, _MISSING)
+        if old == value:
+            return
+        if old is not _MISSING:
+            self._discard(field, old)
+        values[field] = value
+        self._counts[field][value] += 1
+
+    def _discard(self, field, value):
+        counter = self._counts[field]
+        counter[value] -= 1
+        if counter[value] <= 0:
+            del counter[value]
+
+    def _expire(self, now):
+        while self._sessions:
+            session, (last_seen, values) = next(iter(self._sessions.items()))
+            if now - last_seen < self.timeout:
+                break
+            del self._sessions[session]
+            for field, value in values.items():
+                self._discard(field, value)
+
+    def update(self, session, page, field, value, now=None):
+        """记录会话 session 在 page 上的字段取值 (字段名为 "page.field")，并标记其当前所在页面。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._sessions.get(session)
+            if entry is None:
+                entry = self._sessions[session] = [now, {}]
+            else:
+                entry[0] = now
+                self._sessions.move_to_end(session)
+            self._set(entry[1], "page", page)
+            self._set(entry[1], f"{page}.{field}", _hashable(value))
+            self._expire(now)
+
+    def active_sessions(self, now=None):
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+            return len(self._sessions)
+
+    def counts(self, field, now=None):
+        """某个字段当前各取值的活跃会话数 {取值: 人数}。"""
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+            return dict(self._counts.get(field, {}))
+
+    def reset(self):
+        with self._lock:
+            self._sessions.clear()
+            self._counts.clear()
+
+
+CLASSROOM = ClassAggregates()
@@ -0,0 +1,35 @@
+# 向量化算法引擎：所有函数都接受标量或整批参数数组，
+# 一次 NumPy 调用即可得到全班 / 全网格的结果
+from .mincer import DEFAULT_COEF, EXP_GRID, calc_mincer, mincer_batch
+from .migration import RATE_GRID, annuity_factor, calc_breakeven, calc_migration_npv, migration_surface
+from .demand import TECH_FACTORS, WAGE_GRID, calc_derived_demand, tech_factor
+from .production import ces_labor_demand, ces_output, hicks_marshall, industry_demand, labor_share, sample_industry
+from .beveridge import U_GRID, beveridge_k, calc_beveridge
+from .cohort import CohortAccumulator, simulate_cohort
+from .estimation import NormalEquations, estimate_mincer
+from .equilibrium import labor_supply, minimum_wage_statics, sample_markets, solve_equilibrium
+from .shirking import SCHEMES, simulate_pay_schemes
+from .microdata import MicrodataStore, get_store
+from .matching import DEMAND_LEVELS, simulate_matching
+from .policy import AI_RISK_GRID, MISMATCH_GRID, POLICIES, POLICY_COMBOS, equilibrium_u, policy_levers, simulated_theta, sweep_policies
+from .scenarios import macro_scenarios, market_scenarios, micro_scenarios
+from .schooling import DISCOUNT_GRID, optimal_schooling, schooling_surface
+from .transition import QUARTERS, sample_transitions, transition_paths
+
+__all__ = [
+    "DEFAULT_COEF", "EXP_GRID", "calc_mincer", "mincer_batch",
+    "RATE_GRID", "annuity_factor", "calc_breakeven", "calc_migration_npv", "migration_surface",
+    "TECH_FACTORS", "WAGE_GRID", "calc_derived_demand", "tech_factor",
+    "ces_labor_demand", "ces_output", "hicks_marshall", "industry_demand", "labor_share", "sample_industry",
+    "U_GRID", "beveridge_k", "calc_beveridge",
+    "CohortAccumulator", "simulate_cohort",
+    "NormalEquations", "estimate_mincer",
+    "labor_supply", "minimum_wage_statics", "sample_markets", "solve_equilibrium",
+    "SCHEMES", "simulate_pay_schemes",
+    "MicrodataStore", "get_store",
+    "DEMAND_LEVELS", "simulate_matching",
+    "AI_RISK_GRID", "MISMATCH_GRID", "POLICIES", "POLICY_COMBOS", "equilibrium_u", "policy_levers", "simulated_theta", "sweep_policies",
+    "macro_scenarios", "market_scenarios", "micro_scenarios",
+    "DISCOUNT_GRID", "optimal_schooling", "schooling_surface",
+    "QUARTERS", "sample_transitions", "transition_paths",
+]
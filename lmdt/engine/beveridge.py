@@ -0,0 +1,25 @@
+import numpy as np
+
+from ..metrics import timed
+
+# ==========================================
+# 贝弗里奇曲线 (Ch9 失业)
+# ==========================================
+U_GRID = np.linspace(0.5, 15, 100)  # 避免 u=0 的除零错误
+
+
+def beveridge_k(mismatch, policy_effect, ai_risk):
+    # 基础常数 k = 20
+    # mismatch (0-2.0): 结构性错配系数，每增加0.1，k增加5
+    # policy_effect (0/1): 政策修正，降低k
+    # ai_risk (0-100): AI冲击每增加1%，k增加0.6。当拉到100%时，k增加60，效果非常剧烈！
+    mismatch, policy_effect, ai_risk = (np.asarray(a, dtype=float) for a in (mismatch, policy_effect, ai_risk))
+    return 20 + (mismatch * 50) + (ai_risk * 0.6) - (policy_effect * 15)
+
+
+@timed()
+def calc_beveridge(mismatch, policy_effect, ai_risk, u=U_GRID):
+    """v = k / u。参数可为数组，失业率轴追加在最后一维。"""
+    k = beveridge_k(mismatch, policy_effect, ai_risk)
+    v = k[..., None] / u
+    return u, v
@@ -0,0 +1,119 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..metrics import timed
+from .mincer import calc_mincer
+
+# ==========================================
+# 群体蒙特卡洛：整届劳动者的工资-年龄分布
+# ==========================================
+# 以 calc_mincer 为均值，随机抽取受教育年限、培训、工龄与工资冲击；
+# 按固定大小分块生成，每块只更新直方图累加器，内存占用与总人数无关。
+EXP_EDGES = np.linspace(0, 40, 41)              # 每个工龄年份一个分组
+LOG_WAGE_EDGES = np.linspace(5.0, 14.0, 901)    # ln(工资) 直方图，步长 0.01
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+CHUNK_SIZE = 250_000
+WORKERS = int(os.environ.get("LMDT_COHORT_WORKERS", 1))
+
+
+class CohortAccumulator:
+    """工龄分组 × ln(工资) 的二维直方图，可增量更新、可跨进程合并。"""
+
+    def __init__(self, exp_edges=EXP_EDGES, log_wage_edges=LOG_WAGE_EDGES):
+        self.exp_edges = np.asarray(exp_edges, dtype=float)
+        self.log_wage_edges = np.asarray(log_wage_edges, dtype=float)
+        n_exp, n_wage = len(self.exp_edges) - 1, len(self.log_wage_edges) - 1
+        self.counts = np.zeros((n_exp, n_wage), dtype=np.int64)
+        self.wage_sum = np.zeros(n_exp)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    @property
+    def exp_centers(self):
+        return (self.exp_edges[:-1] + self.exp_edges[1:]) / 2
+
+    def update(self, exp, wage):
+        n_exp, n_wage = self.counts.shape
+        ei = np.clip(np.searchsorted(self.exp_edges, exp, side="right") - 1, 0, n_exp - 1)
+        lo, step = self.log_wage_edges[0], self.log_wage_edges[1] - self.log_wage_edges[0]
+        # 等宽分箱直接算下标，越界值计入两端的箱子
+        wi = np.clip(((np.log(wage) - lo) / step).astype(np.int64), 0, n_wage - 1)
+        self.counts += np.bincount(ei * n_wage + wi, minlength=n_exp * n_wage).reshape(n_exp, n_wage)
+        self.wage_sum += np.bincount(ei, weights=wage, minlength=n_exp)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.wage_sum += other.wage_sum
+        return self
+
+    def mean(self):
+        n = self.counts.sum(axis=1)
+        return np.divide(self.wage_sum, n, out=np.full(len(n), np.nan), where=n > 0)
+
+    def quantiles(self, qs=QUANTILES):
+        """各工龄分组的工资分位数，形状 (工龄分组数, len(qs))，箱内线性插值。"""
+        qs = np.asarray(qs, dtype=float)
+        n = self.counts.sum(axis=1, keepdims=True)
+        cdf = np.cumsum(self.counts, axis=1) / np.maximum(n, 1)
+        out = np.full((self.counts.shape[0], len(qs)), np.nan)
+        lo, step = self.log_wage_edges[0], self.log_wage_edges[1] - self.log_wage_edges[0]
+        for j, q in enumerate(qs):
+            idx = np.argmax(cdf >= q, axis=1)
+            prev = np.where(idx > 0, np.take_along_axis(cdf, np.maximum(idx - 1, 0)[:, None], axis=1)[:, 0], 0.0)
+            mass = np.take_along_axis(cdf, idx[:, None], axis=1)[:, 0] - prev
+            frac = np.divide(q - prev, mass, out=np.zeros_like(mass), where=mass > 0)
+            out[:, j] = np.exp(lo + (idx + frac) * step)
+        out[n[:, 0] == 0] = np.nan
+        return out
+
+    def wage_histogram(self):
+        """全体工资的边缘分布 (ln 工资箱边界, 人数)。"""
+        return self.log_wage_edges, self.counts.sum(axis=0)
+
+
+def _simulate_chunk(n, seed, edu, gen_t, spec_t, disc, sigma, disc_share, coef=None, acc=None):
+    rng = np.random.default_rng(seed)
+    edu_i = np.clip(np.rint(rng.normal(edu, 2.0, n)), 9, 22)
+    gen_i = rng.binomial(10, gen_t / 10, n)
+    spec_i = rng.binomial(10, spec_t / 10, n)
+    exp_i = rng.uniform(0, 40, n)
+    mean_wage, _ = calc_mincer(edu_i, exp_i, gen_i, spec_i, 0, coef=coef)
+    # 对数正态冲击，减去 sigma^2/2 使期望工资仍等于明瑟方程给出的均值
+    wage = mean_wage * np.exp(sigma * rng.standard_normal(n) - sigma**2 / 2)
+    wage *= np.where(rng.random(n) < disc_share, 1 - disc/100, 1.0)
+    return (acc if acc is not None else CohortAccumulator()).update(exp_i, wage)
+
+
+def _chunk_job(args):
+    return _simulate_chunk(*args)
+
+
+@timed()
+def simulate_cohort(n, edu, gen_t, spec_t, disc, sigma=0.35, disc_share=0.5,
+                    chunk_size=CHUNK_SIZE, seed=0, workers=WORKERS, coef=None):
+    """模拟 n 名劳动者，返回 CohortAccumulator。
+
+    edu / gen_t / spec_t 是群体均值 (即页面滑块取值)，disc 只作用于 disc_share 比例的受歧视群体。
+    workers > 1 时各块在独立进程中生成后合并，结果与单进程相同 (每块种子固定)。
+    coef 为明瑟方程系数字典，None 表示教材系数。
+    """
+    sizes = [chunk_size] * (n // chunk_size) + ([n % chunk_size] if n % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    coef = None if coef is None else dict(coef)   # 缓存返回的只读映射无法 pickle 到子进程
+    jobs = [(size, s, edu, gen_t, spec_t, disc, sigma, disc_share, coef) for size, s in zip(sizes, seeds)]
+    acc = CohortAccumulator()
+    if workers > 1 and len(jobs) > 1:
+        # spawn 而非 fork：Streamlit 服务进程是多线程的
+        with ProcessPoolExecutor(min(workers, len(jobs)), mp_context=mp.get_context("spawn")) as pool:
+            for part in pool.map(_chunk_job, jobs):
+                acc.merge(part)
+    else:
+        for job in jobs:
+            _simulate_chunk(*job, acc=acc)
+    return acc
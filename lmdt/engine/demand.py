@@ -0,0 +1,24 @@
+import numpy as np
+
+from ..metrics import timed
+
+# ==========================================
+# 派生需求 (Ch3 劳动力需求)
+# ==========================================
+TECH_FACTORS = {"中性技术": 1.0, "劳动替代型": 0.6, "劳动互补型": 1.5}
+WAGE_GRID = np.linspace(5, 100, 100)
+
+
+def tech_factor(tech_type):
+    """技术类型 -> 需求乘数，支持单个字符串或字符串数组，未知类型按中性处理。"""
+    if isinstance(tech_type, str):
+        return TECH_FACTORS.get(tech_type, 1.0)
+    return np.array([TECH_FACTORS.get(t, 1.0) for t in np.ravel(tech_type)]).reshape(np.shape(tech_type))
+
+
+@timed()
+def calc_derived_demand(capital, tech_type, prod_price, w=WAGE_GRID):
+    """劳动需求曲线。capital / prod_price / tech_type 可为数组，工资轴追加在最后一维。"""
+    scale = np.asarray(prod_price * np.asarray(capital) * tech_factor(tech_type) * 10, dtype=float)
+    demand = scale[..., None] / w
+    return w, demand
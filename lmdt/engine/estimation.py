@@ -0,0 +1,208 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from ..metrics import timed
+from .mincer import DEFAULT_COEF
+
+# ==========================================
+# 微观数据明瑟方程估计 (Ch5 数据实验室)
+# ==========================================
+# ln(w) = base + (r_edu + r_gen·gen_t + r_spec·spec_t)·edu + exp_linear·exp - exp_quad·exp²
+# 按块流式读取 CSV / Parquet，每块只把 X'X、X'y、y'y 累加进 6×6 的正规方程，
+# 内存占用只取决于块大小，与文件行数无关；累加器可跨进程合并。
+SURVEY_PATH = Path(os.environ.get("LMDT_SURVEY_PATH", Path(__file__).resolve().parent.parent / "data" / "survey.parquet"))
+# 页面上只能选择数据目录内的文件，学生不能让服务器读取任意本地路径
+DATA_DIR = Path(os.environ.get("LMDT_DATA_DIR", SURVEY_PATH.parent))
+SURVEY_SUFFIXES = (".csv", ".parquet", ".pq")
+CHUNK_ROWS = 1_000_000
+REQUIRED = ("edu", "exp")
+OPTIONAL = ("gen_t", "spec_t")
+REGRESSORS = ("base", "r_edu", "r_gen", "r_spec", "exp_linear", "exp_quad")
+# 演示数据中的地区工资效应 (对数) 与女性的工资折扣
+SAMPLE_REGIONS = {"东部": 0.12, "中部": -0.03, "西部": -0.08, "东北": -0.05}
+SAMPLE_GENDER_DISC = 0.15
+
+
+def data_file(name, root=DATA_DIR):
+    """数据目录下的文件名 → 解析后的绝对路径。
+
+    越出数据目录 (../、绝对路径、符号链接)、不是 CSV / Parquet 文件时返回 None。
+    """
+    root = Path(root).resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root) or path.suffix.lower() not in SURVEY_SUFFIXES or not path.is_file():
+        return None
+    return path
+
+
+class NormalEquations:
+    """流式 OLS 累加器：只保存 X'X、X'y、y'y 与样本数。"""
+
+    def __init__(self, k=len(REGRESSORS)):
+        self.xtx = np.zeros((k, k))
+        self.xty = np.zeros(k)
+        self.yty = 0.0
+        self.y_sum = 0.0
+        self.n = 0
+
+    def update(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.yty += float(y @ y)
+        self.y_sum += float(y.sum())
+        self.n += len(y)
+        return self
+
+    def merge(self, other):
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.yty += other.yty
+        self.y_sum += other.y_sum
+        self.n += other.n
+        return self
+
+    def solve(self, active=None):
+        """返回 (系数, 标准误, R²)。active 为参与回归的列 (布尔掩码)，其余系数记为 0。"""
+        k = len(self.xty)
+        active = np.ones(k, dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        xtx = self.xtx[np.ix_(active, active)]
+        xty = self.xty[active]
+        beta = np.zeros(k)
+        se = np.full(k, np.nan)
+        beta[active] = np.linalg.solve(xtx, xty)
+        ssr = self.yty - 2 * beta[active] @ xty + beta[active] @ xtx @ beta[active]
+        sst = self.yty - self.y_sum**2 / self.n
+        dof = max(self.n - int(active.sum()), 1)
+        se[active] = np.sqrt(np.maximum(np.diag(np.linalg.inv(xtx)) * ssr / dof, 0))
+        return beta, se, 1 - ssr / sst if sst > 0 else np.nan
+
+
+def design_matrix(edu, exp, gen_t=None, spec_t=None):
+    """按 REGRESSORS 顺序构造 X；exp_quad 列取 -exp²，使拟合出的系数与 DEFAULT_COEF 同号。"""
+    edu = np.asarray(edu, dtype=float)
+    exp = np.asarray(exp, dtype=float)
+    zeros = np.zeros_like(edu)
+    gen_t = zeros if gen_t is None else np.asarray(gen_t, dtype=float)
+    spec_t = zeros if spec_t is None else np.asarray(spec_t, dtype=float)
+    return np.column_stack([np.ones_like(edu), edu, edu * gen_t, edu * spec_t, exp, -exp**2])
+
+
+def _read_columns(path):
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).schema_arrow.names
+    import pandas as pd  # pandas 只在读写调查数据时需要，不拖慢页面冷启动
+
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS, text=()):
+    """逐块产出只含 columns 的 DataFrame。Parquet 需要 pyarrow (按行组批量读取)。
+
+    CSV 中 text 列出的列按字符串读取，其余列按浮点数读取。
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("读取 Parquet 需要安装 pyarrow：pip install pyarrow") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunk_rows,
+                               dtype={c: str if c in text else np.float64 for c in columns})
+
+
+@timed()
+def estimate_mincer(path=SURVEY_PATH, chunk_rows=CHUNK_ROWS):
+    """流式估计明瑟方程，返回 {"coef", "se", "r2", "n", "columns"}。
+
+    文件需包含 edu、exp 以及 wage 或 ln_wage 列；gen_t / spec_t 缺失时对应回报率记为 0。
+    非正工资与缺失值所在的行被丢弃。
+    """
+    names = _read_columns(path)
+    missing = [c for c in REQUIRED if c not in names]
+    if missing or ("wage" not in names and "ln_wage" not in names):
+        raise ValueError(f"数据缺少必要列: {missing or ['wage / ln_wage']}")
+    y_col = "ln_wage" if "ln_wage" in names else "wage"
+    optional = [c for c in OPTIONAL if c in names]
+    columns = [y_col, *REQUIRED, *optional]
+
+    acc = NormalEquations()
+    for chunk in iter_chunks(path, columns, chunk_rows):
+        data = chunk.to_numpy(dtype=float)
+        y = data[:, 0] if y_col == "ln_wage" else np.log(np.where(data[:, 0] > 0, data[:, 0], np.nan))
+        keep = np.isfinite(y) & np.isfinite(data[:, 1:]).all(axis=1)
+        cols = dict(zip(columns[1:], data[keep, 1:].T))
+        acc.update(design_matrix(cols["edu"], cols["exp"], cols.get("gen_t"), cols.get("spec_t")), y[keep])
+
+    active = np.array([True, True, "gen_t" in optional, "spec_t" in optional, True, True])
+    beta, se, r2 = acc.solve(active)
+    return {"coef": dict(zip(REGRESSORS, beta)), "se": dict(zip(REGRESSORS, se)),
+            "r2": r2, "n": acc.n, "columns": columns}
+
+
+def write_sample(path=SURVEY_PATH, n=10_000_000, coef=DEFAULT_COEF, sigma=0.4, chunk_rows=CHUNK_ROWS, seed=0):
+    """生成课堂演示用的模拟调查数据 (真实系数为 coef)，按块写出，返回文件路径。
+
+    另含 region / gender 两列：地区效应见 SAMPLE_REGIONS，女性平均工龄略短 (职业中断)
+    且工资再打 SAMPLE_GENDER_DISC 的折扣，供分组工资差距与 Oaxaca 分解演示。
+    """
+    import pandas as pd
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    parquet = path.suffix.lower() in (".parquet", ".pq")
+    writer = None
+    if parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    elif path.exists():
+        path.unlink()
+    for start in range(0, n, chunk_rows):
+        m = min(chunk_rows, n - start)
+        region = rng.integers(0, len(SAMPLE_REGIONS), m)
+        female = rng.random(m) < 0.5
+        edu = np.clip(np.rint(rng.normal(13, 3, m) + (region == 0)), 6, 22)
+        exp = (rng.uniform(0, 40, m) * np.where(female, 0.85, 1.0)).round(1)
+        gen_t = rng.integers(0, 11, m)
+        spec_t = rng.integers(0, 11, m)
+        ln_w = design_matrix(edu, exp, gen_t, spec_t) @ np.array([coef[k] for k in REGRESSORS])
+        ln_w += np.array(list(SAMPLE_REGIONS.values()))[region] + female * np.log(1 - SAMPLE_GENDER_DISC)
+        wage = np.exp(ln_w + sigma * rng.standard_normal(m)).round(2)
+        df = pd.DataFrame({"wage": wage, "edu": edu, "exp": exp, "gen_t": gen_t, "spec_t": spec_t,
+                           "region": np.array(list(SAMPLE_REGIONS))[region], "gender": np.where(female, "女", "男")})
+        if parquet:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            writer = writer or pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        else:
+            df.to_csv(path, mode="a", header=start == 0, index=False)
+    if writer is not None:
+        writer.close()
+    return path
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m lmdt.engine.estimation sample [路径] [行数]  /  python -m lmdt.engine.estimation [路径]
+    args = sys.argv[1:]
+    if args[:1] == ["sample"]:
+        out = write_sample(*(args[1:2] or [SURVEY_PATH]), *(int(a) for a in args[2:3]))
+        print(f"模拟数据已写入: {out}")
+    else:
+        fit = estimate_mincer(*args[:1])
+        print(f"n = {fit['n']:,}  R² = {fit['r2']:.4f}")
+        for name in REGRESSORS:
+            print(f"{name:>11s} {fit['coef'][name]: .6f}  ({fit['se'][name]:.6f})")
@@ -0,0 +1,121 @@
+import numpy as np
+
+from ..metrics import timed
+from .beveridge import beveridge_k
+
+# ==========================================
+# 随机搜寻-匹配仿真 (总量模型)：从仿真稳态推出贝弗里奇曲线 (Ch9)
+# ==========================================
+# 这是一个总量随机模型，不追踪单个劳动者：每个市场只记录几组计数
+#   在职者、技能可用的失业者、技能过时的失业者 (被 AI 替代且尚未完成转岗)、旧技能 / 新技能空缺
+# 每期按二项 / 泊松分布抽取离职、转岗、发布、撤销与匹配的发生数。这些持续期都是几何分布
+# (无记忆)，所以它与逐人抽签的个体模型在分布上等价，但不再有个体层面的异质性与历史。
+# labor_force 只决定计数的规模，即抽样噪声的大小；每期 O(K) 次抽样，耗时与它无关。
+# K 个需求水平 (企业目标空缺率) 平分劳动力，并行仿真，
+# 每个市场的稳态 (u, v) 就是贝弗里奇曲线上的一个点。
+# 错配与技能重塑补贴有两条作用渠道：
+#   * 对所有求职者：按解析模型在 ai_risk=0 时的 k 调整匹配效率。仿真稳态的曲线中段 u·v
+#     约与 1/A 成正比，取 A ∝ 20 / k 使无 AI 冲击时仿真曲线与 v = k/u 基本一致
+#   * 对技能过时者：错配压低其匹配效率与转岗率，补贴提高转岗率 (只在 ai_risk > 0 时起作用)
+MATCH_EFFICIENCY = 0.9      # 匹配函数 M = A · U^α · V^(1-α) 中的 A，无冲击时曲线中段 u·v ≈ 20 (与解析曲线 k=20 一致)
+MATCH_ELASTICITY = 0.5      # α
+BASE_SEPARATION = 0.02      # 月度外生离职率
+AI_SEPARATION = 0.015       # ai_risk = 100% 时额外的 AI 替代离职率
+VACANCY_LAPSE = 0.2         # 空缺每期撤销的概率
+BASE_RESKILL = 0.06         # 技能过时者每期自行完成转岗学习的概率 (未错配时)
+POLICY_RESKILL = 0.12       # 技能重塑补贴带来的额外转岗率
+MIN_K = 5                   # 折算匹配效率时 k 的下限 (补贴最多把效率提高到 4 倍)
+DEMAND_LEVELS = np.geomspace(0.01, 0.12, 12)   # 企业希望维持的空缺数 / 劳动者数
+
+
+def _smooth_matches(u, v, m):
+    # 期望匹配数 m 平滑地截断在 min(u, v) 以下：招聘与求职两侧都是 1 - exp(-x) 形式，
+    # 随 u、v 严格单调，不会像硬截断那样在高需求市场把失业率压到同一个下限
+    h = np.where(u > 0, u * -np.expm1(-np.divide(m, u, out=np.zeros_like(m), where=u > 0)), 0)
+    return np.where(v > 0, v * -np.expm1(-np.divide(h, v, out=np.zeros_like(h), where=v > 0)), 0)
+
+
+@timed()
+def simulate_matching(ai_risk, mismatch, policy_effect=0, labor_force=1_000_000, periods=150,
+                      demand_levels=DEMAND_LEVELS, burn_in=90, seed=0):
+    """返回 (u, v)：各需求水平下稳态失业率与空缺率 (%)，按 u 升序排列。"""
+    if not 0 <= burn_in < periods:
+        raise ValueError(f"burn_in 须满足 0 <= burn_in < periods，当前 burn_in={burn_in}, periods={periods}")
+    rng = np.random.default_rng(seed)
+    demand_levels = np.asarray(demand_levels, dtype=float)
+    k = len(demand_levels)
+    per_market = labor_force // k
+
+    sep_rate = BASE_SEPARATION + AI_SEPARATION * ai_risk / 100
+    ai_share_of_sep = AI_SEPARATION * ai_risk / 100 / sep_rate
+    new_skill_share = 0.6 * ai_risk / 100                    # 新空缺中要求新技能的比例
+    penalty = min(0.9, 0.4 * mismatch)                       # 错配导致的匹配效率折损
+    reskill = BASE_RESKILL / (1 + mismatch) + POLICY_RESKILL * policy_effect
+    base_k = float(beveridge_k(0, 0, 0))
+    efficiency = MATCH_EFFICIENCY * base_k / max(float(beveridge_k(mismatch, policy_effect, 0)), MIN_K)
+
+    # --- 劳动力计数 (初始全部就业) ---
+    employed = np.full(k, per_market, dtype=np.int64)
+    u_ok = np.zeros(k, dtype=np.int64)                       # 技能可用的失业者
+    u_obs = np.zeros(k, dtype=np.int64)                      # 技能过时的失业者
+
+    # --- 空缺 (每个市场的旧技能 / 新技能空缺数) ---
+    v_old = np.zeros(k, dtype=np.int64)
+    v_new = np.zeros(k, dtype=np.int64)
+    refill = np.zeros(k, dtype=np.int64)
+
+    u_sum = np.zeros(k)
+    v_sum = np.zeros(k)
+    for t in range(1, periods + 1):
+        # 1. 转岗学习：技能过时者每期以 reskill 的概率完成，回到技能可用的失业者中
+        done = rng.binomial(u_obs, reskill)
+        u_obs -= done
+        u_ok += done
+
+        # 2. 离职：AI 替代造成的离职使技能过时
+        separated = rng.binomial(employed, sep_rate)
+        by_ai = rng.binomial(separated, ai_share_of_sep)
+        employed -= separated
+        u_ok += separated - by_ai
+        u_obs += by_ai
+
+        # 3. 空缺：企业补发上期已招满的岗位，并按目标空缺率发布新空缺，
+        #    使空缺存量收敛到 demand_levels · N/K 附近
+        posted = rng.poisson(VACANCY_LAPSE * demand_levels * per_market) + refill
+        posted_new = rng.binomial(posted, new_skill_share)
+        v_old += posted - posted_new
+        v_new += posted_new
+
+        # 4. 匹配：技能过时者只能应聘不要求新技能的空缺，且效率打折；
+        #    求职者按 f = M/U、空缺按 q = M/V 各自抽签，期望录用数与匹配函数一致
+        v_all = v_old + v_new
+        if t > burn_in:
+            # 稳态统计取匹配前的存量：本期正在找工作的人与挂出的空缺
+            u_sum += u_ok + u_obs
+            v_sum += v_all
+        old_share = np.divide(v_old, v_all, out=np.zeros(k), where=v_all > 0)
+        u_eff = u_ok + (1 - penalty) * old_share * u_obs
+        matches = _smooth_matches(u_eff, v_all, efficiency * u_eff**MATCH_ELASTICITY * v_all**(1 - MATCH_ELASTICITY))
+        f_ok = np.divide(matches, u_eff, out=np.zeros(k), where=u_eff > 0)
+        f_obs = f_ok * (1 - penalty) * old_share
+        # 空缺侧的招满概率：技能过时者只占用旧技能空缺，其余录用者均匀分布在全部空缺上
+        q_new = np.divide(f_ok * u_ok, v_all, out=np.zeros(k), where=v_all > 0)
+        q_old = q_new + np.divide(f_obs * u_obs, v_old, out=np.zeros(k), where=v_old > 0)
+        hired_ok = rng.binomial(u_ok, f_ok)
+        hired_obs = rng.binomial(u_obs, f_obs)
+        u_ok -= hired_ok
+        u_obs -= hired_obs
+        employed += hired_ok + hired_obs
+
+        # 招满的空缺下期补发；未招满的再以 VACANCY_LAPSE 的概率撤销
+        filled_old = rng.binomial(v_old, np.minimum(q_old, 1))
+        filled_new = rng.binomial(v_new, np.minimum(q_new, 1))
+        refill = filled_old + filled_new
+        v_old -= filled_old + rng.binomial(v_old - filled_old, VACANCY_LAPSE)
+        v_new -= filled_new + rng.binomial(v_new - filled_new, VACANCY_LAPSE)
+
+    n_obs = periods - burn_in
+    u = u_sum / n_obs / per_market * 100
+    v = v_sum / n_obs / per_market * 100
+    order = np.argsort(u)
+    return u[order], v[order]
@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from ..metrics import timed
+from .estimation import SURVEY_PATH, iter_chunks, _read_columns
+
+# ==========================================
+# 列式微观数据仓库 (memory-mapped .npy + 分组索引)
+# ==========================================
+# 一次性导入:  python -m lmdt.engine.microdata [调查数据文件] [输出目录]
+#   * 按 (地区, 受教育年限, 性别) 分桶做计数排序，同一桶的行连续存放、桶内按 ln(工资) 升序，
+#     offsets[b]:offsets[b+1] 即第 b 个桶的行区间
+#   * 每个桶预先累加 Oaxaca 回归所需的充分统计量 (n, Σx, X'X, X'y)，
+#     均值与分解只需按下标求和；单桶分位数直接按下标读取
+# 运行时各列以只读 mmap 打开，所有会话与 worker 进程通过 page cache 共享同一份数据。
+STORE_DIR = Path(os.environ.get("LMDT_MICRODATA_DIR", Path(__file__).resolve().parent.parent / "data" / "microdata"))
+OAXACA_REGRESSORS = ("const", "edu", "exp", "exp2")
+_META_FILE = "meta.json"
+
+
+def _oaxaca_x(edu, exp):
+    return np.column_stack([np.ones_like(exp), edu, exp, exp**2])
+
+
+def _log_wage(chunk):
+    if "ln_wage" in chunk:
+        return chunk["ln_wage"].to_numpy(dtype=float)
+    wage = chunk["wage"].to_numpy(dtype=float)
+    return np.log(np.where(wage > 0, wage, np.nan))
+
+
+@timed()
+def ingest(src=SURVEY_PATH, out_dir=STORE_DIR, chunk_rows=1_000_000):
+    """把 CSV / Parquet 调查数据转换为列式仓库，返回输出目录。
+
+    需要 wage (或 ln_wage)、edu、exp、region、gender 列；分三遍扫描，内存只与块大小有关。
+    """
+    import pandas as pd
+
+    names = _read_columns(src)
+    y_col = "ln_wage" if "ln_wage" in names else "wage"
+    columns = [y_col, "edu", "exp", "region", "gender"]
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(f"数据缺少必要列: {missing}")
+
+    def clean(chunk):
+        y = _log_wage(chunk)
+        edu = np.rint(chunk["edu"].to_numpy(dtype=float))
+        exp = chunk["exp"].to_numpy(dtype=float)
+        keep = np.isfinite(y) & np.isfinite(edu) & np.isfinite(exp) & chunk["region"].notna().to_numpy() & chunk["gender"].notna().to_numpy()
+        return (y[keep], edu[keep].astype(np.int64), exp[keep],
+                chunk["region"].astype(str)[keep], chunk["gender"].astype(str)[keep])
+
+    # 第一遍：类别取值与受教育年限范围
+    regions, genders = set(), set()
+    edu_lo, edu_hi = np.inf, -np.inf
+    for chunk in iter_chunks(src, columns, chunk_rows, text=("region", "gender")):
+        _, edu, _, region, gender = clean(chunk)
+        regions.update(region.unique().tolist())
+        genders.update(gender.unique().tolist())
+        if len(edu):
+            edu_lo, edu_hi = min(edu_lo, edu.min()), max(edu_hi, edu.max())
+    regions, genders = sorted(regions), sorted(genders)
+    edu_values = list(range(int(edu_lo), int(edu_hi) + 1))
+    shape = (len(regions), len(edu_values), len(genders))
+    n_buckets = int(np.prod(shape))
+
+    def bucket_of(edu, region, gender):
+        r = pd.Categorical(region, categories=regions).codes.astype(np.int64)
+        g = pd.Categorical(gender, categories=genders).codes.astype(np.int64)
+        return np.ravel_multi_index((r, edu - edu_values[0], g), shape)
+
+    # 第二遍：计数 → 偏移 → 按桶散写到 mmap 列
+    counts = np.zeros(n_buckets, dtype=np.int64)
+    for chunk in iter_chunks(src, columns, chunk_rows, text=("region", "gender")):
+        _, edu, _, region, gender = clean(chunk)
+        counts += np.bincount(bucket_of(edu, region, gender), minlength=n_buckets)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    n = int(offsets[-1])
+
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    ln_wage = np.lib.format.open_memmap(tmp_dir / "ln_wage.npy", mode="w+", dtype=np.float32, shape=(n,))
+    exp_col = np.lib.format.open_memmap(tmp_dir / "exp.npy", mode="w+", dtype=np.float32, shape=(n,))
+    cursor = offsets[:-1].copy()
+    for chunk in iter_chunks(src, columns, chunk_rows, text=("region", "gender")):
+        y, edu, exp, region, gender = clean(chunk)
+        b = bucket_of(edu, region, gender)
+        order = np.argsort(b, kind="stable")
+        b_sorted = b[order]
+        first = np.searchsorted(b_sorted, b_sorted)            # 每行在本块同桶中的名次
+        pos = cursor[b_sorted] + np.arange(len(b_sorted)) - first
+        ln_wage[pos] = y[order]
+        exp_col[pos] = exp[order]
+        cursor += np.bincount(b, minlength=n_buckets)
+
+    # 桶内排序并累加充分统计量
+    k = len(OAXACA_REGRESSORS)
+    stats_n = counts.astype(float)
+    stats_xsum = np.zeros((n_buckets, k))
+    stats_xtx = np.zeros((n_buckets, k, k))
+    stats_xty = np.zeros((n_buckets, k))
+    stats_ysum = np.zeros(n_buckets)
+    for b in np.flatnonzero(counts):
+        lo, hi = offsets[b], offsets[b + 1]
+        order = np.argsort(ln_wage[lo:hi])
+        y = ln_wage[lo:hi][order]
+        exp = exp_col[lo:hi][order]
+        ln_wage[lo:hi], exp_col[lo:hi] = y, exp
+        edu = edu_values[np.unravel_index(b, shape)[1]]
+        X = _oaxaca_x(np.full(len(y), float(edu)), exp.astype(float))
+        stats_xsum[b] = X.sum(axis=0)
+        stats_xtx[b] = X.T @ X
+        stats_xty[b] = X.T @ y.astype(float)
+        stats_ysum[b] = y.sum(dtype=float)
+    ln_wage.flush()
+    exp_col.flush()
+    del ln_wage, exp_col
+
+    np.save(tmp_dir / "offsets.npy", offsets)
+    np.savez(tmp_dir / "bucket_stats.npz", n=stats_n, xsum=stats_xsum, xtx=stats_xtx, xty=stats_xty, ysum=stats_ysum)
+    meta = {"regions": regions, "edu_values": edu_values, "genders": genders, "rows": n, "source": str(src)}
+    (tmp_dir / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    # 整个目录替换，正在读取旧仓库的进程不受影响
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return out_dir
+
+
+class MicrodataStore:
+    """只读的列式仓库。筛选条件为 None 表示不限；edu 可为整数或 (下限, 上限) 闭区间。"""
+
+    def __init__(self, store_dir=STORE_DIR):
+        store_dir = Path(store_dir)
+        meta = json.loads((store_dir / _META_FILE).read_text(encoding="utf-8"))
+        self.regions = meta["regions"]
+        self.edu_values = meta["edu_values"]
+        self.genders = meta["genders"]
+        self.rows = meta["rows"]
+        self.shape = (len(self.regions), len(self.edu_values), len(self.genders))
+        self.ln_wage = np.load(store_dir / "ln_wage.npy", mmap_mode="r")
+        self.exp = np.load(store_dir / "exp.npy", mmap_mode="r")
+        self.offsets = np.load(store_dir / "offsets.npy")
+        with np.load(store_dir / "bucket_stats.npz") as stats:
+            self.stats = {name: stats[name] for name in stats.files}
+
+    def buckets(self, region=None, edu=None, gender=None):
+        """满足条件的桶编号 (一维数组)。"""
+        mask = np.ones(self.shape, dtype=bool)
+        if region is not None:
+            mask &= (np.array(self.regions) == region)[:, None, None]
+        if edu is not None:
+            lo, hi = (edu, edu) if np.isscalar(edu) else edu
+            mask &= ((np.array(self.edu_values) >= lo) & (np.array(self.edu_values) <= hi))[None, :, None]
+        if gender is not None:
+            mask &= (np.array(self.genders) == gender)[None, None, :]
+        return np.flatnonzero(mask.ravel())
+
+    def count(self, **where):
+        return int(self.stats["n"][self.buckets(**where)].sum())
+
+    def mean_log_wage(self, **where):
+        b = self.buckets(**where)
+        n = self.stats["n"][b].sum()
+        return self.stats["ysum"][b].sum() / n if n else np.nan
+
+    def log_wages(self, **where):
+        """满足条件的全部 ln(工资)，只读取对应桶的连续区间。"""
+        b = self.buckets(**where)
+        parts = [self.ln_wage[self.offsets[i]:self.offsets[i + 1]] for i in b if self.offsets[i + 1] > self.offsets[i]]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+    def quantiles(self, qs=(0.1, 0.25, 0.5, 0.75, 0.9), **where):
+        """工资分位数；只涉及一个桶时 (桶内已排序) 直接按下标读取。"""
+        qs = np.asarray(qs, dtype=float)
+        b = self.buckets(**where)
+        b = b[self.stats["n"][b] > 0]
+        if len(b) == 0:
+            return np.full(len(qs), np.nan)
+        if len(b) == 1:
+            lo, hi = self.offsets[b[0]], self.offsets[b[0] + 1]
+            return np.exp(self.ln_wage[lo + np.minimum(((hi - lo) * qs).astype(np.int64), hi - lo - 1)].astype(float))
+        return np.exp(np.quantile(self.log_wages(**where), qs))
+
+    def _moments(self, b):
+        s = self.stats
+        n = s["n"][b].sum()
+        xtx, xty = s["xtx"][b].sum(axis=0), s["xty"][b].sum(axis=0)
+        beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]   # 某组只含一个受教育年限时 X'X 奇异
+        return n, s["xsum"][b].sum(axis=0) / n, s["ysum"][b].sum() / n, beta
+
+    def oaxaca(self, group_a, group_b):
+        """两组 ln(工资) 均值差的 Oaxaca-Blinder 二重分解，以 A 组系数为基准。
+
+        group_a / group_b 为筛选条件字典，例如 {"gender": "男"}。返回 {"gap", "explained",
+        "unexplained", "n_a", "n_b", "detail"}，detail 为各解释变量的可解释部分。
+        """
+        n_a, x_a, y_a, beta_a = self._moments(self.buckets(**group_a))
+        n_b, x_b, y_b, beta_b = self._moments(self.buckets(**group_b))
+        explained = (x_a - x_b) * beta_a
+        return {
+            "gap": y_a - y_b,
+            "explained": float(explained.sum()),
+            "unexplained": float(x_b @ (beta_a - beta_b)),
+            "n_a": int(n_a),
+            "n_b": int(n_b),
+            "detail": dict(zip(OAXACA_REGRESSORS, explained)),
+        }
+
+
+_store = None
+_store_loaded = False
+
+
+def get_store():
+    """进程内只加载一次；仓库未导入时返回 None。"""
+    global _store, _store_loaded
+    if not _store_loaded:
+        try:
+            _store = MicrodataStore()
+        except FileNotFoundError:
+            _store = None
+        _store_loaded = True
+    return _store
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(f"微观数据仓库已写入: {ingest(*sys.argv[1:3])}")
@@ -0,0 +1,61 @@
+import numpy as np
+
+from ..metrics import timed
+
+# ==========================================
+# 迁移决策净现值 (Ch6 劳动力流动)
+# ==========================================
+DISCOUNT_RATE = 0.05
+HORIZON_YEARS = 20
+RATE_GRID = np.round(np.arange(0.01, 0.105, 0.01), 2)  # 敏感性曲面的贴现率轴
+
+
+@timed()
+def calc_migration_npv(w_home, w_city, cost_move, cost_psych, years=HORIZON_YEARS, rate=DISCOUNT_RATE):
+    """累计净现值。参数可为形状相同(或可广播)的数组，年份轴追加在最后一维。"""
+    t = np.arange(1, years+1)
+    w_home, w_city, cost_move, cost_psych, rate = (
+        np.asarray(a, dtype=float)[..., None] for a in (w_home, w_city, cost_move, cost_psych, rate)
+    )
+    benefit = (w_city - w_home) * 12
+    costs = cost_psych + cost_move * (t == 1)  # 搬迁成本只在第 1 年发生
+    net = benefit - costs
+    cum_npv = np.cumsum(net / ((1 + rate) ** t), axis=-1)
+    return t, cum_npv
+
+
+def calc_breakeven(cum_npv):
+    """首次累计净现值转正的年份 (从 1 起计)，始终未转正则返回 0。"""
+    positive = np.asarray(cum_npv) > 0
+    return np.where(positive.any(axis=-1), positive.argmax(axis=-1) + 1, 0)
+
+
+def annuity_factor(years, rate):
+    """年金现值系数 sum_{t=1..years} (1+rate)^-t，rate=0 时为 years。"""
+    years, rate = np.asarray(years, dtype=float), np.asarray(rate, dtype=float)
+    safe = np.where(rate == 0, 1.0, rate)
+    return np.where(rate == 0, years, (1 - (1 + safe) ** -years) / safe)
+
+
+@timed()
+def migration_surface(w_diff, cost_move, cost_psych, rate=DISCOUNT_RATE, years=HORIZON_YEARS):
+    """闭式求解的敏感性曲面：返回 (回本年份, 第 years 年的累计净现值)。
+
+    每年净收益 b = 12·w_diff - cost_psych 固定，累计净现值为 b·a(T) - cost_move/(1+r)，
+    a(T) 为年金现值系数，因此回本年份可直接由 a(T) > cost_move / ((1+r)·b) 反解，
+    不需要逐年累加。参数按 NumPy 规则广播，回本年份的含义与 calc_breakeven 相同。
+    """
+    w_diff, cost_move, cost_psych, rate = (np.asarray(a, dtype=float) for a in (w_diff, cost_move, cost_psych, rate))
+    b = 12 * w_diff - cost_psych
+    hurdle = cost_move / (1 + rate)
+    npv = b * annuity_factor(years, rate) - hurdle
+    with np.errstate(divide="ignore", invalid="ignore"):
+        target = hurdle / b                                   # 需要达到的年金系数
+        # 解 a(T*) = target：T* = -ln(1 - r·target) / ln(1+r)，r=0 时 T* = target
+        t_star = np.where(rate == 0, target, -np.log1p(-rate * target) / np.log1p(rate))
+        breakeven = np.maximum(np.floor(t_star) + 1, 1)       # 第一个严格超过门槛的整数年
+        # T* 恰为整数时 (累计净现值正好为 0，不算回本) 浮点误差可能落在两侧，按该年的值校正一次
+        breakeven += np.nan_to_num(b * annuity_factor(breakeven, rate) - hurdle) <= 1e-9
+    reachable = (b > 0) & np.isfinite(breakeven) & (breakeven <= years)
+    breakeven = np.where(reachable, breakeven, 0).astype(np.int16)
+    return breakeven, npv
@@ -0,0 +1,39 @@
+import numpy as np
+
+from ..metrics import timed
+
+# ==========================================
+# 明瑟收入方程 (Ch5 人力资本)
+# ==========================================
+BASE_LN_WAGE = 7.0
+RETURN_BASE = 0.08      # 教育基础回报率
+RETURN_GEN = 0.004      # 每单位一般培训带来的回报率提升
+RETURN_SPEC = 0.002     # 每单位特殊培训带来的回报率提升
+EXP_LINEAR = 0.05
+EXP_QUAD = 0.0006
+# 系数字典的键，估计模块 (lmdt.engine.estimation) 拟合出的系数与此一一对应
+DEFAULT_COEF = {"base": BASE_LN_WAGE, "r_edu": RETURN_BASE, "r_gen": RETURN_GEN, "r_spec": RETURN_SPEC,
+                "exp_linear": EXP_LINEAR, "exp_quad": EXP_QUAD}
+
+EXP_GRID = np.linspace(0, 40, 100)  # 页面默认的工龄横轴
+
+
+@timed()
+def calc_mincer(edu, exp, gen_t, spec_t, disc, coef=None):
+    """逐元素计算工资与歧视后工资，参数可以是标量或任意可广播的数组。
+
+    coef 为 None 时使用教材设定的系数 DEFAULT_COEF，也可传入由微观数据估计出的系数。
+    """
+    c = DEFAULT_COEF if coef is None else coef
+    r = c["r_edu"] + (c["r_gen"] * gen_t) + (c["r_spec"] * spec_t)
+    ln_w = c["base"] + r * edu + c["exp_linear"] * exp - c["exp_quad"] * (exp**2)
+    wage = np.exp(ln_w)
+    wage_disc = wage * (1 - disc/100)
+    return wage, wage_disc
+
+
+@timed()
+def mincer_batch(edu, gen_t, spec_t, disc, exp=EXP_GRID, coef=None):
+    """批量版本：N 组参数 × M 个工龄点，一次返回形状为 (N, M) 的两个矩阵。"""
+    edu, gen_t, spec_t, disc = (np.asarray(a, dtype=float)[..., None] for a in (edu, gen_t, spec_t, disc))
+    return calc_mincer(edu, np.asarray(exp, dtype=float), gen_t, spec_t, disc, coef=coef)
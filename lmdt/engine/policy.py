@@ -0,0 +1,101 @@
+import itertools
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..metrics import timed
+from .beveridge import beveridge_k
+from .matching import simulate_matching
+
+# ==========================================
+# 政策组合全景扫描 (Ch9 失业 · 政策沙盘)
+# ==========================================
+# 均衡失业率 = 贝弗里奇曲线 v = k/u 与职位创造曲线 v = θ·u 的交点，u* = sqrt(k/θ)。
+#   * 技能重塑补贴：降低 k (即 beveridge_k 中的 policy_effect)
+#   * 最低工资调整：企业用工成本上升，θ 下降
+#   * 失业救济金：保留工资上升、搜寻强度下降，θ 下降且 k 上升
+POLICIES = ("最低工资调整", "技能重塑补贴(Reskilling)", "失业救济金")
+POLICY_COMBOS = tuple(tuple(p for p, on in zip(POLICIES, mask) if on)
+                      for mask in itertools.product((False, True), repeat=len(POLICIES)))
+BASE_THETA = 1.25           # 无干预时的 v/u，使基准 (k=20) 的均衡失业率为 4%
+MIN_WAGE_THETA = 0.8
+BENEFIT_THETA = 0.9
+BENEFIT_K = 5
+AI_RISK_GRID = np.linspace(0, 100, 11)
+MISMATCH_GRID = np.linspace(0, 2.0, 11)
+SWEEP_LABOR_FORCE = 100_000  # 仿真扫描时每个情景的劳动力规模
+WORKERS = int(os.environ.get("LMDT_SWEEP_WORKERS", 1))   # 每个网格点的仿真只需约 0.04 s，进程池的启动开销反而更大
+
+
+def policy_levers(policies):
+    """政策组合 → (policy_effect, θ 乘数, k 增量)。"""
+    policies = set(policies)
+    policy_effect = 1.0 if "技能重塑补贴(Reskilling)" in policies else 0.0
+    theta = BASE_THETA
+    k_shift = 0.0
+    if "最低工资调整" in policies:
+        theta *= MIN_WAGE_THETA
+    if "失业救济金" in policies:
+        theta *= BENEFIT_THETA
+        k_shift += BENEFIT_K
+    return policy_effect, theta, k_shift
+
+
+def equilibrium_u(u, v, theta):
+    """仿真得到的 (u, v) 点列与射线 v = θ·u 的交点 (沿曲线按 ln(v/u) 插值)。"""
+    ratio = np.log(np.asarray(v) / np.asarray(u))
+    order = np.argsort(ratio)
+    return float(np.interp(np.log(theta), ratio[order], np.asarray(u)[order]))
+
+
+def simulated_theta(theta, k_shift):
+    """仿真中没有 k 的加项：按基准 k=20 把它折算为 θ 的同比例下降 (u* = sqrt(k/θ) 不变)。"""
+    return theta * 20 / (20 + k_shift)
+
+
+def _matching_job(args):
+    ai_risk, mismatch, policy_effect, labor_force, seed = args
+    return simulate_matching(ai_risk, mismatch, policy_effect, labor_force=labor_force, seed=seed)
+
+
+def _sweep_simulated(ai, mis, combos, labor_force, seed, workers):
+    levers = [policy_levers(c) for c in combos]
+    # 只有 policy_effect 改变仿真本身，θ 只决定在曲线上取哪一点：每个网格点至多仿真两次
+    effects = sorted({pe for pe, _, _ in levers})
+    jobs = [(float(a), float(m), pe, labor_force, seed) for pe in effects for a in ai for m in mis]
+    if workers > 1:
+        # spawn 而非 fork：Streamlit 服务进程是多线程的
+        with ProcessPoolExecutor(min(workers, len(jobs)), mp_context=mp.get_context("spawn")) as pool:
+            curves = list(pool.map(_matching_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        curves = [_matching_job(job) for job in jobs]
+    curves = dict(zip([(pe, a, m) for a, m, pe, _, _ in jobs], curves))
+    out = np.empty((len(combos), len(ai), len(mis)))
+    for c, (pe, theta, k_shift) in enumerate(levers):
+        theta = simulated_theta(theta, k_shift)
+        for i, a in enumerate(ai):
+            for j, m in enumerate(mis):
+                out[c, i, j] = equilibrium_u(*curves[(pe, float(a), float(m))], theta)
+    return out
+
+
+@timed()
+def sweep_policies(ai_risk=AI_RISK_GRID, mismatch=MISMATCH_GRID, combos=POLICY_COMBOS,
+                   method="analytic", labor_force=SWEEP_LABOR_FORCE, seed=0, workers=WORKERS):
+    """所有政策组合 × ai_risk × mismatch 的均衡失业率 (%)，形状 (组合数, len(ai_risk), len(mismatch))。
+
+    method="analytic" 用 u* = sqrt(k/θ) 一次广播算完整个网格；
+    method="simulation" 对每个网格点运行随机匹配仿真 (总量模型)，workers > 1 时多进程并行。
+    """
+    ai = np.asarray(ai_risk, dtype=float)
+    mis = np.asarray(mismatch, dtype=float)
+    if method == "simulation":
+        return _sweep_simulated(ai, mis, combos, labor_force, seed, workers)
+    if method != "analytic":
+        raise ValueError(f"未知的扫描方法: {method}")
+    levers = np.array([policy_levers(c) for c in combos])
+    policy_effect, theta, k_shift = (levers[:, i, None, None] for i in range(3))
+    k = beveridge_k(mis[None, None, :], policy_effect, ai[None, :, None]) + k_shift
+    return np.sqrt(np.maximum(k, 1e-9) / theta)
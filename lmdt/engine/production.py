@@ -0,0 +1,101 @@
+import numpy as np
+
+from ..metrics import timed
+from .demand import WAGE_GRID, tech_factor
+
+# ==========================================
+# CES 生产函数与派生需求 (Ch3 劳动力需求 · 异质性企业)
+# ==========================================
+# Q = A · [a·L^ρ + (1-a)·K^ρ]^(1/ρ)，ρ = (σ-1)/σ，σ = 1 时退化为 Cobb-Douglas Q = A·L^a·K^(1-a)。
+# 技术偏向 bias 调整劳动的分配参数：a = α·bias / (α·bias + 1 - α)，
+# bias > 1 为劳动互补型，bias < 1 为劳动替代型 (与 TECH_FACTORS 的取值一致)。
+# 短期资本固定、企业为价格接受者，由 P·MPL = w 得到每家企业的劳动需求闭式解，
+# 所有参数均为可广播的数组：N 家企业 × M 个工资点一次算完。
+ALPHA = 0.6             # 劳动的分配参数 (中性技术)
+TFP = 30.0              # 全要素生产率 A 的基准水平
+MAX_LABOR_RATIO = 50.0  # L/K 上限 (产能约束)：σ > 1 且工资低于边际产品下限时需求无界
+OUTPUT_ELASTICITY = 1.5 # 行业产品需求价格弹性 η (Hicks-Marshall 第二定律)
+_SIGMA_EPS = 1e-6
+
+
+def labor_weight(bias, alpha=ALPHA):
+    bias = np.asarray(bias, dtype=float)
+    return alpha * bias / (alpha * bias + 1 - alpha)
+
+
+def labor_share(labor_ratio, sigma, a):
+    """劳动收入份额 s_L = wL / PQ (x = L/K)。"""
+    x, sigma, a = (np.asarray(v, dtype=float) for v in (labor_ratio, sigma, a))
+    rho = np.where(np.abs(sigma - 1) < _SIGMA_EPS, 0.0, (sigma - 1) / sigma)
+    with np.errstate(divide="ignore", over="ignore"):
+        # s = a / (a + (1-a)·x^(-ρ))，x → 0 时 σ < 1 趋于 1、σ > 1 趋于 0
+        return a / (a + (1 - a) * x ** -rho)
+
+
+def ces_output(labor, capital, sigma, bias=1.0, tfp=TFP, alpha=ALPHA):
+    L, K, sigma, tfp = (np.asarray(v, dtype=float) for v in (labor, capital, sigma, tfp))
+    a = labor_weight(bias, alpha)
+    cd = np.abs(sigma - 1) < _SIGMA_EPS
+    rho = np.where(cd, 1.0, (sigma - 1) / sigma)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        ces = tfp * (a * L**rho + (1 - a) * K**rho) ** (1 / rho)
+        return np.where(cd, tfp * L**a * K**(1 - a), ces)
+
+
+@timed()
+def ces_labor_demand(capital, prod_price, sigma, bias=1.0, tfp=TFP, w=WAGE_GRID, alpha=ALPHA):
+    """短期劳动需求 L(w)。企业参数形状为 (N,) (或可广播)，工资轴追加在最后一维，返回形状 (N, M)。"""
+    K, P, sigma, tfp = (np.asarray(v, dtype=float)[..., None] for v in (capital, prod_price, sigma, tfp))
+    a = labor_weight(bias, alpha)[..., None]
+    w = np.asarray(w, dtype=float)
+    cd = np.abs(sigma - 1) < _SIGMA_EPS
+    safe_sigma = np.where(cd, 2.0, sigma)
+    rho = (safe_sigma - 1) / safe_sigma
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        # CES：P·A·a·[a + (1-a)·x^(-ρ)]^(1/(σ-1)) = w  ⇒  x^(-ρ) = ((w/(P·A·a))^(σ-1) - a) / (1-a)
+        rhs = ((w / (P * tfp * a)) ** (safe_sigma - 1) - a) / (1 - a)
+        x_ces = np.where(rhs > 0, rhs ** (-1 / rho), np.where(safe_sigma > 1, np.inf, 0.0))
+        # Cobb-Douglas：P·A·a·x^(a-1) = w
+        x_cd = (w / (P * tfp * a)) ** (1 / (a - 1))
+    x = np.minimum(np.where(cd, x_cd, x_ces), MAX_LABOR_RATIO)
+    return w, K * x
+
+
+def hicks_marshall(labor_share, sigma, eta=OUTPUT_ELASTICITY, capital_supply=np.inf):
+    """自身工资弹性及其 Hicks-Marshall 分解，返回 dict (各项均为负数或 0)。
+
+    substitution = -(1-s)·σ (替代效应)，scale = -s·η (规模效应)，二者之和为资本供给完全弹性时的长期弹性；
+    capital_supply (资本供给弹性 e) 有限时 total 按 Hicks 一般公式计算，short_run 为资本固定且 η→∞ 时的 -σ/(1-s)。
+    """
+    s, sigma, eta, e = (np.asarray(v, dtype=float) for v in (labor_share, sigma, eta, capital_supply))
+    substitution = -(1 - s) * sigma
+    scale = -s * eta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        general = -(sigma * (eta + e) + s * e * (eta - sigma)) / (eta + e - s * (eta - sigma))
+        short_run = np.where(s < 1, -sigma / (1 - s), -np.inf)
+    total = np.where(np.isinf(e), substitution + scale, general)
+    return {"substitution": substitution, "scale": scale, "total": total, "short_run": short_run}
+
+
+@timed()
+def sample_industry(n_firms, capital, prod_price, tech_type, sigma, dispersion=0.4, seed=0):
+    """异质性企业：资本与 TFP 对数正态、σ 与技术偏向在均值附近扰动。返回各参数数组组成的 dict。"""
+    rng = np.random.default_rng(seed)
+    return {
+        "capital": capital * np.exp(dispersion * rng.standard_normal(n_firms) - dispersion**2 / 2),
+        "tfp": TFP * np.exp(0.5 * dispersion * rng.standard_normal(n_firms) - dispersion**2 / 8),
+        "sigma": np.clip(sigma * np.exp(0.25 * rng.standard_normal(n_firms)), 0.1, 5.0),
+        "bias": tech_factor(tech_type) * np.exp(0.2 * rng.standard_normal(n_firms)),
+        "prod_price": np.full(n_firms, float(prod_price)),
+    }
+
+
+@timed()
+def industry_demand(firms, w=WAGE_GRID, eta=OUTPUT_ELASTICITY):
+    """行业劳动需求与各企业弹性。返回 (w, 每家企业需求 (N, M), 行业需求 (M,), 在 w 上的分解 dict (N, M))。"""
+    w, labor = ces_labor_demand(firms["capital"], firms["prod_price"], firms["sigma"], firms["bias"], firms["tfp"], w)
+    a = labor_weight(firms["bias"])[:, None]
+    share = labor_share(labor / firms["capital"][:, None], firms["sigma"][:, None], a)
+    terms = hicks_marshall(share, firms["sigma"][:, None], eta)
+    terms["labor_share"] = share
+    return w, labor, labor.sum(axis=0), terms
@@ -0,0 +1,67 @@
+import numpy as np
+
+from ..metrics import timed
+from .beveridge import U_GRID, beveridge_k
+from .demand import WAGE_GRID, tech_factor
+from .equilibrium import FIRMS_PER_MARKET, RESERVATION_WAGE, WORKERS_PER_CAPITAL, labor_supply, minimum_wage_statics
+from .migration import calc_breakeven, calc_migration_npv
+from .mincer import mincer_batch
+from .policy import policy_levers
+from .production import TFP, ces_labor_demand
+from .tables import HOME_WAGE
+
+# ==========================================
+# 多情景对比 (每个实验室 N 组参数一次批量计算)
+# ==========================================
+# 每个函数的参数都是长度为 N 的序列 (第 i 个元素属于第 i 个情景)，返回 dict：
+# 曲线形状为 (N, 横轴点数)，指标形状为 (N,)。横轴是固定的模块常量 (EXP_GRID / WAGE_GRID / U_GRID)，
+# 不随情景返回。调用方 (lmdt.cache.cached_batch) 只把缓存未命中的情景拼成一批传进来。
+PREMIUM_INDEX = 20   # 与个体实验室 "教育溢价" 指标取同一工龄点
+
+
+@timed()
+def micro_scenarios(edu, gen_t, spec_t, disc, w_diff, c_move, c_psych):
+    """明瑟工资曲线 + 迁移净现值。"""
+    wage, wage_disc = mincer_batch(edu, gen_t, spec_t, disc)
+    base = mincer_batch(12, 0, 0, 0)[0]
+    _, cum_npv = calc_migration_npv(HOME_WAGE, HOME_WAGE + np.asarray(w_diff, dtype=float), c_move, c_psych)
+    return {
+        "wage": wage,
+        "wage_disc": wage_disc,
+        "cum_npv": cum_npv,
+        "start_wage": wage_disc[:, 0],
+        "premium": (wage[:, PREMIUM_INDEX] / base[PREMIUM_INDEX] - 1) * 100,
+        "npv": cum_npv[:, -1],
+        "breakeven": calc_breakeven(cum_npv),
+    }
+
+
+@timed()
+def market_scenarios(capital, prod_price, tech_type, sigma, min_wage):
+    """每个情景一个代表性市场 (资本按 FIRMS_PER_MARKET 家企业加总)，全部情景一起二分求出清工资。"""
+    capital = np.asarray(capital, dtype=float) * FIRMS_PER_MARKET
+    n = len(capital)
+    markets = {
+        "capital": capital,
+        "prod_price": np.asarray(prod_price, dtype=float),
+        "sigma": np.asarray(sigma, dtype=float),
+        "bias": np.asarray(tech_factor(list(tech_type)), dtype=float),
+        "tfp": np.full(n, TFP),
+        "workers": WORKERS_PER_CAPITAL * capital,
+        "reservation_wage": np.full(n, RESERVATION_WAGE),
+    }
+    stats = minimum_wage_statics(markets, np.asarray(min_wage, dtype=float))
+    _, demand = ces_labor_demand(markets["capital"], markets["prod_price"], markets["sigma"],
+                                 markets["bias"], markets["tfp"], WAGE_GRID)
+    return dict(stats, demand=demand, supply=labor_supply(WAGE_GRID, markets["workers"][:, None]))
+
+
+@timed()
+def macro_scenarios(ai_risk, mismatch, policy):
+    """贝弗里奇曲线与均衡失业率 u* = sqrt(k/θ)；policy 为每个情景的政策组合。"""
+    levers = np.array([policy_levers(p) for p in policy], dtype=float).reshape(-1, 3)
+    policy_effect, theta, k_shift = levers.T
+    k = beveridge_k(mismatch, policy_effect, ai_risk) + k_shift
+    u_star = np.sqrt(np.maximum(k, 1e-9) / theta)
+    # 曲线含救济金带来的 k 增量，使均衡点正好落在曲线上
+    return {"vacancy": k[:, None] / U_GRID, "u_star": u_star, "v_star": theta * u_star, "k": k}
@@ -0,0 +1,82 @@
+import numpy as np
+
+from ..metrics import timed
+from .mincer import DEFAULT_COEF
+
+# ==========================================
+# 终身收入与最优受教育年限 (Ch5 人力资本投资)
+# ==========================================
+# 决策时点为义务教育结束 (COMPULSORY_EDU 年)。多读一年书的代价是当年的学费和推迟一年就业
+# (放弃的收入)，收益是此后整个职业生涯更高的明瑟工资；工作到 RETIRE_AGE 为止，读得越久工作年限越短。
+# 终身收入 = 从决策时点起每年 12 × 月工资的贴现和。由于 ln w = base + r·S + a·x - b·x²，
+# 且 r 只依赖培训投入，现值可以分解为
+#   PV(S, ρ, g, s) = 12 · exp(base + r(g, s)·S) · K(S, ρ),   K(S, ρ) = Σ_t exp(a·x - b·x²)·(1+ρ)^-t
+# 逐年求和只在 (受教育年限 × 贴现率) 两维上做一次 (一次矩阵乘法)，再与培训两维外积，
+# 整个 (edu × 贴现率 × 一般培训 × 特殊培训) 网格的计算量与逐点求一条曲线相当。
+# 明瑟方程的教育回报率 r 是常数，工资随 S 呈指数增长，最优解基本落在两端 ("不读" 或接近 "读到底"，
+# 读得太久时缩短的工作年限才开始抵消溢价)，分界大致在 r ≈ 贴现率 处。decay > 0 时引入 Becker 模型中递减的边际回报率 r - decay·(S - 9)，
+# 即 ln w 额外减去 decay·(S - 9)²/2，最优年限出现在边际回报率与贴现率相交处。
+SCHOOL_START_AGE = 6
+COMPULSORY_EDU = 9
+RETIRE_AGE = 60
+HORIZON = RETIRE_AGE - SCHOOL_START_AGE - COMPULSORY_EDU   # 决策时点之后的年数
+TUITION = 8000   # 义务教育之后每年的学费与在学开支 (与 12 × 月工资同单位)
+RETURN_DECAY = 0.0     # 每多读一年边际回报率的降幅 (个体实验室滑块的默认值)；默认 0，与明瑟方程一致
+
+# 默认网格：受教育年限与培训投入与个体实验室滑块一致
+EDU_AXIS = np.arange(COMPULSORY_EDU, 23)
+TRAINING_AXIS = np.arange(0, 11)
+DISCOUNT_GRID = np.round(np.arange(0.01, 0.151, 0.005), 3)
+
+
+def _discount_sums(edu, rate, exp_linear, exp_quad):
+    """三个 (E, R) 的贴现和：在职年份的工龄项 K、在读年份按义务教育学历就业的工龄项、在读年数。"""
+    t = np.arange(HORIZON)
+    delay = (edu - COMPULSORY_EDU)[:, None]          # 在读年数，第 delay 年开始工作
+    discount = (1 + rate[:, None]) ** -t              # (R, H)，第 t 年的现值系数 (决策当年 t=0)
+    x = t - delay
+    working = np.where(x >= 0, np.exp(exp_linear * x - exp_quad * x**2), 0.0)
+    studying = t < delay
+    forgone = np.where(studying, np.exp(exp_linear * t - exp_quad * t**2), 0.0)
+    return working @ discount.T, forgone @ discount.T, studying @ discount.T
+
+
+@timed()
+def schooling_surface(edu=EDU_AXIS, rate=DISCOUNT_GRID, gen_t=TRAINING_AXIS, spec_t=TRAINING_AXIS,
+                      disc=0, tuition=TUITION, decay=RETURN_DECAY, coef=None):
+    """终身收入网格。四个参数都是一维轴，返回 dict，每项形状为 (edu, rate, gen_t, spec_t)：
+
+    earnings 职业生涯工资现值 (已扣除歧视)，tuition 学费现值，
+    forgone 在读期间放弃的收入现值 (按义务教育学历就业计算)，net = earnings - tuition。
+    放弃的收入已体现在推迟就业、工作年限缩短之中，net 不再重复扣除，forgone 仅用于展示成本构成。
+    """
+    c = DEFAULT_COEF if coef is None else coef
+    edu, rate, gen_t, spec_t = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (edu, rate, gen_t, spec_t))
+    if edu.min() < COMPULSORY_EDU or edu.max() >= COMPULSORY_EDU + HORIZON:
+        raise ValueError(f"受教育年限须在 [{COMPULSORY_EDU}, {COMPULSORY_EDU + HORIZON}) 之间")
+    working, forgone, studying = _discount_sums(edu, rate, c["exp_linear"], c["exp_quad"])
+
+    r = c["r_edu"] + c["r_gen"] * gen_t[:, None] + c["r_spec"] * spec_t[None, :]   # (G, S)
+    annual = 12 * (1 - disc/100)
+    extra = (edu - COMPULSORY_EDU)[:, None, None]
+    level = annual * np.exp(c["base"] + r * edu[:, None, None] - decay * extra**2 / 2)   # 工龄为 0 时的年收入
+    earnings = level[:, None] * working[:, :, None, None]
+    shape = earnings.shape
+    forgone = (annual * np.exp(c["base"] + r * COMPULSORY_EDU)) * forgone[:, :, None, None]
+    tuition = np.broadcast_to((tuition * studying)[:, :, None, None], shape)
+    return {"earnings": earnings, "tuition": tuition, "forgone": np.broadcast_to(forgone, shape),
+            "net": earnings - tuition}
+
+
+@timed()
+def optimal_schooling(edu=EDU_AXIS, rate=DISCOUNT_GRID, gen_t=TRAINING_AXIS, spec_t=TRAINING_AXIS,
+                      disc=0, tuition=TUITION, decay=RETURN_DECAY, coef=None):
+    """沿 edu 轴取终身净收入最大者。
+
+    返回 dict：edu 为最优受教育年限、net 为对应的终身净收入，形状均为 (rate, gen_t, spec_t)；
+    surface 为 schooling_surface 的完整结果。
+    """
+    surface = schooling_surface(edu, rate, gen_t, spec_t, disc, tuition, decay, coef)
+    best = surface["net"].argmax(axis=0)
+    edu = np.atleast_1d(np.asarray(edu))
+    return {"edu": edu[best], "net": np.take_along_axis(surface["net"], best[None], axis=0)[0], "surface": surface}
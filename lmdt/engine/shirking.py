@@ -0,0 +1,108 @@
+import numpy as np
+
+from ..metrics import timed
+
+# ==========================================
+# 偷懒模型与效率工资 (Ch8 薪酬激励 · Shapiro-Stiglitz)
+# ==========================================
+# 三种薪酬制度在同一组数组中并排仿真 (第 i 个岗位属于制度 i // n_workers)：
+#   * 计时工资：固定工资 w，企业以概率 q 抽查，发现偷懒即解雇
+#   * 计件工资：按产出付酬 (另有计量成本)，无需抽查；努力与否由计件收入与努力负效用比较决定
+#   * 效率工资：工资 w × 溢价，失业代价更高，满足不偷懒条件 (NSC) 的劳动者更多、离职更少
+# 劳动者的能力、努力负效用、外部机会在入职时抽取并保持不变，因此是否偷懒与离职 / 被解雇的
+# 风险率在入职时即已确定：入职时直接抽取离开的期数 (事件时间法)，每期只处理离开与补招的岗位，
+# 各项汇总指标增量更新。
+SCHEMES = ("计时工资", "计件工资", "效率工资")
+BASE_WAGE = 1.0            # 计时工资 (月薪，作为工资单位)
+PIECE_RATE = 1.0           # 每单位产出的计件报酬
+MEASURE_COST = 0.05        # 计件制下每人每月的产出计量成本
+BENEFIT = 0.6              # 失业后的收入 (救济 + 家庭生产)
+DISCOUNT = 0.01            # 月贴现率
+SHIRK_OUTPUT = 0.4         # 偷懒时的产出比例
+HIRING_COST = 0.5          # 每招聘、培训一人的成本
+BASE_QUIT = 0.015          # 与薪酬无关的月度离职率
+PAY_QUIT = 0.08            # 薪酬低于外部机会时额外的离职率上限
+_NEVER = np.iinfo(np.int16).max
+
+
+def _draw_workers(rng, n):
+    z = rng.standard_normal((3, n), dtype=np.float32)
+    ability = np.exp(0.3 * z[0] - np.float32(0.045))
+    effort_cost = np.float32(0.15) * np.exp(np.float32(0.6) * z[1])
+    outside = np.float32(0.95) * np.exp(np.float32(0.15) * z[2])
+    return ability, effort_cost, outside
+
+
+def _leave_periods(rng, hazard, t):
+    return np.minimum(t + rng.geometric(np.clip(hazard, 1e-6, 1.0)), _NEVER).astype(np.int16)
+
+
+def _contract(scheme, ability, effort_cost, outside, monitoring, premium):
+    """入职时确定：是否偷懒、月产出、月薪酬、离职风险率、被解雇风险率。"""
+    time_wage = np.where(scheme == 2, BASE_WAGE * premium, BASE_WAGE).astype(np.float32)
+    quit_guess = BASE_QUIT + PAY_QUIT / 2
+    # 不偷懒条件：e·(1 + (r + 离职率) / q) ≤ w - b，解雇威胁越可信 (q 越高) 越不偷懒
+    nsc = effort_cost * (1 + (DISCOUNT + quit_guess) / max(monitoring, 1e-6)) <= time_wage - BENEFIT
+    # 计件制：努力带来的额外计件收入 ≥ 努力负效用时才努力
+    piece_effort = PIECE_RATE * ability * (1 - SHIRK_OUTPUT) >= effort_cost
+    piece = scheme == 1
+    shirk = np.where(piece, ~piece_effort, ~nsc)
+    output = ability * np.where(shirk, SHIRK_OUTPUT, 1.0).astype(np.float32)
+    pay = np.where(piece, PIECE_RATE * output, time_wage)
+    # 薪酬 (扣除努力负效用) 低于外部机会越多，越可能离职
+    surplus = pay - np.where(shirk, 0, effort_cost) - outside
+    quit = BASE_QUIT + PAY_QUIT / (1 + np.exp(surplus / 0.05))
+    fire = np.where(shirk & ~piece, monitoring, 0.0)
+    cost = np.where(piece, pay + MEASURE_COST, pay)
+    return shirk, output, cost, quit, fire
+
+
+@timed()
+def simulate_pay_schemes(n_workers=100_000, periods=36, monitoring=0.2, premium=1.15, seed=0):
+    """三种薪酬制度并排仿真，返回逐期轨迹 dict，每项形状 (3, periods)。
+
+    output_per_cost：产出 / (薪酬 + 计量成本 + 招聘成本)；quit_rate / fire_rate / shirk_rate 为月度比例。
+    """
+    rng = np.random.default_rng(seed)
+    k = len(SCHEMES)
+    scheme = np.repeat(np.arange(k, dtype=np.int8), n_workers)
+    ability, effort_cost, outside = _draw_workers(rng, k * n_workers)
+    shirk, output, cost, quit, fire = _contract(scheme, ability, effort_cost, outside, monitoring, premium)
+    # 离开方式：先抽总风险率下的离开期数，再按 解雇 / (离职 + 解雇) 的比例决定原因
+    leave_at = _leave_periods(rng, quit + fire - quit * fire, 0)
+    fired = rng.random(k * n_workers, dtype=np.float32) < fire / np.maximum(quit + fire, 1e-12)
+
+    def totals(idx):
+        s = scheme[idx]
+        return (np.bincount(s, weights=output[idx], minlength=k), np.bincount(s, weights=cost[idx], minlength=k),
+                np.bincount(s, weights=shirk[idx], minlength=k))
+
+    out_sum, cost_sum, shirk_sum = totals(slice(None))
+    names = ("output_per_cost", "quit_rate", "fire_rate", "shirk_rate", "output_per_worker", "cost_per_worker")
+    traj = {name: np.zeros((k, periods)) for name in names}
+    for t in range(1, periods + 1):
+        leaving = np.flatnonzero(leave_at == t)
+        s = scheme[leaving]
+        n_fired = np.bincount(s, weights=fired[leaving], minlength=k)
+        n_left = np.bincount(s, minlength=k)
+        d_out, d_cost, d_shirk = totals(leaving)
+
+        # 原岗位补招新人：重新抽取个人特征，增量更新汇总
+        ability[leaving], effort_cost[leaving], outside[leaving] = _draw_workers(rng, len(leaving))
+        shirk[leaving], output[leaving], cost[leaving], quit[leaving], fire[leaving] = _contract(
+            s, ability[leaving], effort_cost[leaving], outside[leaving], monitoring, premium)
+        leave_at[leaving] = _leave_periods(rng, quit[leaving] + fire[leaving] - quit[leaving] * fire[leaving], t)
+        fired[leaving] = rng.random(len(leaving), dtype=np.float32) < fire[leaving] / np.maximum(quit[leaving] + fire[leaving], 1e-12)
+        a_out, a_cost, a_shirk = totals(leaving)
+        out_sum += a_out - d_out
+        cost_sum += a_cost - d_cost
+        shirk_sum += a_shirk - d_shirk
+
+        i = t - 1
+        traj["output_per_cost"][:, i] = out_sum / (cost_sum + HIRING_COST * n_left)
+        traj["quit_rate"][:, i] = (n_left - n_fired) / n_workers
+        traj["fire_rate"][:, i] = n_fired / n_workers
+        traj["shirk_rate"][:, i] = shirk_sum / n_workers
+        traj["output_per_worker"][:, i] = out_sum / n_workers
+        traj["cost_per_worker"][:, i] = cost_sum / n_workers
+    return traj
@@ -0,0 +1,138 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from ..metrics import timed
+from .migration import HORIZON_YEARS, calc_breakeven, calc_migration_npv
+from .mincer import EXP_GRID, mincer_batch
+
+# ==========================================
+# 预计算查找表 (memory-mapped .npy)
+# ==========================================
+# 个体实验室的所有滑块都是整数，输出空间有限：
+#   构建:  python -m lmdt.engine.tables [输出目录]
+#   运行:  页面调用 mincer_curve / migration_curve，表存在时直接按下标读取，
+#          多个 worker 进程通过 page cache 共享同一份只读映射；表缺失时退回实时计算。
+TABLE_DIR = Path(os.environ.get("LMDT_TABLE_DIR", Path(__file__).resolve().parent.parent / "data" / "tables"))
+
+# 滑块取值范围 (含两端)，与 pages/1_👤_个体职业实验室.py 保持一致
+MINCER_AXES = {"edu": (9, 22), "gen_t": (0, 10), "spec_t": (0, 10)}
+MIGRATION_AXES = {"w_diff": (1, 30), "c_move": (0, 100), "c_psych": (0, 50)}
+HOME_WAGE = 5  # 页面中的家乡月薪基准 (k)
+
+_META_FILE = "meta.json"
+
+
+def _axis(lo_hi):
+    lo, hi = lo_hi
+    return np.arange(lo, hi + 1)
+
+
+def _save_atomic(path, arr):
+    # 先写临时文件再 rename，避免正在读取的进程映射到半截文件
+    tmp = path.with_name(path.stem + ".tmp.npy")
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+
+
+def build_tables(out_dir=TABLE_DIR):
+    """一次性预计算全部曲线并写入 out_dir，返回输出目录。"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    edu, gen_t, spec_t = np.meshgrid(*(_axis(r) for r in MINCER_AXES.values()), indexing="ij")
+    # 歧视系数只是整体缩放 (1 - disc/100)，查表时再乘，不占用一个维度
+    wage, _ = mincer_batch(edu, gen_t, spec_t, 0)
+    _save_atomic(out_dir / "mincer_wage.npy", wage)
+
+    w_diff, c_move, c_psych = np.meshgrid(*(_axis(r) for r in MIGRATION_AXES.values()), indexing="ij")
+    _, cum_npv = calc_migration_npv(HOME_WAGE, HOME_WAGE + w_diff, c_move, c_psych)
+    _save_atomic(out_dir / "migration_npv.npy", cum_npv)
+    _save_atomic(out_dir / "migration_breakeven.npy", calc_breakeven(cum_npv).astype(np.int8))
+
+    meta = {"mincer": MINCER_AXES, "migration": MIGRATION_AXES, "home_wage": HOME_WAGE,
+            "exp_points": len(EXP_GRID), "years": HORIZON_YEARS}
+    (out_dir / _META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return out_dir
+
+
+class LookupTables:
+    """只读映射的查找表；越界或非整数参数返回 None，由调用方回退到实时计算。"""
+
+    def __init__(self, table_dir=TABLE_DIR):
+        table_dir = Path(table_dir)
+        meta = json.loads((table_dir / _META_FILE).read_text(encoding="utf-8"))
+        if meta["mincer"] != {k: list(v) for k, v in MINCER_AXES.items()} or \
+                meta["migration"] != {k: list(v) for k, v in MIGRATION_AXES.items()}:
+            raise ValueError(f"查找表与当前滑块范围不一致，请重新构建: {table_dir}")
+        self.mincer_wage = np.load(table_dir / "mincer_wage.npy", mmap_mode="r")
+        self.migration_npv = np.load(table_dir / "migration_npv.npy", mmap_mode="r")
+        self.migration_breakeven = np.load(table_dir / "migration_breakeven.npy", mmap_mode="r")
+
+    @staticmethod
+    def _index(axes, values):
+        idx = []
+        for (lo, hi), v in zip(axes.values(), values):
+            if not float(v).is_integer() or not lo <= v <= hi:
+                return None
+            idx.append(int(v) - lo)
+        return tuple(idx)
+
+    def mincer(self, edu, gen_t, spec_t, disc):
+        idx = self._index(MINCER_AXES, (edu, gen_t, spec_t))
+        if idx is None:
+            return None
+        wage = self.mincer_wage[idx]
+        return wage, wage * (1 - disc/100)
+
+    def migration(self, w_diff, c_move, c_psych):
+        idx = self._index(MIGRATION_AXES, (w_diff, c_move, c_psych))
+        if idx is None:
+            return None
+        return self.migration_npv[idx], int(self.migration_breakeven[idx])
+
+
+_tables = None
+_tables_loaded = False
+
+
+def get_tables():
+    """进程内只加载一次；表未构建时返回 None。"""
+    global _tables, _tables_loaded
+    if not _tables_loaded:
+        try:
+            _tables = LookupTables()
+        except (FileNotFoundError, ValueError):
+            _tables = None
+        _tables_loaded = True
+    return _tables
+
+
+@timed()
+def mincer_curve(edu, gen_t, spec_t, disc):
+    """默认工龄横轴上的 (wage, wage_disc)，优先查表。"""
+    tables = get_tables()
+    hit = tables.mincer(edu, gen_t, spec_t, disc) if tables is not None else None
+    if hit is not None:
+        return hit
+    return mincer_batch(edu, gen_t, spec_t, disc)
+
+
+@timed()
+def migration_curve(w_diff, c_move, c_psych):
+    """(years, cum_npv, breakeven_year)，breakeven_year 为 0 表示不值得迁移，优先查表。"""
+    years = np.arange(1, HORIZON_YEARS + 1)
+    tables = get_tables()
+    hit = tables.migration(w_diff, c_move, c_psych) if tables is not None else None
+    if hit is not None:
+        return (years, *hit)
+    _, cum_npv = calc_migration_npv(HOME_WAGE, HOME_WAGE + w_diff, c_move, c_psych)
+    return years, cum_npv, int(calc_breakeven(cum_npv))
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(f"查找表已写入: {build_tables(*sys.argv[1:2])}")
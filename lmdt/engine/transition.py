@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+from ..metrics import timed
+from .beveridge import beveridge_k
+from .cohort import QUANTILES
+from .matching import BASE_RESKILL, BASE_SEPARATION, POLICY_RESKILL
+from .policy import BASE_THETA, BENEFIT_K, BENEFIT_THETA, MIN_WAGE_THETA
+
+# ==========================================
+# AI 冲击后的季度转型路径 (Ch9 失业动态)
+# ==========================================
+# 流量方程 (时间单位为季度，u、v 为占劳动力的比例)：
+#   du_n/dt = s·(1-u) - f·u_n + r(t)·u_d                       普通失业者
+#   du_d/dt = s_ai(t)·(1-u) - (1-penalty)·f·u_d - r(t)·u_d     被 AI 替代、技能过时的失业者
+#   dv/dt   = κ·(θ(t)·u - v)                                    企业按目标 v/u 调整空缺
+# 匹配函数 M = A(t)·sqrt(u_eff·v)，u_eff = u_n + (1-penalty)·u_d，f = M/u_eff。
+# A(t) = A0·sqrt(20/k(t))，k(t) 即静态模型的 beveridge_k (AI 冲击按普及进度逐步计入)，
+# 所以冲击平息后路径收敛到 u* ≈ sqrt(k/θ)，与页面上的静态贝弗里奇曲线一致。
+# 政策在冲击后第 policy_quarter 个季度出台：最低工资、救济金立即改变 θ 与 k；技能重塑补贴要等
+# reskill_lag 个季度第一批学员结业后才开始见效 (降低 k、加快技能过时者转岗)，再经一个培训周期达到满额。
+# 全部情景堆叠为 (N,) 数组，用定步长 RK4 一起积分，时间循环之外没有任何逐情景的 Python 循环。
+QUARTERS = 40
+STEPS_PER_QUARTER = 4
+SHOCK_QUARTER = 2          # 冲击之前先画两个季度的稳态
+SEPARATION = 3 * BASE_SEPARATION
+BASE_U = 0.04              # 无错配、无冲击时的稳态失业率，与静态模型 sqrt(20/θ) 一致
+MATCH_EFFICIENCY = SEPARATION * (1 - BASE_U) / (BASE_U * np.sqrt(BASE_THETA))
+VACANCY_ADJUST = 2.0       # κ：空缺向目标 θ·u 调整的速度
+DISPLACEMENT = 0.08        # ai_risk = 100% 时普及期内被替代的就业者比例
+ADOPTION = (4, 12)         # AI 普及期 (季度) 的抽样范围
+TRANSITION_PATHS = int(os.environ.get("LMDT_TRANSITION_PATHS", 500))
+
+
+def _ramp(x):
+    return np.clip(x, 0.0, 1.0)
+
+
+@timed()
+def transition_paths(ai_risk, mismatch, reskill=0, min_wage=0, benefit=0, policy_quarter=4, reskill_lag=4,
+                     adoption=8, displacement=DISPLACEMENT, quarters=QUARTERS, steps=STEPS_PER_QUARTER):
+    """批量积分转型路径。参数为标量或长度为 N 的数组 (reskill / min_wage / benefit 为 0/1 开关)。
+
+    返回 dict：quarter 为季度轴，u、v、displaced (技能过时的失业者) 形状均为 (N, quarters + 1)，单位 %。
+    """
+    ai_risk, mismatch, reskill, min_wage, benefit, policy_quarter, reskill_lag, adoption, displacement = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=float))
+          for a in (ai_risk, mismatch, reskill, min_wage, benefit, policy_quarter, reskill_lag, adoption, displacement)))
+    policy_at = SHOCK_QUARTER + policy_quarter
+    penalty = np.minimum(0.9, 0.4 * mismatch)
+    base_reskill = 3 * BASE_RESKILL / (1 + mismatch)
+
+    def coefficients(t):
+        progress = _ramp((t - SHOCK_QUARTER) / adoption)
+        in_wave = (t >= SHOCK_QUARTER) & (t < SHOCK_QUARTER + adoption)
+        enacted = t >= policy_at
+        trained = reskill * _ramp((t - policy_at - reskill_lag) / reskill_lag)
+        k = beveridge_k(mismatch, trained, ai_risk * progress) + BENEFIT_K * benefit * enacted
+        theta = BASE_THETA * np.where(enacted & (min_wage > 0), MIN_WAGE_THETA, 1.0) \
+            * np.where(enacted & (benefit > 0), BENEFIT_THETA, 1.0)
+        s_ai = np.where(in_wave, displacement * ai_risk / 100 / adoption, 0.0)
+        return MATCH_EFFICIENCY * np.sqrt(20 / np.maximum(k, 1e-9)), theta, s_ai, base_reskill + 3 * POLICY_RESKILL * trained
+
+    def rates(t, y):
+        u_n, u_d, v = y
+        a, theta, s_ai, r = coefficients(t)
+        u = u_n + u_d
+        u_eff = u_n + (1 - penalty) * u_d
+        f = a * np.sqrt(np.maximum(v, 0) / np.maximum(u_eff, 1e-12))
+        return np.stack([
+            SEPARATION * (1 - u) - f * u_n + r * u_d,
+            s_ai * (1 - u) - (1 - penalty) * f * u_d - r * u_d,
+            VACANCY_ADJUST * (theta * u - v),
+        ])
+
+    # 初值：冲击前、未实施政策的稳态 u = s / (s + A·sqrt(θ))
+    a0 = MATCH_EFFICIENCY * np.sqrt(20 / beveridge_k(mismatch, 0, 0))
+    u0 = SEPARATION / (SEPARATION + a0 * np.sqrt(BASE_THETA))
+    y = np.stack([u0, np.zeros_like(u0), BASE_THETA * u0])
+    out = np.empty((quarters + 1,) + y.shape)
+    out[0] = y
+    dt = 1 / steps
+    for q in range(quarters):
+        for i in range(steps):
+            t = q + i * dt
+            k1 = rates(t, y)
+            k2 = rates(t + dt / 2, y + dt / 2 * k1)
+            k3 = rates(t + dt / 2, y + dt / 2 * k2)
+            k4 = rates(t + dt, y + dt * k3)
+            y = y + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        out[q + 1] = y
+    u_n, u_d, v = np.moveaxis(out, 0, -1) * 100
+    return {"quarter": np.arange(quarters + 1), "u": u_n + u_d, "v": v, "displaced": u_d}
+
+
+@timed()
+def sample_transitions(ai_risk, mismatch, policies=(), policy_quarter=4, reskill_lag=4, n_paths=TRANSITION_PATHS,
+                       quarters=QUARTERS, seed=0):
+    """围绕当前设定抽取 n_paths 个情景 (冲击强度、普及速度、替代规模、培训周期、错配度的不确定性) 一起积分。
+
+    除 transition_paths 的路径外，另返回 u_q / v_q：各季度按 QUANTILES 取的分位数，形状 (len(QUANTILES), quarters + 1)。
+    """
+    rng = np.random.default_rng(seed)
+    policies = set(policies)
+    paths = transition_paths(
+        ai_risk=np.clip(ai_risk * rng.lognormal(0, 0.25, n_paths), 0, 100),
+        mismatch=np.maximum(mismatch + rng.normal(0, 0.1, n_paths), 0),
+        reskill="技能重塑补贴(Reskilling)" in policies,
+        min_wage="最低工资调整" in policies,
+        benefit="失业救济金" in policies,
+        policy_quarter=policy_quarter,
+        reskill_lag=np.maximum(reskill_lag * rng.lognormal(0, 0.2, n_paths), 0.5),
+        adoption=rng.uniform(*ADOPTION, n_paths),
+        displacement=DISPLACEMENT * rng.lognormal(0, 0.3, n_paths),
+        quarters=quarters,
+    )
+    for name in ("u", "v"):
+        paths[f"{name}_q"] = np.quantile(paths[name], QUANTILES, axis=0)
+    return paths
@@ -0,0 +1,159 @@
+import atexit
+import copy
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+from .classroom import CLASSROOM
+from .metrics import timer
+
+# ==========================================
+# 学生操作日志 (进程级，写后批量落盘)
+# ==========================================
+# 页面在每次 (局部) 重跑末尾调用 track_widgets，把与上次取值不同的控件写入内存队列；
+# 后台线程每 FLUSH_INTERVAL 秒或攒够 BATCH_SIZE 条时，在一个事务里批量写入 SQLite (WAL)。
+# 重跑本身只做一次 put_nowait，队列满时丢弃并计数，绝不阻塞页面。
+EVENTS_DB = Path(os.environ.get("LMDT_EVENTS_DB", Path(__file__).resolve().parent / "data" / "events.sqlite3"))
+FLUSH_INTERVAL = float(os.environ.get("LMDT_EVENTS_INTERVAL", 1.0))
+BATCH_SIZE = 1000
+QUEUE_SIZE = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY,
+    ts      REAL NOT NULL,
+    session TEXT NOT NULL,
+    page    TEXT NOT NULL,
+    widget  TEXT NOT NULL,
+    value   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events (session, ts);
+CREATE INDEX IF NOT EXISTS idx_events_widget ON events (page, widget, ts);
+"""
+
+
+def connect(path=EVENTS_DB):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL 下 NORMAL 已保证不损坏，只可能丢失最后一批
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class EventLog:
+    def __init__(self, path=EVENTS_DB, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE, maxsize=QUEUE_SIZE):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def log(self, session, page, widget, value, ts=None):
+        """非阻塞入队；后台线程未启动时顺带启动。"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((time.time() if ts is None else ts, session, page, widget,
+                                    json.dumps(value, ensure_ascii=False, default=str)))
+        except queue.Full:
+            self.dropped += 1
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="lmdt-event-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self, block):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, conn, batch):
+        with timer("events.flush"):
+            with conn:
+                conn.executemany("INSERT INTO events (ts, session, page, widget, value) VALUES (?, ?, ?, ?, ?)", batch)
+        self.written += len(batch)
+
+    def _run(self):
+        conn = connect(self.path)
+        try:
+            while not self._stop.is_set():
+                batch = self._drain(block=True)
+                if batch:
+                    try:
+                        self._write(conn, batch)
+                    except sqlite3.Error:
+                        self.dropped += len(batch)  # 写入失败只丢弃这一批，不能拖垮页面进程
+        finally:
+            conn.close()
+
+    def flush(self):
+        """同步写出队列中剩余的事件 (退出进程或测试时使用)。"""
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = self._drain(block=False)
+                if not batch:
+                    break
+                self._write(conn, batch)
+        finally:
+            conn.close()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+EVENTS = EventLog()
+atexit.register(EVENTS.close)
+
+
+def session_id():
+    """每个浏览器会话一个随机 id，保存在 session_state 中，重跑不变。"""
+    return st.session_state.setdefault("_lmdt_session_id", uuid.uuid4().hex)
+
+
+def track_value(page, name, value):
+    """记录一个取值 (控件或计算结果)；与上次记录相同则忽略。变化同时写入日志队列与课堂实时汇总。"""
+    last = st.session_state.setdefault("_lmdt_last_values", {})
+    full_name = f"{page}.{name}"
+    if full_name in last and last[full_name] == value:
+        return
+    last[full_name] = copy.copy(value)  # multiselect 返回列表，保存副本再比较
+    sid = session_id()
+    EVENTS.log(sid, page, name, value)
+    CLASSROOM.update(sid, page, name, value)
+
+
+def track_widgets(page, keys):
+    """记录 keys 中自上次调用以来取值发生变化的控件 (首次调用记录初始值)。"""
+    ss = st.session_state
+    for key in keys:
+        if key in ss:
+            track_value(page, key, ss[key])
@@ -0,0 +1,43 @@
+import hmac
+import os
+
+import streamlit as st
+
+from .cache import cache_stats
+from .metrics import REGISTRY
+
+# ==========================================
+# 讲师专用功能 (学生界面默认隐藏)
+# ==========================================
+# 在地址后加 ?debug=<口令> 打开，口令来自环境变量 LMDT_INSTRUCTOR_KEY；
+# 未设置口令时讲师功能一律关闭 (课堂看板、清空、批量导出与调试面板都不可用)。
+INSTRUCTOR_KEY = os.environ.get("LMDT_INSTRUCTOR_KEY", "")
+
+
+def is_instructor():
+    token = st.query_params.get("debug")
+    if not INSTRUCTOR_KEY or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), INSTRUCTOR_KEY.encode("utf-8"))
+
+
+def render_debug_panel():
+    """侧边栏底部的性能面板：各阶段耗时、缓存命中率与指标导出位置。"""
+    if not is_instructor():
+        return
+    with st.sidebar.expander("🛠️ 讲师调试面板 (性能)", expanded=False):
+        snapshot = REGISTRY.snapshot()
+        if snapshot:
+            rows = [{"阶段": stage, "次数": s["count"], "均值ms": round(s["mean_ms"], 2),
+                     "p95ms": round(s["p95_ms"], 2), "最大ms": round(s["max_ms"], 2)}
+                    for stage, s in sorted(snapshot.items(), key=lambda kv: -kv[1]["total_s"])]
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.caption("暂无计时数据")
+        for name, stats in cache_stats().items():
+            st.caption(f"缓存 {name}: {stats['size']}/{stats['maxsize']} · 命中率 {stats['hit_rate']:.0%} · 淘汰 {stats['evictions']}")
+        c1, c2 = st.columns(2)
+        if c1.button("导出指标"):
+            st.caption(f"已写入 {REGISTRY.export()}")
+        if c2.button("清零计时"):
+            REGISTRY.reset()
@@ -0,0 +1,168 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# ==========================================
+# 热路径计时 (进程级，所有会话共享)
+# ==========================================
+# 页面和引擎用 timer("stage") / @timed("stage") 打点，结果:
+#   * 在讲师调试面板中展示 (lmdt.instructor.render_debug_panel)
+#   * 由后台线程每隔 EXPORT_INTERVAL 秒滚动写入 METRICS_DIR 下的 metrics.json 与 metrics.prom
+#     (打点本身只更新内存中的统计，不在页面线程上写文件；间隔为 0 时只在调试面板中手动导出)
+METRICS_DIR = Path(os.environ.get("LMDT_METRICS_DIR", Path(__file__).resolve().parent / "data" / "metrics"))
+EXPORT_INTERVAL = float(os.environ.get("LMDT_METRICS_INTERVAL", 10))
+WINDOW = 1024  # 每个阶段保留最近多少次耗时用于分位数
+
+
+class StageStats:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=WINDOW)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def copy(self):
+        other = StageStats()
+        other.count, other.total, other.max = self.count, self.total, self.max
+        other.recent.extend(self.recent)
+        return other
+
+    def snapshot(self):
+        recent = np.fromiter(self.recent, dtype=float) if self.recent else np.zeros(1)
+        p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "p99_ms": p99 * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Registry:
+    def __init__(self, export_dir=METRICS_DIR, export_interval=EXPORT_INTERVAL):
+        self.export_dir = Path(export_dir)
+        self.export_interval = export_interval
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def record(self, stage, seconds):
+        self._ensure_thread()
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds)
+
+    def _ensure_thread(self):
+        if self.export_interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="lmdt-metrics-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.export_interval):
+            try:
+                self.export()
+            except OSError:
+                pass  # 导出失败只跳过这一轮，不能拖垮页面进程
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: s.copy() for stage, s in self._stages.items()}
+        # 分位数在锁外计算：后台导出时不阻塞页面线程的打点
+        return {stage: s.snapshot() for stage, s in sorted(stages.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def to_prometheus(self, snapshot=None, cache_stats=None):
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        lines = [
+            "# HELP lmdt_stage_seconds Wall time spent in each page / engine stage.",
+            "# TYPE lmdt_stage_seconds summary",
+        ]
+        for stage, s in snapshot.items():
+            for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'lmdt_stage_seconds{{stage="{stage}",quantile="{q}"}} {s[key] / 1000:.6g}')
+            lines.append(f'lmdt_stage_seconds_sum{{stage="{stage}"}} {s["total_s"]:.6g}')
+            lines.append(f'lmdt_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        if cache_stats:
+            for metric, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge")):
+                name = f"lmdt_cache_{metric}" + ("_total" if kind == "counter" else "")
+                lines.append(f"# TYPE {name} {kind}")
+                for cache, stats in cache_stats.items():
+                    lines.append(f'{name}{{cache="{cache}"}} {stats[metric]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        from .cache import cache_stats
+
+        snapshot, caches = self.snapshot(), cache_stats()
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        payload = {"pid": os.getpid(), "time": time.time(), "stages": snapshot, "caches": caches}
+        # 先写临时文件再替换，采集端不会读到半截文件
+        for name, text in (("metrics.json", json.dumps(payload, indent=2)),
+                           ("metrics.prom", self.to_prometheus(snapshot, caches))):
+            tmp = self.export_dir / f".{name}.{os.getpid()}.tmp"
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, self.export_dir / name)
+        return self.export_dir
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.close)
+
+
+@contextmanager
+def timer(stage):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.record(stage, time.perf_counter() - t0)
+
+
+def timed(stage=None):
+    """函数装饰器，默认阶段名为 engine.<函数名>。"""
+    def decorator(func):
+        name = stage or f"engine.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.record(name, time.perf_counter() - t0)
+        return wrapper
+    return decorator
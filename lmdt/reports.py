@@ -0,0 +1,482 @@
+import json
+import multiprocessing as mp
+import os
+import re
+import secrets
+import sqlite3
+import string
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from .engine import (EXP_GRID, SCHEMES, calc_beveridge, industry_demand, minimum_wage_statics,
+                     policy_levers, sample_industry, sample_markets, simulate_pay_schemes, solve_equilibrium)
+from .engine.tables import migration_curve, mincer_curve
+from .cache import cached_result, make_key
+from .charts import sign_marker
+from .events import EVENTS, EVENTS_DB
+from .metrics import timed, timer
+
+# ==========================================
+# 实验报告 (学生页面下载与讲师批量导出共用)
+# ==========================================
+# build_report 由一组取值 (控件参数 + 计算结果) 生成 Markdown；页面传入已算好的结果，
+# 批量导出时由 evaluate_* 按操作日志中各会话最后一次的控件取值重新计算。
+# 批量导出在进程池中逐会话渲染，主进程边收结果边写入磁盘上的 ZIP，整个压缩包不进内存；
+# 压缩包含全班学生的报告，写在静态目录之外 (lmdt/data/exports)，文件名带随机后缀不可猜测；
+# 讲师页面给出一次性下载链接，由 export_routes 挂载的路由按块从磁盘发送 (不整体读入内存)，发送完即删除。
+# 附图优先导出 PNG (需 kaleido)；否则为交互 HTML，共用压缩包根目录下的一份 plotly.min.js，解压后可离线查看。
+EXPORT_DIR = Path(os.environ.get("LMDT_EXPORT_DIR", Path(__file__).resolve().parent / "data" / "exports"))
+EXPORT_WORKERS = int(os.environ.get("LMDT_EXPORT_WORKERS", os.cpu_count() or 1))
+EXPORT_KEEP = 5             # 保留最近几次导出的压缩包
+EXPORT_ROUTE = "lmdt/exports"   # 下载路由 (相对 server.baseUrlPath)
+SENDING_TTL = 3600         # 发送中断 (浏览器取消下载) 留下的文件在下次导出时按此时限清理
+PLOTLY_JS = "plotly.min.js"
+_EXPORT_NAME = re.compile(r"class_reports_\d{8}_\d{6}_[0-9a-f]{32}\.zip")
+_route_mounted = False
+REF_WAGE = 50               # 企业实验室关键指标取值的参考工资
+LABS = {"micro": "个体职业实验室", "market": "企业市场实验室", "macro": "宏观政策实验室"}
+
+# 会话未操作过的控件按页面默认值计算
+DEFAULTS = {
+    "micro": {"edu": 16, "gen_t": 5, "spec_t": 3, "disc": 15, "w_diff": 8, "c_move": 20, "c_psych": 10},
+    "market": {"capital": 50, "prod_price": 2.0, "tech_type": "中性技术", "sigma": 0.8, "n_firms": 1_000, "min_wage": 0,
+               "n_markets": 10_000, "pay_mode": SCHEMES[0], "monitoring": 0.2, "premium": 1.15, "n_workers": 100_000},
+    "macro": {"ai_risk": 30, "mismatch": 0.8, "policy": []},
+}
+
+
+def _stamp(t):
+    return datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# ==========================================
+# 1. 报告模板 (导入时预编译)
+# ==========================================
+# 模板字段按 str.format 语法书写 ({name} / {name:.1f})，导入时解析一次为 (文字, 字段, 格式) 片段；
+# 条件段落由 *_context 事先算成字符串，渲染时只剩查值、格式化与拼接。
+# 正文按参数组合缓存 (与会话无关)，每次只有带实验时间的抬头是新生成的。
+class ReportTemplate:
+    def __init__(self, text):
+        self.parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if conversion or (field is not None and not field.isidentifier()):
+                raise ValueError(f"模板字段只支持简单名称: {{{field}}}")
+            self.parts.append((literal, field, spec))
+
+    def render(self, context):
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(context[field], spec))
+        return "".join(out)
+
+
+HEADER = ReportTemplate("""
+# {title}
+**实验时间**: {time}
+**学生姓名**: ___________
+""")
+
+TITLES = {"micro": "个体职业发展仿真实验报告", "market": "企业决策仿真实验报告", "macro": "宏观政策仿真实验报告"}
+
+TEMPLATES = {"micro": ReportTemplate("""
+## 一、 实验参数设定
+- **受教育年限**: {edu} 年
+- **培训投入**: 一般培训 ({gen_t}) / 特殊培训 ({spec_t})
+- **流动决策**: 城乡工资差 {w_diff}k, 搬迁成本 {c_move}k, 心理成本 {c_psych}k
+
+## 二、 实验结果分析
+### 1. 人力资本回报
+根据明瑟收入方程模拟，在当前教育投入下，预计职业中期的教育溢价率为 **{premium:.1f}%**。
+{disc_text}
+
+### 2. 劳动力流动决策
+基于净现值(NPV)模型计算，{migration_text}
+
+## 三、 实验结论
+通过本次数字孪生仿真，验证了教育投资的边际递减规律以及心理成本对劳动力流动的阻碍作用。
+"""), "market": ReportTemplate("""
+## 一、 生产要素配置
+- **资本存量**: {capital} 单位
+- **产品价格**: {prod_price} 指数
+- **技术类型**: {tech_type}
+- **要素替代弹性 σ**: {sigma}（行业内 {n_firms} 家异质性企业）
+
+## 二、 实验结果分析
+### 1. 派生需求分析
+实验显示，{demand_text}
+
+在工资率 {ref_wage:.0f} 处，行业劳动需求的长期自身工资弹性为 **{el_total:.2f}**，其中替代效应 {el_sub:.2f}、规模效应 {el_scale:.2f}，劳动收入份额 {s_labor:.0%}。
+
+### 2. 市场均衡与最低工资
+在 {n_markets} 个异质性市场中，出清工资中位数为 **{median_wage:.1f}**。{min_wage_text}
+
+### 3. 薪酬制度设计
+当前选择的薪酬模式为 **{pay_mode}**（监督抽查概率 {monitoring}，效率工资溢价 {premium}）。仿真第 36 个月该制度的偷懒比例为 {shirk_rate:.1%}，月度离职率 {quit_rate:.1%}，单位人工成本产出 {output_per_cost:.3f}；当前参数下单位成本产出最高的是 **{best}**。
+{pay_text}
+
+## 三、 实验结论
+本次仿真验证了希克斯-马歇尔派生需求定理，证明了技术进步的方向是影响劳动力需求弹性的关键变量。
+"""), "macro": ReportTemplate("""
+## 一、 宏观风险监测
+- **AI 替代冲击**: {ai_risk}%
+- **技能错配指数**: {mismatch}
+
+## 二、 实验结果分析
+### 1. 结构性失业诊断
+本次实验模拟了 **{ai_risk}%** 的 AI 技术替代冲击。
+{shock_text}
+
+### 2. 政策干预效果
+本次实验采用了以下政策组合：{policy_text}。
+{reskilling_text}
+
+## 三、 实验结论
+本次仿真表明，面对技术冲击引发的结构性失业，单纯的需求侧刺激（如提高工资）效果有限，必须配合供给侧的技能重塑政策。
+""")}
+
+
+def micro_context(v):
+    return dict(
+        v,
+        disc_text=f"同时，由于市场存在 **{v['disc']}%** 的歧视系数，导致了显著的非生产率工资差异。" if v['disc'] > 0 else '市场环境公平，无显著歧视损失。',
+        migration_text=f"迁移是理性的选择，预计在第 **{v['breakeven']}** 年实现盈亏平衡。" if v['breakeven'] > 0 else '迁移是非理性的，因为高昂的心理成本或搬迁成本导致长期净收益为负。',
+    )
+
+
+def market_context(v):
+    tech_type = v['tech_type']
+    if tech_type == '劳动互补型':
+        demand_text = f'由于采用了{tech_type}，企业的劳动需求曲线显著外移，表明该技术与劳动呈互补关系。'
+    elif tech_type == '劳动替代型':
+        demand_text = f'由于采用了{tech_type}，机器对劳动产生了明显的替代效应，需求收缩。'
+    else:
+        demand_text = '技术进步呈现中性特征，未对劳动需求产生偏向性影响。'
+    return dict(
+        v,
+        demand_text=demand_text,
+        min_wage_text=f"最低工资 {v['min_wage']} 对 {v['binding_share']:.0%} 的市场形成约束，总就业变化 {v['employment_change']:+.1%}，新增失业率 {v['unemployment_rate']:.1%}。" if v['min_wage'] > 0 else '本次实验未设置最低工资。',
+        pay_text='效率工资有助于解决信息不对称下的激励问题，但增加了企业的显性薪酬成本。' if v['pay_mode'] == '效率工资' else '计时/计件工资更依赖于企业的监督成本或产出可观测性。',
+    )
+
+
+def macro_context(v):
+    return dict(
+        v,
+        shock_text='在极端的 AI 冲击下，贝弗里奇曲线剧烈向右上方移动，表明旧技能劳动者被大规模淘汰，而新岗位招不到人，市场匹配效率严重下降。' if v['ai_risk'] > 70 else 'AI 冲击尚在可控范围内，市场通过自然调节维持了相对平衡。',
+        policy_text=', '.join(v['policy']) if v['policy'] else '无',
+        reskilling_text='技能重塑补贴有效促进了劳动力的技能升级，使贝弗里奇曲线向原点回归，缓解了 AI 带来的结构性冲击。' if '技能重塑补贴(Reskilling)' in v['policy'] else '缺乏针对性的培训政策，导致结构性错配难以在短期内自动修复。',
+    )
+
+
+CONTEXT = {"micro": micro_context, "market": market_context, "macro": macro_context}
+
+
+def report_body(page, values):
+    """报告正文，按参数组合缓存。"""
+    return cached_result(f"{page}.report", lambda: TEMPLATES[page].render(CONTEXT[page](values)), **values)
+
+
+def build_report(page, values, now=None):
+    """完整的 Markdown 报告；页面只在展开预览或点击下载时调用。"""
+    with timer(f"{page}.report.build"):
+        stamp = _stamp(time.time() if now is None else now)
+        return HEADER.render({"title": TITLES[page], "time": stamp}) + report_body(page, values)
+
+
+class SessionView:
+    """会话状态的只读视图 (属性 / 下标 / get)，在脚本线程之外也能读取。
+
+    下载按钮的可调用对象在点击时由服务器线程执行，那里没有 st.session_state；
+    视图直接持有本会话的状态对象，读到的总是点击时刻的控件取值。
+    """
+
+    def __init__(self, state=None):
+        ctx = get_script_run_ctx()
+        self._state = state if state is not None else ctx.session_state if ctx is not None else st.session_state
+
+    def __getitem__(self, key):
+        return self._state[key]
+
+    def __getattr__(self, key):
+        try:
+            return self._state[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def get(self, key, default=None):
+        return self._state[key] if key in self._state else default
+
+
+def _preview_key(page):
+    return f"{page}_report_preview"
+
+
+def report_widgets(page, values, file_name):
+    """预览与下载。只有预览展开时才生成并发送正文；下载按钮传入可调用对象，点击时才生成。
+
+    values 为 dict，或 values(state) -> dict：报告用到的控件分布在其他片段中时传入后者，
+    预览与下载都按当时会话中的最新取值计算 (配合 sync_report_preview 刷新预览)。
+    """
+    compute = values if callable(values) else (lambda state: values)
+    state = SessionView()
+    preview = st.expander("📄 报告预览 (Markdown)", key=_preview_key(page), on_change="rerun")
+    if preview.open:
+        current = compute(state)
+        st.session_state[f"_{page}_report_shown"] = make_key(page, **current)
+        preview.text_area("报告预览 (Markdown)", build_report(page, current), height=200, label_visibility="collapsed")
+    st.download_button(
+        label="📥 下载实验报告 (.md)",
+        data=lambda: build_report(page, compute(state)),
+        file_name=file_name,
+        mime="text/markdown",
+        type="primary"
+    )
+
+
+def sync_report_preview(page, values):
+    """在其他片段末尾调用：预览展开且报告取值已变化时整页重跑一次，使预览与当前参数一致。
+
+    只在片段单独重跑时检查；整页重跑时报告卡片本身也会重跑，不需要再触发。
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None or not ctx.fragment_ids_this_run:
+        return
+    ss = st.session_state
+    shown = ss.get(f"_{page}_report_shown")
+    if ss.get(_preview_key(page)) and shown is not None and shown != make_key(page, **values(SessionView())):
+        ss[f"_{page}_report_shown"] = None
+        st.rerun(scope="app")
+
+
+# ==========================================
+# 2. 由控件参数重新计算 (批量导出)
+# ==========================================
+def demand_summary(capital, prod_price, tech_type, sigma, n_firms):
+    """异质性企业 (CES 生产函数) 的行业需求；只返回汇总结果，不保留 N×M 的企业矩阵。"""
+    firms = sample_industry(n_firms, capital, prod_price, tech_type, sigma)
+    w, labor, total, terms = industry_demand(firms)
+    hired = labor > 0
+    weight = labor / np.maximum(labor.sum(axis=0), 1e-12)  # 按雇佣人数加权的行业平均
+    avg = {k: (np.where(hired, v, 0) * weight).sum(axis=0) for k, v in terms.items() if k != "short_run"}
+    firm_q = np.percentile(labor, [10, 50, 90], axis=0)
+    return w, total, firm_q, avg["substitution"], avg["scale"], avg["total"], avg["labor_share"]
+
+
+def evaluate_micro(p):
+    w_base = mincer_curve(12, 0, 0, 0)[0]
+    w_exp, w_disc = mincer_curve(p["edu"], p["gen_t"], p["spec_t"], p["disc"])
+    years, npv, breakeven = migration_curve(p["w_diff"], p["c_move"], p["c_psych"])
+    values = dict(p, premium=((w_exp[20] / w_base[20]) - 1) * 100, breakeven=breakeven)
+    fig_wage = go.Figure()
+    fig_wage.add_trace(go.Scatter(x=EXP_GRID, y=w_base, name='对照组 (高中)', line=dict(color='#cbd5e1', dash='dash')))
+    fig_wage.add_trace(go.Scatter(x=EXP_GRID, y=w_exp, name=f"实验组 ({p['edu']}年)", line=dict(color='#3b82f6', width=4)))
+    if p["disc"] > 0:
+        fig_wage.add_trace(go.Scatter(x=EXP_GRID, y=w_disc, name='歧视后工资', line=dict(color='#ef4444')))
+    fig_wage.update_layout(xaxis_title="工龄 (Year)", yaxis_title="工资指数")
+    fig_npv = go.Figure(go.Bar(x=years, y=npv, marker=sign_marker(npv)))
+    fig_npv.update_layout(xaxis_title="年份", yaxis_title="累计净收益 (k)")
+    return values, {"工资画像": fig_wage, "迁移净现值": fig_npv}
+
+
+def evaluate_market(p):
+    w, d, _, el_sub, el_scale, el_total, s_labor = demand_summary(p["capital"], p["prod_price"], p["tech_type"], p["sigma"], p["n_firms"])
+    ref = int(np.argmin(np.abs(w - REF_WAGE)))
+    markets = sample_markets(p["n_markets"], p["capital"], p["prod_price"], p["tech_type"], p["sigma"])
+    w_eq, l_eq = solve_equilibrium(markets)
+    mw = minimum_wage_statics(markets, p["min_wage"], (w_eq, l_eq))
+    traj = simulate_pay_schemes(p["n_workers"], monitoring=p["monitoring"], premium=p["premium"])
+    sel = SCHEMES.index(p["pay_mode"])
+    values = dict(
+        p, ref_wage=w[ref], el_total=el_total[ref], el_sub=el_sub[ref], el_scale=el_scale[ref], s_labor=s_labor[ref],
+        median_wage=np.median(w_eq), binding_share=mw["binding"].mean(),
+        employment_change=mw["floor_employment"].sum() / mw["employment"].sum() - 1,
+        unemployment_rate=mw["unemployment"].sum() / markets["workers"].sum(),
+        shirk_rate=traj["shirk_rate"][sel, -1], quit_rate=traj["quit_rate"][sel, -1],
+        output_per_cost=traj["output_per_cost"][sel, -1], best=SCHEMES[int(np.argmax(traj["output_per_cost"][:, -1]))],
+    )
+    fig_demand = go.Figure(go.Scatter(x=d, y=w, name="行业劳动需求 D", line=dict(color='#10b981', width=4)))
+    fig_demand.update_layout(xaxis_title="雇佣人数 (L，对数轴)", yaxis_title="工资率 (W)", xaxis_type="log")
+    months = np.arange(1, traj["output_per_cost"].shape[1] + 1)
+    fig_pay = go.Figure([go.Scatter(x=months, y=traj["output_per_cost"][i], name=name, line=dict(width=5 if i == sel else 2))
+                         for i, name in enumerate(SCHEMES)])
+    fig_pay.update_layout(xaxis_title="月份", yaxis_title="产出 / 人工成本")
+    return values, {"派生需求": fig_demand, "薪酬制度": fig_pay}
+
+
+def evaluate_macro(p):
+    policy_score, _, k_shift = policy_levers(p["policy"])
+    u, v = calc_beveridge(p["mismatch"], policy_score, p["ai_risk"])
+    v = v + k_shift / u
+    u_base, v_base = calc_beveridge(0, 0, 0)
+    fig = go.Figure([go.Scatter(x=u_base, y=v_base, name="理想高效市场", line=dict(color='#cbd5e1', dash='dot')),
+                     go.Scatter(x=u, y=v, name="当前市场状态", line=dict(color='#8b5cf6', width=5))])
+    fig.update_layout(xaxis_title="失业率 U (%)", yaxis_title="职位空缺率 V (%)", yaxis=dict(range=[0, 30]))
+    return p, {"贝弗里奇曲线": fig}
+
+
+EVALUATE = {"micro": evaluate_micro, "market": evaluate_market, "macro": evaluate_macro}
+
+
+# ==========================================
+# 3. 批量导出
+# ==========================================
+def session_params(db=EVENTS_DB):
+    """操作日志中每个会话在各页面最后一次的控件取值 {session: {page: (参数 dict, 最后操作时间)}}。"""
+    EVENTS.flush()
+    conn = sqlite3.connect(db)
+    try:
+        rows = conn.execute(
+            "SELECT session, page, widget, value, ts FROM events "
+            "WHERE id IN (SELECT MAX(id) FROM events GROUP BY session, page, widget)"
+        ).fetchall()
+    finally:
+        conn.close()
+    sessions = {}
+    for session, page, widget, value, ts in rows:
+        if page not in DEFAULTS:
+            continue
+        params, last = sessions.setdefault(session, {}).get(page, (dict(DEFAULTS[page]), 0.0))
+        if widget in params:
+            params[widget] = json.loads(value)
+        sessions[session][page] = (params, max(last, ts))
+    return sessions
+
+
+def _figure_file(fig, image):
+    fig.update_layout(template="plotly_white", width=900, height=450, margin=dict(l=20, r=20, t=20, b=20))
+    if image:
+        return "png", fig.to_image(format="png")
+    # 每个会话一个子目录，脚本引用压缩包根目录下共用的 plotly.min.js
+    return "html", fig.to_html(include_plotlyjs=f"../{PLOTLY_JS}").encode("utf-8")
+
+
+def _static_images():
+    # 导出 PNG 需要 kaleido (可选依赖)；未安装时附图改为交互 HTML
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_session(job):
+    """渲染一个会话在一个实验室的报告，返回 [(压缩包内路径, 内容 bytes)]。在 worker 进程中运行。"""
+    session, page, params, ts, image = job
+    values, figures = EVALUATE[page](params)
+    folder = session
+    files, links = [], []
+    for name, fig in figures.items():
+        ext, data = _figure_file(fig, image)
+        arcname = f"{folder}/{page}_{name}.{ext}"
+        files.append((arcname, data))
+        links.append(f"![{name}]({page}_{name}.{ext})" if ext == "png" else f"- [{name} (交互图)]({page}_{name}.{ext})")
+    text = build_report(page, values, ts) + "\n## 附图\n" + "\n".join(links) + "\n"
+    files.insert(0, (f"{folder}/{LABS[page]}.md", text.encode("utf-8")))
+    return files
+
+
+def _prune(out_dir, keep):
+    for old in sorted(out_dir.glob("class_reports_*.zip"))[:-keep]:
+        old.unlink(missing_ok=True)
+    for stale in out_dir.glob("class_reports_*.zip.sending"):
+        if time.time() - stale.stat().st_mtime > SENDING_TTL:
+            stale.unlink(missing_ok=True)
+
+
+@timed()
+def export_class_reports(sessions=None, out_dir=EXPORT_DIR, workers=EXPORT_WORKERS, image=None):
+    """把所有会话 × 实验室的报告写入一个 ZIP，返回 (路径, 报告数)。
+
+    各报告在 workers 个 spawn 进程中并行渲染，主进程边收结果边写入压缩包，内存只与单份报告有关。
+    """
+    sessions = session_params() if sessions is None else sessions
+    image = _static_images() if image is None else image
+    jobs = [(session, page, params, ts, image)
+            for session, pages in sorted(sessions.items()) for page, (params, ts) in sorted(pages.items())]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"class_reports_{time.strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(16)}.zip"
+    tmp = path.with_suffix(".zip.tmp")
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            if not image:
+                from plotly.offline import get_plotlyjs
+
+                zf.writestr(PLOTLY_JS, get_plotlyjs())
+            if workers > 1 and len(jobs) > 1:
+                # spawn 而非 fork：Streamlit 服务进程是多线程的
+                with ProcessPoolExecutor(min(workers, len(jobs)), mp_context=mp.get_context("spawn")) as pool:
+                    for files in pool.map(render_session, jobs, chunksize=max(1, len(jobs) // (4 * workers))):
+                        for arcname, data in files:
+                            zf.writestr(arcname, data)
+            else:
+                for job in jobs:
+                    for arcname, data in render_session(job):
+                        zf.writestr(arcname, data)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    _prune(out_dir, EXPORT_KEEP)
+    return path, len(jobs)
+
+
+def export_file_name(name):
+    """下载时的文件名 (去掉随机后缀)。"""
+    return name.rsplit("_", 1)[0] + ".zip"
+
+
+def export_url(name):
+    """一次性下载链接。相对地址，按当前页面所在的 server.baseUrlPath 解析。"""
+    return f"{EXPORT_ROUTE}/{name}"
+
+
+def export_route_mounted():
+    return _route_mounted
+
+
+def export_routes(out_dir=EXPORT_DIR):
+    """供 st.App 挂载的下载路由 (见 streamlit_app.py)。
+
+    文件名即令牌：只接受导出目录中的压缩包，先原子地改名再发送，同一链接只有第一个请求能拿到；
+    FileResponse 按块读取磁盘，发送完毕后在后台任务中删除。
+    """
+    from starlette.background import BackgroundTask
+    from starlette.responses import FileResponse, PlainTextResponse
+    from starlette.routing import Route
+    from streamlit import config
+
+    global _route_mounted
+    out_dir = Path(out_dir)
+
+    async def download(request):
+        name = request.path_params["name"]
+        if not _EXPORT_NAME.fullmatch(name):
+            return PlainTextResponse("Not Found", status_code=404)
+        sending = out_dir / f"{name}.sending"
+        try:
+            os.replace(out_dir / name, sending)
+        except FileNotFoundError:
+            return PlainTextResponse("Not Found", status_code=404)
+        return FileResponse(sending, media_type="application/zip", filename=export_file_name(name),
+                            background=BackgroundTask(sending.unlink, missing_ok=True))
+
+    base = config.get_option("server.baseUrlPath").strip("/")
+    path = "/" + "/".join(p for p in (base, EXPORT_ROUTE) if p) + "/{name}"
+    _route_mounted = True
+    return [Route(path, download)]
+
+
+if __name__ == "__main__":
+    path, n = export_class_reports()
+    print(f"已导出 {n} 份报告: {path}")
@@ -0,0 +1,192 @@
+import os
+
+import plotly.colors
+import plotly.graph_objects as go
+import streamlit as st
+
+from .cache import cached_batch, cached_figure, make_key
+from .engine import EXP_GRID, U_GRID, WAGE_GRID, macro_scenarios, market_scenarios, micro_scenarios
+from .engine.migration import HORIZON_YEARS
+from .metrics import timer
+
+# ==========================================
+# 多情景对比工作台 (三个实验室共用)
+# ==========================================
+# 学生把当前参数 "固定" 为一个情景，每个实验室最多 MAX_SCENARIOS 个，保存在 session_state 中，
+# 重跑和切换页面后仍然保留。全部情景经 cached_batch 批量计算：算过的情景直接命中进程级缓存，
+# 只有新固定的情景才进入引擎 (一次向量化调用)，所以固定第 20 个情景与固定第 1 个的代价相同。
+MAX_SCENARIOS = int(os.environ.get("LMDT_MAX_SCENARIOS", 20))
+COLORS = plotly.colors.qualitative.Dark24
+_STATE_KEY = "_lmdt_scenarios"
+
+# 情景由哪些控件 (session_state 键) 决定
+PARAMS = {
+    "micro": ("edu", "gen_t", "spec_t", "disc", "w_diff", "c_move", "c_psych"),
+    "market": ("capital", "prod_price", "tech_type", "sigma", "min_wage"),
+    "macro": ("ai_risk", "mismatch", "policy"),
+}
+EVALUATE = {"micro": micro_scenarios, "market": market_scenarios, "macro": macro_scenarios}
+_LAYOUT = dict(template="plotly_white", height=380, margin=dict(l=20, r=20, t=20, b=20), legend=dict(orientation="h", y=-0.2))
+
+
+def _policy_label(policy):
+    return " + ".join(policy) or "无干预"
+
+
+# --- 表格的一行 (参数 + 指标) ---
+def micro_row(p, r):
+    breakeven = int(r["breakeven"])
+    return {"受教育年限": p["edu"], "一般培训": p["gen_t"], "特殊培训": p["spec_t"], "歧视 (%)": p["disc"],
+            "月薪差 (k)": p["w_diff"], "搬迁成本 (k)": p["c_move"], "心理成本 (k/年)": p["c_psych"],
+            "起薪 (扣除歧视)": round(float(r["start_wage"]), 1), "教育溢价 (%)": round(float(r["premium"]), 1),
+            f"{HORIZON_YEARS}年累计净现值 (k)": round(float(r["npv"]), 1),
+            "回本": f"第 {breakeven} 年" if breakeven else f"{HORIZON_YEARS} 年内不回本"}
+
+
+def market_row(p, r):
+    return {"资本 K": p["capital"], "价格 P": p["prod_price"], "技术": p["tech_type"], "σ": p["sigma"],
+            "最低工资": p["min_wage"], "出清工资 W*": round(float(r["wage"]), 1), "就业 L*": round(float(r["employment"]), 1),
+            "最低工资下就业变化 (%)": round(float(r["employment_change"]) * 100, 1), "失业人数": round(float(r["unemployment"]), 1)}
+
+
+def macro_row(p, r):
+    return {"AI 冲击 (%)": p["ai_risk"], "错配度": p["mismatch"], "政策": _policy_label(p["policy"]),
+            "均衡失业率 u* (%)": round(float(r["u_star"]), 2), "职位空缺率 v* (%)": round(float(r["v_star"]), 2)}
+
+
+ROWS = {"micro": micro_row, "market": market_row, "macro": macro_row}
+
+
+# --- 叠加图 ---
+def micro_wage_figure(names, results):
+    fig = go.Figure()
+    for i, (name, r) in enumerate(zip(names, results)):
+        fig.add_trace(go.Scatter(x=EXP_GRID, y=r["wage_disc"], name=name, line=dict(color=COLORS[i % len(COLORS)])))
+    fig.update_layout(xaxis_title="工龄 (Year)", yaxis_title="工资指数 (扣除歧视)", **_LAYOUT)
+    return fig
+
+
+def micro_npv_figure(names, results):
+    fig = go.Figure()
+    years = list(range(1, HORIZON_YEARS + 1))
+    for i, (name, r) in enumerate(zip(names, results)):
+        fig.add_trace(go.Scatter(x=years, y=r["cum_npv"], name=name, line=dict(color=COLORS[i % len(COLORS)])))
+    fig.add_hline(y=0, line_dash="dot", line_color="#94a3b8")
+    fig.update_layout(xaxis_title="年份", yaxis_title="迁移累计净现值 (k)", **_LAYOUT)
+    return fig
+
+
+def market_figure(names, results):
+    fig = go.Figure()
+    for i, (name, r) in enumerate(zip(names, results)):
+        color = COLORS[i % len(COLORS)]
+        fig.add_trace(go.Scatter(x=r["demand"], y=WAGE_GRID, name=name, legendgroup=name, line=dict(color=color)))
+        fig.add_trace(go.Scatter(x=r["supply"], y=WAGE_GRID, legendgroup=name, showlegend=False, hoverinfo="skip",
+                                 line=dict(color=color, dash="dot", width=1)))
+        fig.add_trace(go.Scatter(x=[r["floor_employment"]], y=[r["floor_wage"]], mode="markers", legendgroup=name,
+                                 showlegend=False, marker=dict(color=color, size=10),
+                                 hovertemplate=f"{name}<br>就业 %{{x:.1f}}<br>工资 %{{y:.1f}}<extra></extra>"))
+    fig.update_layout(xaxis_title="就业人数 (L，对数轴；虚线为劳动供给)", yaxis_title="工资率 (W)", xaxis_type="log", **_LAYOUT)
+    return fig
+
+
+def macro_figure(names, results):
+    fig = go.Figure()
+    for i, (name, r) in enumerate(zip(names, results)):
+        color = COLORS[i % len(COLORS)]
+        fig.add_trace(go.Scatter(x=U_GRID, y=r["vacancy"], name=name, legendgroup=name, line=dict(color=color)))
+        fig.add_trace(go.Scatter(x=[r["u_star"]], y=[r["v_star"]], mode="markers", legendgroup=name, showlegend=False,
+                                 marker=dict(color=color, size=10),
+                                 hovertemplate=f"{name}<br>u* = %{{x:.2f}}%<br>v* = %{{y:.2f}}%<extra></extra>"))
+    fig.update_layout(xaxis_title="失业率 U (%)", yaxis_title="职位空缺率 V (%)", yaxis=dict(range=[0, 30]), **_LAYOUT)
+    return fig
+
+
+# 每个实验室并排显示的图
+FIGURES = {"micro": (micro_wage_figure, micro_npv_figure), "market": (market_figure,), "macro": (macro_figure,)}
+
+
+# --- 会话内的情景列表 ---
+def pinned(page):
+    """[(名称, 参数 dict), ...]，按固定顺序排列。"""
+    return st.session_state.setdefault(_STATE_KEY, {}).setdefault(page, [])
+
+
+def current_params(page):
+    ss = st.session_state
+    return {k: list(ss[k]) if isinstance(ss[k], list) else ss[k] for k in PARAMS[page]}
+
+
+def _is_pinned(page, params):
+    key = make_key(page, **params)
+    return any(make_key(page, **p) == key for _, p in pinned(page))
+
+
+def pin(page, params):
+    """固定一个情景；已存在或已达上限时忽略。情景编号只增不减，删除后其余情景的名称不变。"""
+    items = pinned(page)
+    if len(items) >= MAX_SCENARIOS or _is_pinned(page, params):
+        return
+    seq = st.session_state.setdefault(f"{_STATE_KEY}_seq", {})
+    seq[page] = seq.get(page, 0) + 1
+    items.append((f"情景 {seq[page]}", params))
+
+
+def unpin(page, names):
+    items = pinned(page)
+    items[:] = [(name, p) for name, p in items if name not in set(names)]
+
+
+def _pin_current(page):
+    # 回调在点击时执行：参数控件在其他片段中，按钮渲染时记下的取值可能已经过期，这里读取最新的 session_state
+    params = current_params(page)
+    if _is_pinned(page, params):
+        st.toast("当前参数已在情景列表中")
+    pin(page, params)
+
+
+def _clear(page):
+    unpin(page, [name for name, _ in pinned(page)])
+
+
+def evaluate(page, items):
+    """全部情景的结果，与 items 一一对应；未命中缓存的情景一次批量计算。"""
+    return cached_batch(f"{page}.scenario", EVALUATE[page], [p for _, p in items])
+
+
+def _remove_selected(page):
+    key = f"{page}_scenario_remove"
+    unpin(page, st.session_state.get(key, []))
+    st.session_state[key] = []
+
+
+@st.fragment
+def scenario_workspace(page):
+    """多情景对比：固定当前参数、叠加曲线与指标表。自身是片段，增删情景只重跑这一块。"""
+    items = pinned(page)
+    full = len(items) >= MAX_SCENARIOS
+    c1, c2, c3 = st.columns([2, 1, 1])
+    c1.caption(f"已固定 {len(items)}/{MAX_SCENARIOS} 个情景；全部情景一次批量计算，刷新或切换页面后仍然保留。")
+    c2.button("📌 固定当前参数", key=f"{page}_scenario_pin", on_click=_pin_current, args=(page,),
+              disabled=full, width="stretch", help="已达上限" if full else None)
+    c3.button("🗑️ 清空全部", key=f"{page}_scenario_clear", on_click=_clear, args=(page,),
+              disabled=not items, width="stretch")
+    if not items:
+        st.info("调整参数后点击「固定当前参数」，即可把多组参数放在同一张图里对比。")
+        return
+
+    names = [name for name, _ in items]
+    with timer(f"{page}.scenarios"):
+        results = evaluate(page, items)
+    st.dataframe([{"情景": name, **ROWS[page](p, r)} for (name, p), r in zip(items, results)], hide_index=True)
+
+    scenarios = tuple((name, tuple(p.values())) for name, p in items)
+    builders = FIGURES[page]
+    for col, build in zip(st.columns(len(builders)), builders):
+        with timer(f"{page}.scenario_fig.build"):
+            fig = cached_figure(f"{page}.{build.__name__}", lambda: build(names, results), scenarios=scenarios)
+        col.plotly_chart(fig, use_container_width=True)
+
+    r1, r2 = st.columns([3, 1])
+    r1.multiselect("移除情景", names, key=f"{page}_scenario_remove", label_visibility="collapsed", placeholder="选择要移除的情景")
+    r2.button("移除所选", key=f"{page}_scenario_unpin", on_click=_remove_selected, args=(page,), width="stretch")
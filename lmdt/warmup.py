@@ -0,0 +1,125 @@
+import compileall
+import importlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from .metrics import REGISTRY, timer
+
+# ==========================================
+# 进程预热 (每个服务器进程一次)
+# ==========================================
+# 重新部署后，第一位打开实验室的学生要替整个进程付清一次性开销：导入引擎、映射查找表、
+# 加载 Plotly 模板与各类图形的属性校验器 (首张图约 50~150 ms)。
+# 页头导入本身不值得推迟：import streamlit 时 plotly_chart 模块为配置主题已载入 plotly.graph_objects，
+# 页头再导入不花时间；numpy 不在其中 (冷导入约 60 ms)，但 lmdt.cache / lmdt.events / 引擎都依赖它，
+# 实验室页面在第一个组件之前就要导入这些模块，推迟页头的 import numpy 并不能少付这 60 ms。
+# 真正能省的是整个进程只付一次：预热线程导入引擎时 numpy 一并载入 (python -m lmdt.bench.startup 可复测)。
+# 门户和实验室在脚本末尾调用 prewarm()：进程内第一次调用启动后台线程把这些工作做完，
+# 之后的调用立即返回。门户首屏很轻，学生浏览门户的同时预热已在后台完成。
+#   部署时:  python -m lmdt.warmup    编译 lmdt 的 .pyc、缺失时构建查找表，再同步预热一遍 (顺带生成样式表) 并打印耗时
+#   关闭:    LMDT_PREWARM=0 (只关闭页面触发的后台预热)
+PREWARM = os.environ.get("LMDT_PREWARM", "1") != "0"
+ROOT = Path(__file__).resolve().parent.parent
+ENGINE_MODULES = ("mincer", "migration", "demand", "production", "beveridge", "cohort", "estimation",
+                  "equilibrium", "shirking", "microdata", "matching", "policy", "scenarios", "schooling", "transition", "tables")
+
+_thread = None
+_done = threading.Event()
+_lock = threading.Lock()
+
+
+def _warm_engine():
+    for name in ENGINE_MODULES:
+        importlib.import_module(f"lmdt.engine.{name}")
+    from .engine.microdata import get_store
+    from .engine.tables import get_tables
+
+    get_tables()
+    get_store()
+    importlib.import_module("lmdt.reports")  # 报告模板在导入时解析
+
+
+def _warm_plotly():
+    # 实验室用到的图形类型与布局属性各构建一次，校验器和模板随之加载并常驻进程
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=1, cols=2, specs=[[{"secondary_y": True}, {}]])
+    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode="lines+markers", fill="tozeroy", line=dict(dash="dash")), 1, 1)
+    fig.add_trace(go.Scatter(x=[0, 1], y=[1, 0]), 1, 1, secondary_y=True)
+    fig.add_trace(go.Bar(x=[0, 1], y=[1, 2]), 1, 2)
+    fig.add_trace(go.Heatmap(z=[[0, 1], [1, 0]], colorscale="Viridis"), 1, 2)
+    fig.add_trace(go.Contour(z=[[0, 1], [1, 0]]), 1, 2)
+    fig.add_hline(y=0.5, line_dash="dot", annotation_text="warmup")
+    fig.add_vline(x=0.5, line_dash="dot")
+    fig.update_layout(template="plotly_white", height=300, margin=dict(l=20, r=20, t=20, b=20),
+                      xaxis_title="x", yaxis_title="y", legend=dict(orientation="h"), hovermode="x unified")
+    fig.to_json()
+
+
+def _warm_assets():
+    from .assets import bundle
+
+    for name in ("portal", "lab"):
+        bundle(name)
+
+
+STEPS = (("engine", _warm_engine), ("plotly", _warm_plotly), ("assets", _warm_assets))
+
+
+def _run():
+    try:
+        for name, step in STEPS:
+            with timer(f"warmup.{name}"):
+                try:
+                    step()
+                except Exception:
+                    pass  # 预热只是优化，失败时由页面在首次使用时自行加载
+    finally:
+        _done.set()
+
+
+def prewarm(background=True):
+    """进程内只执行一次；background=False 时同步执行并等待完成 (不受 LMDT_PREWARM 影响)。"""
+    global _thread
+    if not PREWARM and background:
+        return
+    if _thread is None:
+        with _lock:
+            if _thread is None:
+                _thread = threading.Thread(target=_run, name="lmdt-prewarm", daemon=True)
+                _thread.start()
+    if not background:
+        _done.wait()
+
+
+def is_warm():
+    return _done.is_set()
+
+
+def prepare_deploy(root=ROOT):
+    """部署时执行一次的磁盘准备：编译 lmdt 的字节码，查找表缺失或过期时重新构建。
+
+    页面脚本由 Streamlit 自行编译并缓存，不需要 .pyc。
+    """
+    compileall.compile_dir(root / "lmdt", quiet=1)
+    from .engine.tables import TABLE_DIR, LookupTables, build_tables
+
+    try:
+        LookupTables(TABLE_DIR)
+    except (FileNotFoundError, ValueError):
+        build_tables(TABLE_DIR)
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    prepare_deploy()
+    t1 = time.perf_counter()
+    prewarm(background=False)
+    t2 = time.perf_counter()
+    print(f"部署准备 {(t1 - t0) * 1000:.0f} ms · 进程预热 {(t2 - t1) * 1000:.0f} ms")
+    for stage, s in REGISTRY.snapshot().items():
+        if stage.startswith("warmup."):
+            print(f"  {stage:<16}{s['total_s'] * 1000:>8.0f} ms")
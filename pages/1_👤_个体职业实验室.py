@@ -1,205 +1,399 @@
+import os
+
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 
+from lmdt.assets import inject_styles
+from lmdt.cache import cached_figure, cached_result
+from lmdt.charts import sign_marker
+from lmdt.engine import EXP_GRID, mincer_batch
+from lmdt.engine.migration import RATE_GRID, migration_surface
+from lmdt.engine.cohort import QUANTILES, simulate_cohort
+from lmdt.engine.estimation import DATA_DIR, REGRESSORS, SURVEY_PATH, data_file, estimate_mincer
+from lmdt.engine.schooling import DISCOUNT_GRID, EDU_AXIS, RETURN_DECAY, TRAINING_AXIS, optimal_schooling
+from lmdt.engine.microdata import get_store
+from lmdt.engine.tables import MIGRATION_AXES, migration_curve, mincer_curve
+from lmdt.events import track_value, track_widgets
+from lmdt.instructor import render_debug_panel
+from lmdt.metrics import timer
+from lmdt.reports import report_widgets, sync_report_preview
+from lmdt.scenarios import scenario_workspace
+from lmdt.warmup import prewarm
+
 # ==========================================
 # 1. 页面配置 & 视觉风格
 # ==========================================
 st.set_page_config(page_title="个体职业实验室", page_icon="👤", layout="wide")
 
-st.markdown("""
-<style>
-    /* 全局字体与布局 */
-    html, body, [class*="css"] { font-family: 'Microsoft YaHei', sans-serif !important; background-color: #f1f5f9; }
-    .block-container { padding-top: 3.5rem !important; padding-bottom: 5rem !important; max-width: 98% !important; }
-    
-    /* 隐藏默认头部 */
-    header {visibility: hidden;}
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    /* 卡片式容器 */
-    .card {
-        background-color: #ffffff;
-        border-radius: 12px;
-        padding: 25px;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);
-        border: 1px solid #e2e8f0;
-        transition: transform 0.2s;
-    }
-    .card:hover { transform: translateY(-2px); box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1); }
-    
-    /* 蓝色主题头部 */
-    .card-header {
-        color: #1e3a8a;
-        font-size: 22px;
-        font-weight: 700;
-        margin-bottom: 15px;
-        border-left: 5px solid #3b82f6;
-        padding-left: 12px;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-
-    /* 顶部 Banner */
-    .page-banner {
-        background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);
-        color: white;
-        padding: 20px 30px;
-        border-radius: 12px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 10px rgba(37, 99, 235, 0.3);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    
-    .metric-value { font-size: 32px; font-weight: 800; color: #2563eb; }
-    .metric-label { font-size: 16px; color: #64748b; font-weight: 500; }
-    
-    p, li, .stMarkdown { font-size: 16px !important; line-height: 1.6 !important; }
-</style>
-""", unsafe_allow_html=True)
+with timer("micro.css"):
+    inject_styles("lab", "micro")
 
 # 顶部 Banner
 st.markdown("""
 <div class="page-banner">
     <div>
-        <div style="font-size: 24px; font-weight: 800;">👤 个体职业发展实验室 <span style="font-size:18px; opacity:0.8; font-weight:400;">(Micro Lab)</span></div>
-        <div style="font-size: 16px; margin-top:5px; opacity:0.9;">西南交通大学希望学院 · 人力资源管理专业</div>
+        <div class="banner-title">👤 个体职业发展实验室 <small>(Micro Lab)</small></div>
+        <div class="banner-sub">西南交通大学希望学院 · 人力资源管理专业</div>
     </div>
-    <div style="background: rgba(255,255,255,0.2); padding: 5px 15px; border-radius: 20px; font-size: 14px;">
+    <div class="banner-badge">
         👩‍🏫 课程负责人：黎雅月
     </div>
 </div>
 """, unsafe_allow_html=True)
 
 # ==========================================
-# 2. 算法引擎
-# ==========================================
-def calc_mincer(edu, exp, gen_t, spec_t, disc):
-    base = 7.0
-    r = 0.08 + (0.004 * gen_t) + (0.002 * spec_t)
-    ln_w = base + r * edu + 0.05 * exp - 0.0006 * (exp**2)
-    wage = np.exp(ln_w)
-    wage_disc = wage * (1 - disc/100)
-    return wage, wage_disc
-
-def calc_migration_npv(w_home, w_city, cost_move, cost_psych, years=20):
-    t = np.arange(1, years+1)
-    benefit = (w_city - w_home) * 12
-    costs = np.array([cost_move + cost_psych] + [cost_psych]*(years-1))
-    net = benefit - costs
-    cum_npv = np.cumsum(net / (1.05 ** t))
-    return t, cum_npv
-
-# ==========================================
-# 3. 控制台与界面
+# 2. 控制台与界面
 # ==========================================
+# 每张卡片都是独立的 st.fragment，参数控件放在各自卡片内：
+# 拖动某个滑块只重跑它所在的卡片，其余卡片不会重新计算，也不会重新发送图表。
+# 操作日志也按卡片记录：局部重跑时只比对本卡片的控件。
+WAGE_WIDGETS = ("edu", "gen_t", "spec_t", "disc", "gap_region", "cohort_mode", "cohort_n", "data_mode", "survey_path",
+                "schooling_mode", "schooling_rate", "tuition", "return_decay")
+MIGRATION_WIDGETS = ("w_diff", "c_move", "c_psych", "migration_surface", "migration_rate")
 with st.sidebar:
     st.header("🎛️ 参数控制台")
+    st.info("参数已放入各实验模块卡片中，调整一个模块不会重算其他模块。")
+
+def wage_profile(edu, gen_t, spec_t, disc, coef=None):
+    if coef is None:
+        compute = lambda: (mincer_curve(12, 0, 0, 0)[0], *mincer_curve(edu, gen_t, spec_t, disc)) # 基准 + 实验组
+    else:
+        compute = lambda: (mincer_batch(12, 0, 0, 0, coef=coef)[0], *mincer_batch(edu, gen_t, spec_t, disc, coef=coef))
+    return cached_result(
+        "micro.mincer", compute,
+        edu=edu, gen_t=gen_t, spec_t=spec_t, disc=disc, coef=None if coef is None else tuple(coef.values()),
+    )
+
+# 数据实验室只读取 DATA_DIR 内的文件，输入框填写相对于数据目录的文件名
+DEFAULT_SURVEY = os.path.relpath(SURVEY_PATH, DATA_DIR)
+
+def survey_fit(path):
+    # 以路径 + 修改时间 + 大小为键：数据文件被替换后自动重新估计
+    stat = os.stat(path)
+    return cached_result("micro.survey_fit", lambda: estimate_mincer(path), path=str(path), mtime=stat.st_mtime_ns, size=stat.st_size)
+
+def gender_gap(region):
+    """微观数据中高收入性别与低收入性别的 Oaxaca 分解；仓库未导入或该地区不足两个性别时返回 None。"""
+    store = get_store()
+    if store is None:
+        return None
+    genders = [g for g in store.genders if store.count(region=region, gender=g) > 0]
+    if len(genders) < 2:
+        return None
+    def compute():
+        ranked = sorted(genders, key=lambda g: -store.mean_log_wage(region=region, gender=g))
+        return ranked[0], ranked[-1], store.oaxaca({"region": region, "gender": ranked[0]}, {"region": region, "gender": ranked[-1]})
+    return cached_result("micro.gender_gap", compute, region=region, rows=store.rows)
+
+def current_coef(ss=None):
+    """数据实验室开启且数据可用时返回估计出的系数，否则为 None (使用教材系数)。"""
+    ss = st.session_state if ss is None else ss
+    path = data_file(ss.get("survey_path", DEFAULT_SURVEY))
+    if not ss.get("data_mode") or path is None:
+        return None
+    try:
+        return survey_fit(path)["coef"]
+    except (ValueError, ImportError):
+        return None
+
+COHORT_SIZES = [100_000, 500_000, 1_000_000, 2_000_000, 5_000_000]
+
+def cohort_profile(n, edu, gen_t, spec_t, disc, coef=None):
+    def compute():
+        acc = simulate_cohort(n, edu, gen_t, spec_t, disc, coef=coef)
+        return acc.exp_centers, acc.quantiles(QUANTILES), acc.mean()
+    return cached_result("micro.cohort", compute, n=n, edu=edu, gen_t=gen_t, spec_t=spec_t, disc=disc,
+                         coef=None if coef is None else tuple(coef.values()))
+
+def schooling(disc, tuition, decay, coef=None):
+    # 受教育年限 × 贴现率 × 两种培训投入的完整网格一次求解，滑块只在网格上切片
+    return cached_result(
+        "micro.schooling",
+        lambda: optimal_schooling(disc=disc, tuition=tuition * 1000, decay=decay / 100, coef=coef),
+        disc=disc, tuition=tuition, decay=decay, coef=None if coef is None else tuple(coef.values()),
+    )
+
+def migration(w_diff, c_move, c_psych):
+    return cached_result(
+        "micro.migration",
+        lambda: migration_curve(w_diff, c_move, c_psych),
+        w_diff=w_diff, c_move=c_move, c_psych=c_psych,
+    )
+
+def migration_grid():
+    # 滑块全部取值 × 贴现率的完整网格，闭式求解，整个网格只算一次
+    w_diff, c_move, c_psych = (np.arange(lo, hi + 1) for lo, hi in MIGRATION_AXES.values())
+    return cached_result(
+        "micro.migration_surface",
+        lambda: migration_surface(w_diff[:, None, None, None], c_move[:, None, None], c_psych[:, None], RATE_GRID),
+        axes=tuple(MIGRATION_AXES.values()), rates=RATE_GRID,
+    )
+
+def report_values(ss):
+    """报告取值。ss 为会话状态 (或 lmdt.reports.SessionView)，点击下载时也按最新的控件取值计算。"""
+    w_base, w_exp, _ = wage_profile(ss.edu, ss.gen_t, ss.spec_t, ss.disc, current_coef(ss))
+    _, _, breakeven = migration(ss.w_diff, ss.c_move, ss.c_psych)
+    return dict(edu=ss.edu, gen_t=ss.gen_t, spec_t=ss.spec_t, disc=ss.disc, premium=((w_exp[20]/w_base[20])-1)*100,
+                w_diff=ss.w_diff, c_move=ss.c_move, c_psych=ss.c_psych, breakeven=breakeven)
+
+# --- 模块一：职业画像 ---
+@st.fragment
+def wage_profile_card():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="card-header">💎 模块一：职业生涯工资画像 (Wage-Age Profile)</div>', unsafe_allow_html=True)
+
     with st.expander("🎓 人力资本 (Ch5)", expanded=True):
-        edu = st.slider("受教育年限", 9, 22, 16)
-        gen_t = st.slider("一般培训投入", 0, 10, 5)
-        spec_t = st.slider("特殊培训投入", 0, 10, 3)
-    with st.expander("🧭 流动决策 (Ch6)", expanded=False):
-        w_diff = st.slider("城乡月薪差 (k)", 1, 30, 8)
-        c_move = st.number_input("搬迁成本 (k)", 0, 100, 20)
-        c_psych = st.slider("心理成本 (k/年)", 0, 50, 10)
+        c1, c2, c3 = st.columns(3)
+        edu = c1.slider("受教育年限", 9, 22, 16, key="edu")
+        gen_t = c2.slider("一般培训投入", 0, 10, 5, key="gen_t")
+        spec_t = c3.slider("特殊培训投入", 0, 10, 3, key="spec_t")
     with st.expander("⚖️ 歧视系数 (Ch7)", expanded=False):
-        disc = st.slider("市场歧视程度 (%)", 0, 40, 15)
+        disc = st.slider("市场歧视程度 (%)", 0, 40, 15, key="disc")
+        store = get_store()
+        if store is not None:
+            # 对照真实数据：Oaxaca 分解中无法由教育、工龄解释的部分，常被视为歧视的上限估计
+            region = st.selectbox("微观数据地区", [None, *store.regions], format_func=lambda r: r or "全部地区", key="gap_region")
+            result = gender_gap(region)
+            if result is None:
+                st.info("该范围内的微观数据不足两个性别，无法做性别工资差距分解。")
+            else:
+                hi, lo, gap = result
+                g1, g2 = st.columns(2)
+                g1.metric(f"实测工资差距 ({hi} vs {lo})", f"{np.expm1(gap['gap']):.1%}")
+                g2.metric("其中不可解释部分", f"{-np.expm1(-gap['unexplained']):.1%}", help="以高收入组系数为基准的 Oaxaca-Blinder 分解，可与上方歧视滑块对照")
+                if abs(gap['gap']) < 1e-9:
+                    st.info("两组平均工资相同，没有可分解的差距。")
+                else:
+                    st.caption(f"样本 {gap['n_a'] + gap['n_b']:,} 人 · 可由教育与工龄差异解释 {gap['explained'] / gap['gap']:.0%}")
+    cohort_mode = st.toggle("👥 群体模式：模拟整届劳动者的工资分布 (Monte Carlo)", key="cohort_mode")
+    if cohort_mode:
+        cohort_n = st.select_slider("模拟人数", options=COHORT_SIZES, value=1_000_000, format_func=lambda n: f"{n // 10_000} 万人", key="cohort_n")
+    if st.toggle("📂 数据实验室：用微观调查数据估计明瑟方程系数", key="data_mode"):
+        name = st.text_input("调查数据文件 (服务器数据目录下的 CSV / Parquet，需含 wage、edu、exp 列)", value=DEFAULT_SURVEY, key="survey_path")
+        path = data_file(name)
+        if path is None:
+            st.warning("数据目录中未找到该文件，仍使用教材系数。可用 `python -m lmdt.engine.estimation sample` 生成演示数据。")
+        else:
+            try:
+                with st.spinner("正在分块读取数据并估计 (OLS)..."):
+                    fit = survey_fit(path)
+            except (ValueError, ImportError) as e:
+                st.error(f"估计失败：{e}")
+            else:
+                st.dataframe([{"系数": name, "估计值": round(fit["coef"][name], 6), "标准误": round(fit["se"][name], 6)}
+                              for name in REGRESSORS], hide_index=True)
+                st.caption(f"样本量 {fit['n']:,} · R² = {fit['r2']:.3f} · 下方工资曲线已改用估计系数")
+    coef = current_coef()
 
-# --- 模块一：职业画像 ---
-st.markdown('<div class="card">', unsafe_allow_html=True)
-st.markdown('<div class="card-header">💎 模块一：职业生涯工资画像 (Wage-Age Profile)</div>', unsafe_allow_html=True)
-
-col1, col2 = st.columns([3, 1])
-exp_vec = np.linspace(0, 40, 100)
-w_base, _ = calc_mincer(12, exp_vec, 0, 0, 0) # 基准
-w_exp, w_disc = calc_mincer(edu, exp_vec, gen_t, spec_t, disc)
-
-with col1:
-    fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(x=exp_vec, y=w_base, name='对照组 (高中)', line=dict(color='#cbd5e1', dash='dash')))
-    fig1.add_trace(go.Scatter(x=exp_vec, y=w_exp, name=f'实验组 ({edu}年)', line=dict(color='#3b82f6', width=4)))
-    if disc > 0:
-        fig1.add_trace(go.Scatter(x=exp_vec, y=w_disc, name='歧视后工资', line=dict(color='#ef4444')))
-        fig1.add_trace(go.Scatter(x=exp_vec, y=w_exp, fill='tonexty', fillcolor='rgba(239, 68, 68, 0.1)', line=dict(width=0), showlegend=False))
-    
-    fig1.update_layout(xaxis_title="工龄 (Year)", yaxis_title="工资指数", template="plotly_white", height=400, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig1, use_container_width=True)
-
-with col2:
-    st.markdown("##### 📊 关键指标")
-    st.markdown(f"<div class='metric-label'>起薪预测</div><div class='metric-value'>{w_exp[0]:.1f}</div>", unsafe_allow_html=True)
-    st.markdown("<br>", unsafe_allow_html=True)
-    premium = ((w_exp[20]/w_base[20])-1)*100
-    st.markdown(f"<div class='metric-label'>教育溢价</div><div class='metric-value' style='color:{'#10b981' if premium>0 else '#ef4444'}'>+{premium:.1f}%</div>", unsafe_allow_html=True)
-    if disc > 0:
+    col1, col2 = st.columns([3, 1])
+    exp_vec = EXP_GRID
+    w_base, w_exp, w_disc = wage_profile(edu, gen_t, spec_t, disc, coef)
+    if cohort_mode:
+        # 受教育年限 ~ N(edu, 2)，培训 ~ 二项分布，一半劳动者承受歧视折扣，工资含对数正态冲击
+        exp_mid, wage_q, wage_mean = cohort_profile(cohort_n, edu, gen_t, spec_t, disc, coef)
+
+    def build_fig1():
+        fig1 = go.Figure()
+        fig1.add_trace(go.Scatter(x=exp_vec, y=w_base, name='对照组 (高中)', line=dict(color='#cbd5e1', dash='dash'), legendrank=1))
+        # 歧视曲线先画，实验组直接 fill='tonexty' 填充两线之间的损失，不再额外发送一条重复的 w_exp
+        if disc > 0:
+            fig1.add_trace(go.Scatter(x=exp_vec, y=w_disc, name='歧视后工资', line=dict(color='#ef4444'), legendrank=3))
+        fig1.add_trace(go.Scatter(x=exp_vec, y=w_exp, name=f'实验组 ({edu}年)', line=dict(color='#3b82f6', width=4), legendrank=2,
+                                  fill='tonexty' if disc > 0 else None, fillcolor='rgba(239, 68, 68, 0.1)'))
+
+        fig1.update_layout(xaxis_title="工龄 (Year)", yaxis_title="工资指数", template="plotly_white", height=400, margin=dict(l=20, r=20, t=20, b=20))
+        return fig1
+
+    def build_cohort_fig():
+        fig = go.Figure()
+        # 先画上沿再用 fill='tonexty' 画下沿，形成分位数带
+        fig.add_trace(go.Scatter(x=exp_mid, y=wage_q[:, 4], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=exp_mid, y=wage_q[:, 0], name='P10–P90', fill='tonexty', fillcolor='rgba(59, 130, 246, 0.12)', line=dict(width=0)))
+        fig.add_trace(go.Scatter(x=exp_mid, y=wage_q[:, 3], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=exp_mid, y=wage_q[:, 1], name='P25–P75', fill='tonexty', fillcolor='rgba(59, 130, 246, 0.28)', line=dict(width=0)))
+        fig.add_trace(go.Scatter(x=exp_mid, y=wage_q[:, 2], name='群体中位数', line=dict(color='#1e3a8a', width=3)))
+        fig.add_trace(go.Scatter(x=exp_vec, y=w_exp, name=f'明瑟均值 ({edu}年)', line=dict(color='#3b82f6', dash='dash')))
+        fig.update_layout(xaxis_title="工龄 (Year)", yaxis_title="工资指数", template="plotly_white", height=400, margin=dict(l=20, r=20, t=20, b=20))
+        return fig
+
+    with col1:
+        with timer("micro.fig1.build"):
+            if cohort_mode:
+                fig1 = cached_figure("micro.cohort_fig", build_cohort_fig, n=cohort_n, edu=edu, gen_t=gen_t, spec_t=spec_t, disc=disc,
+                                     coef=None if coef is None else tuple(coef.values()))
+            else:
+                fig1 = cached_figure("micro.fig1", build_fig1, edu=edu, gen_t=gen_t, spec_t=spec_t, disc=disc,
+                                     coef=None if coef is None else tuple(coef.values()))
+        with timer("micro.fig1.chart"):
+            st.plotly_chart(fig1, use_container_width=True)
+
+    with col2:
+        st.markdown("##### 📊 关键指标")
+        st.markdown(f"<div class='metric-label'>起薪预测</div><div class='metric-value'>{w_exp[0]:.1f}</div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown(f"<div class='metric-label'>歧视损失</div><div class='metric-value' style='color:#ef4444'>-{disc}%</div>", unsafe_allow_html=True)
+        premium = ((w_exp[20]/w_base[20])-1)*100
+        st.markdown(f"<div class='metric-label'>教育溢价</div><div class='metric-value' style='color:{'#10b981' if premium>0 else '#ef4444'}'>+{premium:.1f}%</div>", unsafe_allow_html=True)
+        if disc > 0:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-label'>歧视损失</div><div class='metric-value' style='color:#ef4444'>-{disc}%</div>", unsafe_allow_html=True)
+        if cohort_mode:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown(f"<div class='metric-label'>群体收入差距 P90/P10 (工龄20年)</div><div class='metric-value'>{wage_q[20, 4] / wage_q[20, 0]:.2f}×</div>", unsafe_allow_html=True)
 
-st.markdown('</div>', unsafe_allow_html=True)
+    if st.toggle("🎓 终身收入与最优受教育年限：把整条工资曲线贴现加总", key="schooling_mode"):
+        c1, c2, c3 = st.columns(3)
+        rate = c1.select_slider("贴现率", options=DISCOUNT_GRID.tolist(), value=0.05, format_func=lambda r: f"{r:.1%}", key="schooling_rate")
+        tuition = c2.slider("学费与在学开支 (千/年)", 0, 30, 8, key="tuition")
+        decay = c3.slider("边际回报递减 (百分点/年)", 0.0, 1.0, round(RETURN_DECAY * 100, 1), 0.1, key="return_decay",
+                          help="每多读一年，教育回报率下降的幅度；为 0 时与上方明瑟曲线完全一致，最优解基本只有 “不读” 或接近 “读到底” 两种")
+        best = schooling(disc, tuition, decay, coef)
+        surface = best["surface"]
+        r_idx = int(np.argmin(np.abs(DISCOUNT_GRID - rate)))
+        cell = (slice(None), r_idx, gen_t - TRAINING_AXIS[0], spec_t - TRAINING_AXIS[0])
+        net, earnings, forgone, tuition_pv = (surface[k][cell] / 1e4 for k in ("net", "earnings", "forgone", "tuition"))
+        best_edu = int(best["edu"][cell[1:]])
+        e_idx = edu - EDU_AXIS[0]
+
+        def build_schooling_fig():
+            fig = go.Figure()
+            fig.add_trace(go.Bar(x=EDU_AXIS, y=forgone, name="放弃的收入", marker_color="#fca5a5"))
+            fig.add_trace(go.Bar(x=EDU_AXIS, y=tuition_pv, name="学费", marker_color="#fdba74"))
+            fig.add_trace(go.Scatter(x=EDU_AXIS, y=net, name="终身净收入 (扣除学费)", line=dict(color="#3b82f6", width=4)))
+            fig.add_vline(x=best_edu, line_dash="dot", line_color="#10b981", annotation_text=f"最优 {best_edu} 年")
+            fig.update_layout(xaxis_title="受教育年限", yaxis_title="现值 (万)", barmode="stack", template="plotly_white",
+                              height=380, margin=dict(l=20, r=20, t=20, b=20), legend=dict(orientation="h", y=-0.25))
+            return fig
+
+        def build_optimum_fig():
+            fig = go.Figure()
+            fig.add_trace(go.Heatmap(x=DISCOUNT_GRID, y=TRAINING_AXIS, z=best["edu"][:, :, spec_t - TRAINING_AXIS[0]].T,
+                                     colorscale="Blues", colorbar=dict(title="最优年限"),
+                                     hovertemplate="贴现率 %{x:.1%}<br>一般培训 %{y}<br>最优 %{z} 年<extra></extra>"))
+            fig.add_trace(go.Scatter(x=[DISCOUNT_GRID[r_idx]], y=[gen_t], mode="markers", name="当前选择",
+                                     marker=dict(symbol="x", size=14, color="#ef4444")))
+            fig.update_layout(xaxis_title="贴现率", yaxis_title="一般培训投入", xaxis_tickformat=".0%", template="plotly_white",
+                              height=380, margin=dict(l=20, r=20, t=20, b=20), showlegend=False)
+            return fig
+
+        key = dict(disc=disc, tuition=tuition, decay=decay, rate=DISCOUNT_GRID[r_idx], gen_t=gen_t, spec_t=spec_t,
+                   coef=None if coef is None else tuple(coef.values()))
+        s1, s2 = st.columns(2)
+        with s1:
+            with timer("micro.schooling_fig.build"):
+                schooling_fig = cached_figure("micro.schooling_fig", build_schooling_fig, **key)
+            st.plotly_chart(schooling_fig, use_container_width=True)
+        with s2:
+            with timer("micro.optimum_fig.build"):
+                optimum_fig = cached_figure("micro.optimum_fig", build_optimum_fig, **key)
+            st.plotly_chart(optimum_fig, use_container_width=True)
+        m1, m2, m3 = st.columns(3)
+        m1.metric(f"终身净收入 ({edu} 年)", f"{net[e_idx]:,.0f} 万", help="工作到 60 岁的工资现值 (扣除歧视) 减去学费现值，贴现到义务教育结束时")
+        m2.metric("最优受教育年限", f"{best_edu} 年", f"{net[best_edu - EDU_AXIS[0]] - net[e_idx]:+,.0f} 万", delta_color="normal")
+        m3.metric(f"读书成本 ({edu} 年)", f"{forgone[e_idx] + tuition_pv[e_idx]:,.0f} 万", help="在读期间放弃的收入 (按义务教育学历就业) 与学费的现值")
+        st.caption(f"右图为特殊培训 {spec_t} 时各贴现率与一般培训组合下的最优受教育年限；贴现率越高，未来的工资溢价越不值钱。")
+        if decay > 0:
+            st.caption(f"⚠️ 边际回报递减为 {decay:.1f} 个百分点/年：本卡片的工资按递减回报计算，与上方明瑟曲线 (回报率不变) 不再相同。")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+    track_widgets("micro", WAGE_WIDGETS)
+    sync_report_preview("micro", report_values)
 
 # --- 模块二：迁移决策 ---
-st.markdown('<div class="card">', unsafe_allow_html=True)
-st.markdown('<div class="card-header">🚀 模块二：劳动力流动回报分析 (Migration NPV)</div>', unsafe_allow_html=True)
+@st.fragment
+def migration_card():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="card-header">🚀 模块二：劳动力流动回报分析 (Migration NPV)</div>', unsafe_allow_html=True)
 
-col3, col4 = st.columns([3, 1])
-years, npv = calc_migration_npv(5, 5+w_diff, c_move, c_psych)
-breakeven = np.where(npv > 0)[0]
+    with st.expander("🧭 流动决策 (Ch6)", expanded=True):
+        c1, c2, c3 = st.columns(3)
+        w_diff = c1.slider("城乡月薪差 (k)", 1, 30, 8, key="w_diff")
+        c_move = c2.number_input("搬迁成本 (k)", 0, 100, 20, key="c_move")
+        c_psych = c3.slider("心理成本 (k/年)", 0, 50, 10, key="c_psych")
 
-with col3:
-    fig2 = go.Figure(go.Bar(x=years, y=npv, marker_color=['#ef4444' if v<0 else '#10b981' for v in npv]))
-    fig2.update_layout(xaxis_title="年份", yaxis_title="累计净收益 (k)", template="plotly_white", height=350, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig2, use_container_width=True)
+    col3, col4 = st.columns([3, 1])
+    years, npv, breakeven = migration(w_diff, c_move, c_psych)
 
-with col4:
-    st.markdown("##### 💡 决策建议")
-    if len(breakeven) > 0:
-        st.success(f"✅ **值得迁移**\n\n预计在第 **{breakeven[0]+1}** 年收回成本并开始盈利。")
-    else:
-        st.error("❌ **不值得迁移**\n\n心理成本过高，长期收益无法覆盖成本。")
+    def build_fig2():
+        fig2 = go.Figure(go.Bar(x=years, y=npv, marker=sign_marker(npv)))
+        fig2.update_layout(xaxis_title="年份", yaxis_title="累计净收益 (k)", template="plotly_white", height=350, margin=dict(l=20, r=20, t=20, b=20))
+        return fig2
+
+    with col3:
+        with timer("micro.fig2.build"):
+            fig2 = cached_figure("micro.fig2", build_fig2, w_diff=w_diff, c_move=c_move, c_psych=c_psych)
+        with timer("micro.fig2.chart"):
+            st.plotly_chart(fig2, use_container_width=True)
+
+    with col4:
+        st.markdown("##### 💡 决策建议")
+        if breakeven > 0:
+            st.success(f"✅ **值得迁移**\n\n预计在第 **{breakeven}** 年收回成本并开始盈利。")
+        else:
+            st.error("❌ **不值得迁移**\n\n心理成本过高，长期收益无法覆盖成本。")
+    track_value("micro", "worth_migrating", bool(breakeven > 0))
 
+    if st.toggle("🗺️ 敏感性曲面：哪些工资差 / 搬迁成本组合值得迁移", key="migration_surface"):
+        rate = st.select_slider("贴现率", options=RATE_GRID.tolist(), value=0.05, format_func=lambda r: f"{r:.0%}", key="migration_rate")
+        surface_be, surface_npv = migration_grid()
+        (w_lo, _), (m_lo, _), (p_lo, _) = MIGRATION_AXES.values()
+        r_idx = int(np.argmin(np.abs(RATE_GRID - rate)))
+
+        def build_surface_fig():
+            w_axis = np.arange(w_lo, w_lo + surface_be.shape[0])
+            m_axis = np.arange(m_lo, m_lo + surface_be.shape[1])
+            be = surface_be[:, :, c_psych - p_lo, r_idx].astype(float)
+            be[be == 0] = np.nan  # 20 年内无法回本的区域留白
+            fig = go.Figure()
+            fig.add_trace(go.Heatmap(x=m_axis, y=w_axis, z=be, colorscale="Greens_r", colorbar=dict(title="回本年份"),
+                                     hovertemplate="搬迁成本 %{x}k<br>月薪差 %{y}k<br>第 %{z} 年回本<extra></extra>"))
+            # 20 年累计净现值 = 0 的等值线，即"值得迁移"区域的边界
+            fig.add_trace(go.Contour(x=m_axis, y=w_axis, z=surface_npv[:, :, c_psych - p_lo, r_idx], showscale=False,
+                                     contours=dict(start=0, end=0, coloring="none", showlabels=False),
+                                     line=dict(color="#ef4444", width=3), name="NPV = 0", hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=[c_move], y=[w_diff], mode="markers", name="当前选择",
+                                     marker=dict(symbol="x", size=14, color="#1e3a8a")))
+            fig.update_layout(xaxis_title="搬迁成本 (k)", yaxis_title="城乡月薪差 (k)", template="plotly_white",
+                              height=400, margin=dict(l=20, r=20, t=20, b=20), showlegend=False)
+            return fig
+
+        with timer("micro.surface_fig.build"):
+            surface_fig = cached_figure("micro.surface_fig", build_surface_fig, c_psych=c_psych, rate=rate, w_diff=w_diff, c_move=c_move)
+        with timer("micro.surface_fig.chart"):
+            st.plotly_chart(surface_fig, use_container_width=True)
+        st.caption(f"心理成本 {c_psych}k/年、贴现率 {rate:.0%} 时的回本年份；红线右下方 20 年内无法回本。")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+    track_widgets("micro", MIGRATION_WIDGETS)
+    sync_report_preview("micro", report_values)
+
+wage_profile_card()
+migration_card()
+
+# --- 模块：多情景对比 (固定多组参数，曲线叠加、指标并列) ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">🧪 多情景对比工作台</div>', unsafe_allow_html=True)
+scenario_workspace("micro")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # ==========================================
-# 4. 实验报告生成模块 (新增)
+# 3. 实验报告生成模块 (新增)
 # ==========================================
-st.markdown('<div class="card">', unsafe_allow_html=True)
-st.markdown('<div class="card-header">📝 实验报告生成</div>', unsafe_allow_html=True)
-
-report_text = f"""
-# 个体职业发展仿真实验报告
-**实验时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**学生姓名**: ___________
-
-## 一、 实验参数设定
-- **受教育年限**: {edu} 年
-- **培训投入**: 一般培训 ({gen_t}) / 特殊培训 ({spec_t})
-- **流动决策**: 城乡工资差 {w_diff}k, 搬迁成本 {c_move}k, 心理成本 {c_psych}k
-
-## 二、 实验结果分析
-### 1. 人力资本回报
-根据明瑟收入方程模拟，在当前教育投入下，预计职业中期的教育溢价率为 **{premium:.1f}%**。
-{f'同时，由于市场存在 **{disc}%** 的歧视系数，导致了显著的非生产率工资差异。' if disc > 0 else '市场环境公平，无显著歧视损失。'}
-
-### 2. 劳动力流动决策
-基于净现值(NPV)模型计算，{f'迁移是理性的选择，预计在第 **{breakeven[0]+1}** 年实现盈亏平衡。' if len(breakeven) > 0 else '迁移是非理性的，因为高昂的心理成本或搬迁成本导致长期净收益为负。'}
-
-## 三、 实验结论
-通过本次数字孪生仿真，验证了教育投资的边际递减规律以及心理成本对劳动力流动的阻碍作用。
-"""
-
-st.text_area("报告预览 (Markdown)", report_text, height=200)
-st.download_button(
-    label="📥 下载实验报告 (.md)",
-    data=report_text,
-    file_name=f"Micro_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md",
-    mime="text/markdown",
-    type="primary"
-)
-st.markdown('</div>', unsafe_allow_html=True)
+@st.fragment
+def report_card():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="card-header">📝 实验报告生成</div>', unsafe_allow_html=True)
+
+    # 报告读取两个模块卡片中的控件状态；正文只在展开预览 / 点击下载时按当时的取值生成，
+    # 预览展开时其他卡片改动参数会触发整页重跑 (sync_report_preview)
+    report_widgets("micro", report_values, f"Micro_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+report_card()
+
+# 页面已发送完毕，在后台为本进程预热引擎、查找表与 Plotly (每个进程只执行一次)
+prewarm()
+
+# 讲师调试面板 (地址栏加 ?debug=<口令> 时显示)
+render_debug_panel()
\ No newline at end of file
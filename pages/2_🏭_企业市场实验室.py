@@ -3,102 +3,102 @@ import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 
+from lmdt.assets import inject_styles
+from lmdt.cache import cached_figure, cached_result
+from lmdt.engine.shirking import SCHEMES, simulate_pay_schemes
+from lmdt.engine.equilibrium import market_demand, market_supply, minimum_wage_statics, sample_markets, solve_equilibrium
+from lmdt.events import track_widgets
+from lmdt.instructor import render_debug_panel
+from lmdt.metrics import timer
+from lmdt.reports import REF_WAGE, demand_summary, report_widgets
+from lmdt.scenarios import scenario_workspace
+from lmdt.warmup import prewarm
+
 # ==========================================
 # 1. 页面配置 & 视觉风格
 # ==========================================
 st.set_page_config(page_title="企业市场实验室", page_icon="🏭", layout="wide")
 
-st.markdown("""
-<style>
-    html, body, [class*="css"] { font-family: 'Microsoft YaHei', sans-serif !important; background-color: #f1f5f9; }
-    .block-container { padding-top: 3.5rem !important; padding-bottom: 5rem !important; max-width: 98% !important; }
-    header {visibility: hidden;}
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    .card {
-        background-color: #ffffff;
-        border-radius: 12px;
-        padding: 25px;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);
-        border: 1px solid #e2e8f0;
-    }
-    
-    /* 绿色主题头部 */
-    .card-header {
-        color: #064e3b;
-        font-size: 22px;
-        font-weight: 700;
-        margin-bottom: 15px;
-        border-left: 5px solid #10b981; 
-        padding-left: 12px;
-    }
-
-    .page-banner {
-        background: linear-gradient(135deg, #065f46 0%, #10b981 100%);
-        color: white;
-        padding: 20px 30px;
-        border-radius: 12px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 10px rgba(16, 185, 129, 0.3);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    
-    .metric-value { font-size: 32px; font-weight: 800; color: #059669; }
-    .metric-label { font-size: 16px; color: #64748b; font-weight: 500; }
-    
-    p, li, .stMarkdown { font-size: 16px !important; line-height: 1.6 !important; }
-</style>
-""", unsafe_allow_html=True)
+with timer("market.css"):
+    inject_styles("lab", "market")
 
 st.markdown("""
 <div class="page-banner">
     <div>
-        <div style="font-size: 24px; font-weight: 800;">🏭 企业市场实验室 <span style="font-size:18px; opacity:0.8; font-weight:400;">(Market Lab)</span></div>
-        <div style="font-size: 16px; margin-top:5px; opacity:0.9;">西南交通大学希望学院 · 人力资源管理专业</div>
+        <div class="banner-title">🏭 企业市场实验室 <small>(Market Lab)</small></div>
+        <div class="banner-sub">西南交通大学希望学院 · 人力资源管理专业</div>
     </div>
-    <div style="background: rgba(255,255,255,0.2); padding: 5px 15px; border-radius: 20px; font-size: 14px;">
+    <div class="banner-badge">
         👩‍🏫 课程负责人：黎雅月
     </div>
 </div>
 """, unsafe_allow_html=True)
 
-# 算法
-def calc_derived_demand(capital, tech_type, prod_price):
-    w = np.linspace(5, 100, 100)
-    tech_factor = 1.5 if tech_type == "劳动互补型" else (0.6 if tech_type == "劳动替代型" else 1.0)
-    demand = (prod_price * capital * tech_factor * 10) / w
-    return w, demand
-
 with st.sidebar:
     st.header("🎛️ 企业决策控制")
     with st.expander("🏭 生产要素 (Ch3)", expanded=True):
-        capital = st.slider("资本存量 (K)", 10, 100, 50)
-        prod_price = st.slider("产品价格指数 (P)", 1.0, 5.0, 2.0)
-        tech_type = st.selectbox("技术进步类型", ["中性技术", "劳动替代型", "劳动互补型"])
+        capital = st.slider("资本存量 (K)", 10, 100, 50, key="capital")
+        prod_price = st.slider("产品价格指数 (P)", 1.0, 5.0, 2.0, key="prod_price")
+        tech_type = st.selectbox("技术进步类型", ["中性技术", "劳动替代型", "劳动互补型"], key="tech_type")
+        sigma = st.slider("要素替代弹性 (σ)", 0.2, 3.0, 0.8, 0.1, key="sigma", help="σ < 1 资本与劳动互补，σ > 1 易于相互替代；σ = 1 即 Cobb-Douglas")
+        n_firms = st.select_slider("行业内企业数", options=[1, 100, 1_000, 5_000, 10_000], value=1_000, key="n_firms")
+    with st.expander("⚖️ 市场均衡 (Ch4)", expanded=True):
+        min_wage = st.slider("最低工资标准 (0 = 不设)", 0, 120, 0, 5, key="min_wage")
+        n_markets = st.select_slider("模拟市场数 (地区 × 行业)", options=[100, 1_000, 10_000], value=10_000, key="n_markets")
     with st.expander("💰 薪酬激励 (Ch8)", expanded=True):
-        pay_mode = st.radio("薪酬制度设计", ["计时工资", "计件工资", "效率工资"])
+        pay_mode = st.radio("薪酬制度设计", list(SCHEMES), key="pay_mode")
+        monitoring = st.slider("监督抽查概率 (q/月)", 0.02, 0.5, 0.2, 0.02, key="monitoring")
+        premium = st.slider("效率工资溢价 (× 计时工资)", 1.0, 1.6, 1.15, 0.05, key="premium")
+        n_workers = st.select_slider("每种制度的模拟员工数", options=[100_000, 300_000, 1_000_000], value=100_000, format_func=lambda n: f"{n // 10_000} 万", key="n_workers")
+
+# 侧边栏控件变化写入操作日志 (后台线程批量落盘，不阻塞本次重跑)
+track_widgets("market", ("capital", "prod_price", "tech_type", "sigma", "n_firms", "min_wage", "n_markets",
+                         "pay_mode", "monitoring", "premium", "n_workers"))
 
 # --- 模块：派生需求 ---
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">📉 希克斯-马歇尔派生需求仿真</div>', unsafe_allow_html=True)
 
 col1, col2 = st.columns([3, 1])
-w, d = calc_derived_demand(capital, tech_type, prod_price)
+demand_params = dict(capital=capital, tech_type=tech_type, prod_price=prod_price, sigma=sigma, n_firms=n_firms)
+w, d, firm_q, el_sub, el_scale, el_total, s_labor = cached_result("market.demand", lambda: demand_summary(**demand_params), **demand_params)
+ref = int(np.argmin(np.abs(w - REF_WAGE)))
 
-with col1:
+def build_fig1():
     fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(x=d, y=w, name="劳动需求 D", line=dict(color='#10b981', width=4)))
-    fig1.update_layout(xaxis_title="雇佣人数 (L)", yaxis_title="工资率 (W)", template="plotly_white", height=450, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig1, use_container_width=True)
+    fig1.add_trace(go.Scatter(x=d, y=w, name=f"行业劳动需求 D ({n_firms:,} 家企业)", line=dict(color='#10b981', width=4)))
+    if n_firms > 1:
+        # 单个企业需求的离散程度 (P10–P90)，横轴按行业规模折算，便于与行业曲线对比形状
+        fig1.add_trace(go.Scatter(x=firm_q[2] * n_firms, y=w, line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig1.add_trace(go.Scatter(x=firm_q[0] * n_firms, y=w, name="企业需求 P10–P90 (× 企业数)", fill='tonextx', fillcolor='rgba(16, 185, 129, 0.12)', line=dict(width=0)))
+    fig1.update_layout(xaxis_title="雇佣人数 (L，对数轴)", yaxis_title="工资率 (W)", xaxis_type="log", template="plotly_white", height=450, margin=dict(l=20, r=20, t=20, b=20))
+    return fig1
+
+def build_fig_elasticity():
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=w, y=el_sub, name="替代效应 -(1-s)σ", stackgroup="hm", line=dict(color='#34d399')))
+    fig.add_trace(go.Scatter(x=w, y=el_scale, name="规模效应 -sη", stackgroup="hm", line=dict(color='#065f46')))
+    fig.add_trace(go.Scatter(x=w, y=el_total, name="长期自身工资弹性", line=dict(color='#0f172a', width=3, dash='dash')))
+    fig.update_layout(xaxis_title="工资率 (W)", yaxis_title="劳动需求弹性", template="plotly_white", height=300, margin=dict(l=20, r=20, t=20, b=20))
+    return fig
+
+with col1:
+    with timer("market.fig1.build"):
+        fig1 = cached_figure("market.fig1", build_fig1, **demand_params)
+    with timer("market.fig1.chart"):
+        st.plotly_chart(fig1, use_container_width=True)
+    with st.expander("📐 希克斯-马歇尔弹性分解 (按雇佣加权的行业平均)", expanded=False):
+        with timer("market.fig_elasticity.build"):
+            fig_el = cached_figure("market.fig_elasticity", build_fig_elasticity, **demand_params)
+        st.plotly_chart(fig_el, use_container_width=True)
 
 with col2:
     st.markdown("##### 📊 关键参数")
     st.markdown(f"<div class='metric-label'>资本存量</div><div class='metric-value'>{capital}</div>", unsafe_allow_html=True)
     st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>需求弹性 (W={w[ref]:.0f})</div><div class='metric-value'>{el_total[ref]:.2f}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>劳动收入份额</div><div class='metric-value'>{s_labor[ref]:.0%}</div>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
     st.markdown(f"<div class='metric-label'>技术类型</div>", unsafe_allow_html=True)
     
     if tech_type == "劳动替代型":
@@ -110,6 +110,62 @@ with col2:
 
 st.markdown('</div>', unsafe_allow_html=True)
 
+# --- 模块：市场均衡 ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">⚖️ 劳动力市场均衡与最低工资 (Ch4)</div>', unsafe_allow_html=True)
+
+market_params = dict(capital=capital, tech_type=tech_type, prod_price=prod_price, sigma=sigma, n_markets=n_markets)
+
+def compute_equilibrium():
+    markets = sample_markets(n_markets, capital, prod_price, tech_type, sigma)
+    return markets, *solve_equilibrium(markets)
+
+markets, w_eq, l_eq = cached_result("market.equilibrium", compute_equilibrium, **market_params)
+mw = cached_result("market.min_wage", lambda: minimum_wage_statics(markets, min_wage, (w_eq, l_eq)), min_wage=min_wage, **market_params)
+rep = int(np.argsort(w_eq)[len(w_eq) // 2])  # 出清工资居中的代表性市场
+
+def build_fig_wage_dist():
+    counts, edges = np.histogram(w_eq, bins=60)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), marker_color='#10b981', name="市场数"))
+    if min_wage > 0:
+        fig.add_vline(x=min_wage, line=dict(color='#ef4444', width=3, dash='dash'), annotation_text="最低工资")
+    fig.update_layout(xaxis_title="出清工资 W*", yaxis_title="市场数", template="plotly_white", height=350, margin=dict(l=20, r=20, t=20, b=20), bargap=0)
+    return fig
+
+def build_fig_market():
+    one = {k: v[rep:rep + 1] for k, v in markets.items()}
+    wages = np.linspace(0.3, 2.0, 80) * w_eq[rep]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=market_demand(wages[:, None], one)[:, 0], y=wages, name="需求 D", line=dict(color='#10b981', width=4)))
+    fig.add_trace(go.Scatter(x=market_supply(wages[:, None], one)[:, 0], y=wages, name="供给 S", line=dict(color='#3b82f6', width=4)))
+    fig.add_trace(go.Scatter(x=[l_eq[rep]], y=[w_eq[rep]], mode="markers", name="均衡点 E", marker=dict(size=14, color='#0f172a')))
+    if min_wage > 0:
+        fig.add_hline(y=min_wage, line=dict(color='#ef4444', width=3, dash='dash'), annotation_text="最低工资")
+    fig.update_layout(xaxis_title="就业人数 (L)", yaxis_title="工资率 (W)", template="plotly_white", height=350, margin=dict(l=20, r=20, t=20, b=20))
+    return fig
+
+c1, c2, c3 = st.columns([2, 2, 1])
+with c1:
+    st.markdown(f"##### 📊 {n_markets:,} 个市场的出清工资分布")
+    with timer("market.fig_wage_dist.build"):
+        fig_dist = cached_figure("market.fig_wage_dist", build_fig_wage_dist, min_wage=min_wage, **market_params)
+    st.plotly_chart(fig_dist, use_container_width=True)
+with c2:
+    st.markdown("##### 🔍 代表性市场的供求")
+    with timer("market.fig_market.build"):
+        fig_market = cached_figure("market.fig_market", build_fig_market, min_wage=min_wage, **market_params)
+    st.plotly_chart(fig_market, use_container_width=True)
+with c3:
+    binding_share = mw["binding"].mean()
+    employment_change = mw["floor_employment"].sum() / mw["employment"].sum() - 1
+    unemployment_rate = mw["unemployment"].sum() / markets["workers"].sum()
+    st.markdown(f"<div class='metric-label'>出清工资中位数</div><div class='metric-value'>{np.median(w_eq):.1f}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>最低工资约束的市场</div><div class='metric-value'>{binding_share:.0%}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>总就业变化</div><div class='metric-value' style='color:{'#ef4444' if employment_change < 0 else '#059669'}'>{employment_change:+.1%}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>新增失业率</div><div class='metric-value'>{unemployment_rate:.1%}</div>", unsafe_allow_html=True)
+
+st.markdown('</div>', unsafe_allow_html=True)
+
 # --- 模块：薪酬 ---
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">💰 薪酬激励制度设计</div>', unsafe_allow_html=True)
@@ -118,6 +174,47 @@ if pay_mode == "效率工资":
     st.write("企业支付高于市场出清水平的工资，目的是减少员工偷懒（Solow Condition）和降低流失率。")
 else:
     st.write(f"当前选择：**{pay_mode}**。这种模式下，工资通常等于劳动的边际产品价值 (W = VMP)。")
+
+# Shapiro-Stiglitz 偷懒模型：三种制度在同一次仿真中并排运行
+pay_params = dict(monitoring=monitoring, premium=premium, n_workers=n_workers)
+with st.spinner("正在模拟员工的努力、抽查与离职..."):
+    traj = cached_result("market.pay_schemes", lambda: simulate_pay_schemes(n_workers, monitoring=monitoring, premium=premium), **pay_params)
+months = np.arange(1, traj["quit_rate"].shape[1] + 1)
+sel = SCHEMES.index(pay_mode)
+SCHEME_COLORS = ('#3b82f6', '#f59e0b', '#10b981')
+
+def build_fig_pay(metric, y_title, pct):
+    fig = go.Figure()
+    for i, name in enumerate(SCHEMES):
+        fig.add_trace(go.Scatter(x=months, y=traj[metric][i] * (100 if pct else 1), name=name,
+                                 line=dict(color=SCHEME_COLORS[i], width=5 if i == sel else 2, dash=None if i == sel else 'dot')))
+    fig.update_layout(xaxis_title="月份", yaxis_title=y_title, template="plotly_white", height=320,
+                      margin=dict(l=20, r=20, t=20, b=20), legend=dict(orientation="h", y=1.12))
+    return fig
+
+p1, p2, p3 = st.columns([2, 2, 1])
+with p1:
+    st.markdown("##### 📈 单位人工成本产出")
+    with timer("market.fig_pay.build"):
+        fig_eff = cached_figure("market.fig_pay_eff", lambda: build_fig_pay("output_per_cost", "产出 / 人工成本", False), pay_mode=pay_mode, **pay_params)
+    st.plotly_chart(fig_eff, use_container_width=True)
+with p2:
+    st.markdown("##### 🚪 月度离职率")
+    with timer("market.fig_pay.build"):
+        fig_quit = cached_figure("market.fig_pay_quit", lambda: build_fig_pay("quit_rate", "主动离职率 (%)", True), pay_mode=pay_mode, **pay_params)
+    st.plotly_chart(fig_quit, use_container_width=True)
+with p3:
+    st.markdown(f"<div class='metric-label'>{pay_mode} · 偷懒比例</div><div class='metric-value'>{traj['shirk_rate'][sel, -1]:.1%}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='metric-label'>月度解雇率</div><div class='metric-value'>{traj['fire_rate'][sel, -1]:.1%}</div>", unsafe_allow_html=True)
+    best = SCHEMES[int(np.argmax(traj['output_per_cost'][:, -1]))]
+    st.markdown(f"<div class='metric-label'>当前参数下最划算</div><div class='metric-value'>{best}</div>", unsafe_allow_html=True)
+st.caption(f"每种制度 {n_workers:,} 名员工并排仿真 36 个月：偷懒被抽查到即解雇，离职与解雇的岗位由新员工补上 (每人招聘成本 0.5 个月工资)。")
+st.markdown('</div>', unsafe_allow_html=True)
+
+# --- 模块：多情景对比 (固定多组参数，曲线叠加、指标并列) ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">🧪 多情景对比工作台</div>', unsafe_allow_html=True)
+scenario_workspace("market")
 st.markdown('</div>', unsafe_allow_html=True)
 
 # ==========================================
@@ -126,34 +223,18 @@ st.markdown('</div>', unsafe_allow_html=True)
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">📝 实验报告生成</div>', unsafe_allow_html=True)
 
-report_text = f"""
-# 企业决策仿真实验报告
-**实验时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**学生姓名**: ___________
-
-## 一、 生产要素配置
-- **资本存量**: {capital} 单位
-- **产品价格**: {prod_price} 指数
-- **技术类型**: {tech_type}
-
-## 二、 实验结果分析
-### 1. 派生需求分析
-实验显示，{f'由于采用了{tech_type}，企业的劳动需求曲线显著外移，表明该技术与劳动呈互补关系。' if tech_type == '劳动互补型' else f'由于采用了{tech_type}，机器对劳动产生了明显的替代效应，需求收缩。' if tech_type == '劳动替代型' else '技术进步呈现中性特征，未对劳动需求产生偏向性影响。'}
-
-### 2. 薪酬制度设计
-当前选择的薪酬模式为 **{pay_mode}**。
-{ '效率工资有助于解决信息不对称下的激励问题，但增加了企业的显性薪酬成本。' if pay_mode == '效率工资' else '计时/计件工资更依赖于企业的监督成本或产出可观测性。'}
-
-## 三、 实验结论
-本次仿真验证了希克斯-马歇尔派生需求定理，证明了技术进步的方向是影响劳动力需求弹性的关键变量。
-"""
-
-st.text_area("报告预览 (Markdown)", report_text, height=200)
-st.download_button(
-    label="📥 下载实验报告 (.md)",
-    data=report_text,
-    file_name=f"Market_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md",
-    mime="text/markdown",
-    type="primary"
+# 正文只在展开预览 / 点击下载时生成，拖动滑块的重跑不再构建和发送报告
+report_values = dict(
+    demand_params, min_wage=min_wage, n_markets=n_markets, pay_mode=pay_mode, monitoring=monitoring, premium=premium,
+    ref_wage=w[ref], el_total=el_total[ref], el_sub=el_sub[ref], el_scale=el_scale[ref], s_labor=s_labor[ref],
+    median_wage=np.median(w_eq), binding_share=binding_share, employment_change=employment_change, unemployment_rate=unemployment_rate,
+    shirk_rate=traj['shirk_rate'][sel, -1], quit_rate=traj['quit_rate'][sel, -1], output_per_cost=traj['output_per_cost'][sel, -1], best=best,
 )
+report_widgets("market", report_values, f"Market_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md")
 st.markdown('</div>', unsafe_allow_html=True)
+
+# 页面已发送完毕，在后台为本进程预热引擎、查找表与 Plotly (每个进程只执行一次)
+prewarm()
+
+# 讲师调试面板 (地址栏加 ?debug=<口令> 时显示)
+render_debug_panel()
@@ -1,114 +1,89 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from datetime import datetime
 
+from lmdt.assets import inject_styles
+from lmdt.cache import cached_figure, cached_result
+from lmdt.engine import AI_RISK_GRID, MISMATCH_GRID, POLICIES, POLICY_COMBOS, U_GRID, beveridge_k, calc_beveridge, equilibrium_u, policy_levers, simulate_matching, simulated_theta, sweep_policies
+from lmdt.engine.transition import SHOCK_QUARTER, TRANSITION_PATHS, sample_transitions
+from lmdt.events import track_widgets
+from lmdt.instructor import render_debug_panel
+from lmdt.metrics import timer
+from lmdt.reports import report_widgets
+from lmdt.scenarios import scenario_workspace
+from lmdt.warmup import prewarm
+
 # ==========================================
 # 1. 页面配置 & 视觉风格
 # ==========================================
 st.set_page_config(page_title="宏观政策实验室", page_icon="🌍", layout="wide")
 
-st.markdown("""
-<style>
-    html, body, [class*="css"] { font-family: 'Microsoft YaHei', sans-serif !important; background-color: #f1f5f9; }
-    .block-container { padding-top: 3.5rem !important; padding-bottom: 5rem !important; max-width: 98% !important; }
-    header {visibility: hidden;}
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    .card {
-        background-color: #ffffff;
-        border-radius: 12px;
-        padding: 25px;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);
-        border: 1px solid #e2e8f0;
-    }
-    
-    .card-header {
-        color: #581c87;
-        font-size: 22px;
-        font-weight: 700;
-        margin-bottom: 15px;
-        border-left: 5px solid #8b5cf6;
-        padding-left: 12px;
-    }
-
-    .page-banner {
-        background: linear-gradient(135deg, #4c1d95 0%, #8b5cf6 100%);
-        color: white;
-        padding: 20px 30px;
-        border-radius: 12px;
-        margin-bottom: 25px;
-        box-shadow: 0 4px 10px rgba(139, 92, 246, 0.3);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    
-    .metric-value { font-size: 32px; font-weight: 800; color: #7c3aed; }
-    .metric-label { font-size: 16px; color: #64748b; font-weight: 500; }
-    
-    p, li, .stMarkdown { font-size: 16px !important; line-height: 1.6 !important; }
-</style>
-""", unsafe_allow_html=True)
+with timer("macro.css"):
+    inject_styles("lab", "macro")
 
 st.markdown("""
 <div class="page-banner">
     <div>
-        <div style="font-size: 24px; font-weight: 800;">🌍 宏观政策实验室 <span style="font-size:18px; opacity:0.8; font-weight:400;">(Macro Lab)</span></div>
-        <div style="font-size: 16px; margin-top:5px; opacity:0.9;">西南交通大学希望学院 · 人力资源管理专业</div>
+        <div class="banner-title">🌍 宏观政策实验室 <small>(Macro Lab)</small></div>
+        <div class="banner-sub">西南交通大学希望学院 · 人力资源管理专业</div>
     </div>
-    <div style="background: rgba(255,255,255,0.2); padding: 5px 15px; border-radius: 20px; font-size: 14px;">
+    <div class="banner-badge">
         👩‍🏫 课程负责人：黎雅月
     </div>
 </div>
 """, unsafe_allow_html=True)
 
-# ==========================================
-# 2. 核心算法修正：加入 ai_risk 变量
-# ==========================================
-def calc_beveridge(mismatch, policy_effect, ai_risk):
-    u = np.linspace(0.5, 15, 100) # 避免 u=0 的除零错误
-    
-    # 核心修正逻辑：
-    # 基础常数 k = 20
-    # mismatch (0-2.0): 结构性错配系数，每增加0.1，k增加5
-    # policy_effect (0/1): 政策修正，降低k
-    # ai_risk (0-100): AI冲击每增加1%，k增加0.6。当拉到100%时，k增加60，效果非常剧烈！
-    
-    k = 20 + (mismatch * 50) + (ai_risk * 0.6) - (policy_effect * 15)
-    
-    v = k / u
-    return u, v
-
 with st.sidebar:
     st.header("🌍 宏观驾驶舱")
     st.subheader("⚠️ 风险监测")
-    ai_risk = st.slider("AI 替代冲击 (%)", 0, 100, 30)
-    mismatch = st.slider("技能错配度", 0.0, 2.0, 0.8)
+    ai_risk = st.slider("AI 替代冲击 (%)", 0, 100, 30, key="ai_risk")
+    mismatch = st.slider("技能错配度", 0.0, 2.0, 0.8, key="mismatch")
     st.divider()
     st.subheader("🏛️ 政策工具箱")
-    policy = st.multiselect("干预手段", ["最低工资调整", "技能重塑补贴(Reskilling)", "失业救济金"])
+    policy = st.multiselect("干预手段", list(POLICIES), key="policy")
 
 # --- 模块：结构性失业 ---
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">🧬 结构性失业诊断 (Beveridge Curve)</div>', unsafe_allow_html=True)
 
 # 计算逻辑
-policy_score = 1.0 if "技能重塑补贴(Reskilling)" in policy else 0
+# 与全景扫描、情景对比相同的政策杠杆：技能重塑补贴降低 k，失业救济金提高 k 并与最低工资一起压低 θ
+policy_score, theta, k_shift = policy_levers(policy)
 
 # 修正：调用函数时传入 ai_risk
-u, v = calc_beveridge(mismatch, policy_score, ai_risk)
-u_base, v_base = calc_beveridge(0, 0, 0) # 理想状态：无错配，无AI冲击
+beveridge_params = dict(mismatch=mismatch, policy_score=policy_score, ai_risk=ai_risk)
+u, v = cached_result("macro.beveridge", lambda: calc_beveridge(mismatch, policy_score, ai_risk), **beveridge_params)
+v = v + k_shift / u   # 失业救济金的 k 增量使曲线外移
+u_star = float(np.sqrt((beveridge_k(mismatch, policy_score, ai_risk) + k_shift) / theta))
+u_base, v_base = cached_result("macro.beveridge", lambda: calc_beveridge(0, 0, 0), mismatch=0, policy_score=0, ai_risk=0) # 理想状态：无错配，无AI冲击
+
+# 曲线来源：解析公式 v = k/u，或由随机匹配仿真 (总量模型) 的稳态推出
+curve_source = st.radio("曲线来源", ["解析公式 (v = k/u)", "随机匹配仿真 (总量模型)"], horizontal=True, key="curve_source",
+                        help="仿真模式是总量随机模型，按计数抽取离职、转岗与匹配，不追踪单个劳动者；"
+                             "每个点是一个劳动力市场在匹配函数、离职与 AI 技能淘汰共同作用下的稳态 (u, v)；"
+                             "错配与技能重塑补贴按解析公式的 k 调整匹配效率，无 AI 冲击时两种曲线一致")
+if curve_source == "随机匹配仿真 (总量模型)":
+    with st.spinner("正在仿真各劳动力市场的离职、转岗与匹配..."):
+        u, v = cached_result("macro.matching", lambda: simulate_matching(ai_risk, mismatch, policy_score), **beveridge_params)
+        u_base, v_base = cached_result("macro.matching", lambda: simulate_matching(0, 0, 0), mismatch=0, policy_score=0, ai_risk=0)
+    # 仿真中没有救济金的 k 加项，与全景扫描一样把它折算进职位创造曲线 θ
+    theta = simulated_theta(theta, k_shift)
+    u_star = equilibrium_u(u, v, theta)
 
 col1, col2 = st.columns([3, 1])
-with col1:
+
+def build_fig1():
     fig1 = go.Figure()
     # 理想曲线
     fig1.add_trace(go.Scatter(x=u_base, y=v_base, name="理想高效市场", line=dict(color='#cbd5e1', dash='dot')))
     # 当前曲线
     fig1.add_trace(go.Scatter(x=u, y=v, name="当前市场状态", line=dict(color='#8b5cf6', width=5)))
+    # 职位创造曲线 v = θ·u 与均衡点
+    fig1.add_trace(go.Scatter(x=U_GRID, y=theta * U_GRID, name="职位创造 v = θ·u", line=dict(color='#f59e0b', dash='dash')))
+    fig1.add_trace(go.Scatter(x=[u_star], y=[theta * u_star], name="均衡点", mode="markers",
+                              marker=dict(color='#ef4444', size=12, symbol="x")))
     
     # 增加一个注释，当 AI 冲击很高时显示
     if ai_risk > 80:
@@ -129,12 +104,20 @@ with col1:
         margin=dict(l=20, r=20, t=20, b=20),
         yaxis=dict(range=[0, 30]) # 固定Y轴范围，让位移看起来更明显
     )
-    st.plotly_chart(fig1, use_container_width=True)
+    return fig1
+
+with col1:
+    with timer("macro.fig1.build"):
+        fig1 = cached_figure("macro.fig1", build_fig1, source=curve_source, policy=policy, **beveridge_params)
+    with timer("macro.fig1.chart"):
+        st.plotly_chart(fig1, use_container_width=True)
 
 with col2:
     st.markdown("##### 📊 诊断结果")
     st.markdown(f"<div class='metric-label'>AI 冲击指数</div><div class='metric-value' style='color:{'#ef4444' if ai_risk > 50 else '#7c3aed'}'>{ai_risk}%</div>", unsafe_allow_html=True)
     st.markdown("<br>", unsafe_allow_html=True)
+    st.metric("均衡失业率 u*", f"{u_star:.1f}%", help="贝弗里奇曲线与职位创造曲线的交点，与下方全景扫描中当前格点的取值同一口径 "
+              "(仿真模式下扫描用的劳动力规模较小，数值有少许抽样差异)")
     
     # 动态文案修正
     if ai_risk > 70:
@@ -149,6 +132,142 @@ with col2:
 
 st.markdown('</div>', unsafe_allow_html=True)
 
+# --- 模块：AI 冲击转型路径 (数百个情景的季度动态) ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">⏱️ AI 冲击转型路径 (季度动态)</div>', unsafe_allow_html=True)
+
+ANIMATION_PATHS = 100   # 动画中逐帧显示的情景点数，控制图表体积
+
+if st.toggle("时间路径模式：冲击之后失业与空缺如何逐季度演变", key="transition_mode",
+             help="围绕当前设定抽取数百个情景 (冲击强度、普及速度、培训周期等不确定)，一起积分失业与空缺的流量方程"):
+    c1, c2, c3 = st.columns(3)
+    policy_quarter = c1.slider("政策出台时间 (冲击后第几季度)", 0, 12, 2, key="policy_quarter")
+    reskill_lag = c2.slider("转岗培训周期 (季度)", 1, 8, 4, key="reskill_lag", help="技能重塑补贴出台后，第一批学员结业才开始见效")
+    n_paths = c3.select_slider("情景数", options=sorted({100, 200, 500, 1000, TRANSITION_PATHS}), value=TRANSITION_PATHS, key="transition_paths")
+
+    transition_params = dict(ai_risk=ai_risk, mismatch=mismatch, policy=policy, policy_quarter=policy_quarter,
+                             reskill_lag=reskill_lag, n_paths=n_paths)
+    with timer("macro.transition"):
+        paths = cached_result("macro.transition", lambda: sample_transitions(ai_risk, mismatch, policy, policy_quarter, reskill_lag, n_paths),
+                              **transition_params)
+    quarter = paths["quarter"]
+    policy_at = SHOCK_QUARTER + policy_quarter
+
+    def build_fan_fig(name, title, color):
+        q = paths[f"{name}_q"]
+        fig = go.Figure()
+        # 与群体模式相同：先画上沿，再用 fill='tonexty' 画下沿形成分位数带
+        fig.add_trace(go.Scatter(x=quarter, y=q[4], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=quarter, y=q[0], name='P10–P90', fill='tonexty', fillcolor=f'rgba({color}, 0.15)', line=dict(width=0)))
+        fig.add_trace(go.Scatter(x=quarter, y=q[3], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=quarter, y=q[1], name='P25–P75', fill='tonexty', fillcolor=f'rgba({color}, 0.3)', line=dict(width=0)))
+        fig.add_trace(go.Scatter(x=quarter, y=q[2], name='中位数', line=dict(color=f'rgb({color})', width=3)))
+        fig.add_vline(x=SHOCK_QUARTER, line_dash="dot", line_color="#ef4444", annotation_text="AI 冲击")
+        if policy:
+            fig.add_vline(x=policy_at, line_dash="dot", line_color="#10b981", annotation_text="政策出台", annotation_position="bottom right")
+        fig.update_layout(xaxis_title="季度", yaxis_title=title, template="plotly_white", height=350,
+                          margin=dict(l=20, r=20, t=20, b=20), legend=dict(orientation="h", y=-0.25))
+        return fig
+
+    def build_animation_fig():
+        # 贝弗里奇空间里的逐季度动画，由浏览器端播放，不占用服务器重跑
+        u_paths = paths["u"][:ANIMATION_PATHS].astype(np.float32)
+        v_paths = paths["v"][:ANIMATION_PATHS].astype(np.float32)
+        u_mid, v_mid = paths["u_q"][2].astype(np.float32), paths["v_q"][2].astype(np.float32)
+        pe, theta, k_shift = policy_levers(policy)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=U_GRID, y=beveridge_k(mismatch, 0, 0) / U_GRID, name="冲击前", line=dict(color='#cbd5e1', dash='dot')))
+        fig.add_trace(go.Scatter(x=U_GRID, y=(beveridge_k(mismatch, pe, ai_risk) + k_shift) / U_GRID, name="冲击与政策到位后",
+                                 line=dict(color='#8b5cf6', dash='dash')))
+        fig.add_trace(go.Scatter(x=u_mid[:1], y=v_mid[:1], name="中位数轨迹", mode="lines", line=dict(color='#1e3a8a', width=3)))
+        fig.add_trace(go.Scatter(x=u_paths[:, 0], y=v_paths[:, 0], name="各情景", mode="markers", marker=dict(color='rgba(239, 68, 68, 0.35)', size=6)))
+        fig.frames = [go.Frame(name=str(t), traces=[2, 3], data=[
+            go.Scatter(x=u_mid[:t + 1], y=v_mid[:t + 1]),
+            go.Scatter(x=u_paths[:, t], y=v_paths[:, t]),
+        ]) for t in quarter]
+        play = dict(label="▶ 播放", method="animate", args=[None, dict(frame=dict(duration=150, redraw=False), transition=dict(duration=0), fromcurrent=True)])
+        pause = dict(label="⏸ 暂停", method="animate", args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")])
+        fig.update_layout(
+            xaxis=dict(title="失业率 U (%)", range=[0, float(u_paths.max()) * 1.15]),
+            yaxis=dict(title="职位空缺率 V (%)", range=[0, float(v_paths.max()) * 1.15]),
+            template="plotly_white", height=450, margin=dict(l=20, r=20, t=20, b=20),
+            updatemenus=[dict(type="buttons", buttons=[play, pause], direction="left", x=0, y=-0.15, xanchor="left", yanchor="top")],
+            sliders=[dict(currentvalue=dict(prefix="季度 "), x=0.2, len=0.8, y=-0.1, steps=[
+                dict(label=str(t), method="animate", args=[[str(t)], dict(frame=dict(duration=0, redraw=False), mode="immediate")])
+                for t in quarter])],
+        )
+        return fig
+
+    f1, f2 = st.columns(2)
+    with f1:
+        with timer("macro.transition_fig.build"):
+            u_fan = cached_figure("macro.transition_u", lambda: build_fan_fig("u", "失业率 U (%)", "239, 68, 68"), **transition_params)
+        st.plotly_chart(u_fan, use_container_width=True)
+    with f2:
+        with timer("macro.transition_fig.build"):
+            v_fan = cached_figure("macro.transition_v", lambda: build_fan_fig("v", "职位空缺率 V (%)", "59, 130, 246"), **transition_params)
+        st.plotly_chart(v_fan, use_container_width=True)
+    with timer("macro.transition_fig.build"):
+        animation_fig = cached_figure("macro.transition_anim", build_animation_fig, **transition_params)
+    st.plotly_chart(animation_fig, use_container_width=True)
+
+    u_mid = paths["u_q"][2]
+    peak = int(np.argmax(u_mid))
+    m1, m2, m3 = st.columns(3)
+    m1.metric("失业率峰值 (中位数)", f"{u_mid[peak]:.1f}%", f"第 {max(peak - SHOCK_QUARTER, 0)} 季度", delta_color="off")
+    m2.metric(f"{quarter[-1] - SHOCK_QUARTER} 季度后 (中位数)", f"{u_mid[-1]:.1f}%", f"{u_mid[-1] - u_mid[0]:+.1f} 个百分点", delta_color="inverse")
+    m3.metric("P90 情景峰值", f"{paths['u_q'][4].max():.1f}%")
+    st.caption(f"{n_paths} 个情景一次批量积分 (季度流量方程，RK4)；阴影为各季度情景分布的 P10–P90 / P25–P75，"
+               "下图可点击播放，观察经济在贝弗里奇空间中从旧曲线移向新曲线的过程。")
+
+st.markdown('</div>', unsafe_allow_html=True)
+
+# --- 模块：政策全景扫描 (全部政策组合 × AI 冲击 × 错配度) ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">🗺️ 政策全景扫描 (均衡失业率)</div>', unsafe_allow_html=True)
+
+if st.toggle("一次性扫描全部 8 种政策组合", key="policy_sweep", help="均衡失业率 u* 为贝弗里奇曲线与职位创造曲线 v = θ·u 的交点"):
+    if curve_source == "随机匹配仿真 (总量模型)":
+        # 仿真扫描每个网格点都要跑一次仿真，网格取粗一些
+        sweep_params = dict(method="simulation", ai_risk=AI_RISK_GRID[::2], mismatch=MISMATCH_GRID[::2])
+    else:
+        sweep_params = dict(method="analytic", ai_risk=AI_RISK_GRID, mismatch=MISMATCH_GRID)
+    with st.spinner("正在扫描全部政策组合..."):
+        sweep = cached_result("macro.sweep", lambda: sweep_policies(**sweep_params), **sweep_params)
+
+    def build_sweep_fig():
+        short = {"最低工资调整": "最低工资", "技能重塑补贴(Reskilling)": "技能重塑", "失业救济金": "救济金"}
+        titles = [" + ".join(short[p] for p in combo) or "无干预" for combo in POLICY_COMBOS]
+        fig = make_subplots(rows=2, cols=4, subplot_titles=titles, shared_xaxes=True, shared_yaxes=True,
+                            horizontal_spacing=0.03, vertical_spacing=0.12)
+        for c, combo in enumerate(POLICY_COMBOS):
+            row, col = c // 4 + 1, c % 4 + 1
+            fig.add_trace(go.Heatmap(x=sweep_params["mismatch"], y=sweep_params["ai_risk"], z=sweep[c],
+                                     coloraxis="coloraxis", hovertemplate="错配度 %{x}<br>AI 冲击 %{y}%<br>u* = %{z:.1f}%<extra></extra>"),
+                          row=row, col=col)
+            # 标出当前侧边栏设定
+            current = set(combo) == set(policy)
+            fig.add_trace(go.Scatter(x=[mismatch], y=[ai_risk], mode="markers", showlegend=False, hoverinfo="skip",
+                                     marker=dict(symbol="x" if current else "circle-open", size=14 if current else 9,
+                                                 color="#ef4444" if current else "white", line=dict(width=2))),
+                          row=row, col=col)
+        fig.update_layout(coloraxis=dict(colorscale="Purples", colorbar=dict(title="u* (%)")),
+                          template="plotly_white", height=520, margin=dict(l=20, r=20, t=40, b=20))
+        fig.update_xaxes(title_text="技能错配度", row=2)
+        fig.update_yaxes(title_text="AI 冲击 (%)", col=1)
+        return fig
+
+    with timer("macro.sweep_fig.build"):
+        sweep_fig = cached_figure("macro.sweep_fig", build_sweep_fig, method=sweep_params["method"], policy=policy, current=(ai_risk, mismatch))
+    with timer("macro.sweep_fig.chart"):
+        st.plotly_chart(sweep_fig, use_container_width=True)
+    st.caption("红色 × 为当前政策组合与风险设定；颜色越深，均衡失业率越高。")
+    if sweep_params["method"] == "simulation":
+        st.caption("仿真模式：错配与技能重塑补贴在无 AI 冲击时即通过匹配效率起作用，方向与解析公式一致；"
+                   "错配度较高或 AI 冲击较强时，技能过时者的转岗滞后会叠加进来，失业率高于解析公式。")
+
+st.markdown('</div>', unsafe_allow_html=True)
+
 # --- 模块：政策组合报告 ---
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">📝 政策组合拳模拟报告</div>', unsafe_allow_html=True)
@@ -164,40 +283,28 @@ else:
             st.write(f"- **{p}**：提供了社会安全网，但过高可能增加“保留工资”，降低就业意愿。")
 st.markdown('</div>', unsafe_allow_html=True)
 
+# --- 模块：多情景对比 (固定多组参数，曲线叠加、指标并列) ---
+st.markdown('<div class="card">', unsafe_allow_html=True)
+st.markdown('<div class="card-header">🧪 多情景对比工作台</div>', unsafe_allow_html=True)
+scenario_workspace("macro")
+st.markdown('</div>', unsafe_allow_html=True)
+
 # ==========================================
 # 4. 实验报告生成模块
 # ==========================================
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown('<div class="card-header">📝 实验报告生成</div>', unsafe_allow_html=True)
 
-report_text = f"""
-# 宏观政策仿真实验报告
-**实验时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**学生姓名**: ___________
-
-## 一、 宏观风险监测
-- **AI 替代冲击**: {ai_risk}%
-- **技能错配指数**: {mismatch}
-
-## 二、 实验结果分析
-### 1. 结构性失业诊断
-本次实验模拟了 **{ai_risk}%** 的 AI 技术替代冲击。
-{ '在极端的 AI 冲击下，贝弗里奇曲线剧烈向右上方移动，表明旧技能劳动者被大规模淘汰，而新岗位招不到人，市场匹配效率严重下降。' if ai_risk > 70 else 'AI 冲击尚在可控范围内，市场通过自然调节维持了相对平衡。'}
-
-### 2. 政策干预效果
-本次实验采用了以下政策组合：{', '.join(policy) if policy else '无'}。
-{ '技能重塑补贴有效促进了劳动力的技能升级，使贝弗里奇曲线向原点回归，缓解了 AI 带来的结构性冲击。' if '技能重塑补贴(Reskilling)' in policy else '缺乏针对性的培训政策，导致结构性错配难以在短期内自动修复。'}
-
-## 三、 实验结论
-本次仿真表明，面对技术冲击引发的结构性失业，单纯的需求侧刺激（如提高工资）效果有限，必须配合供给侧的技能重塑政策。
-"""
-
-st.text_area("报告预览 (Markdown)", report_text, height=200)
-st.download_button(
-    label="📥 下载实验报告 (.md)",
-    data=report_text,
-    file_name=f"Macro_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md",
-    mime="text/markdown",
-    type="primary"
-)
+# 正文只在展开预览 / 点击下载时生成，拖动滑块的重跑不再构建和发送报告
+report_widgets("macro", dict(ai_risk=ai_risk, mismatch=mismatch, policy=policy), f"Macro_Lab_Report_{datetime.now().strftime('%Y%m%d')}.md")
 st.markdown('</div>', unsafe_allow_html=True)
+
+# 本次重跑中变化的控件写入操作日志 (后台线程批量落盘，不阻塞页面)
+track_widgets("macro", ("ai_risk", "mismatch", "policy", "curve_source", "transition_mode", "policy_quarter", "reskill_lag",
+                         "transition_paths", "policy_sweep"))
+
+# 页面已发送完毕，在后台为本进程预热引擎、查找表与 Plotly (每个进程只执行一次)
+prewarm()
+
+# 讲师调试面板 (地址栏加 ?debug=<口令> 时显示)
+render_debug_panel()
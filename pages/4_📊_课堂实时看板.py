@@ -0,0 +1,94 @@
+import streamlit as st
+
+from lmdt.classroom import ACTIVE_TIMEOUT, CLASSROOM, REFRESH_INTERVAL
+from lmdt.instructor import is_instructor, render_debug_panel
+from lmdt.metrics import timer
+from lmdt.reports import EXPORT_DIR, export_class_reports, export_file_name, export_route_mounted, export_url
+
+# ==========================================
+# 1. 页面配置 (讲师专用)
+# ==========================================
+st.set_page_config(page_title="课堂实时看板", page_icon="📊", layout="wide")
+
+if not is_instructor():
+    st.warning("该页面仅供讲师使用。")
+    st.stop()
+
+st.title("📊 课堂实时看板")
+st.caption(f"每 {REFRESH_INTERVAL:g} 秒自动刷新 · 仅统计最近 {ACTIVE_TIMEOUT / 60:.0f} 分钟内有操作的学生")
+
+PAGE_NAMES = {"micro": "个体职业实验室", "market": "企业市场实验室", "macro": "宏观政策实验室"}
+
+
+def histogram(field, index=None, bin_width=None, label=None):
+    """从课堂汇总读取某字段的人数分布 (只涉及不同取值的个数，与在线人数无关)。"""
+    import pandas as pd  # 只有讲师会走到这里，学生误入本页时不加载 pandas
+
+    counts = CLASSROOM.counts(field)
+    if label is not None:
+        counts = {label(value): n for value, n in counts.items()}
+    counts = pd.Series(counts, dtype=int)
+    if bin_width:
+        counts = counts.groupby((counts.index.astype(float) // bin_width * bin_width).astype(int)).sum()
+    counts = counts.sort_index()
+    return counts if index is None else counts.reindex(index, fill_value=0)
+
+
+# ==========================================
+# 2. 定时刷新的看板 (只重跑本片段，只发送计数)
+# ==========================================
+@st.fragment(run_every=REFRESH_INTERVAL)
+def live_panel():
+    with timer("classroom.refresh"):
+        pages = CLASSROOM.counts("page")
+        cols = st.columns(4)
+        cols[0].metric("在线学生", CLASSROOM.active_sessions())
+        for col, (page, name) in zip(cols[1:], PAGE_NAMES.items()):
+            col.metric(name, pages.get(page, 0))
+
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("##### 🎓 受教育年限选择")
+            st.bar_chart(histogram("micro.edu", index=range(9, 23)), height=260)
+            worth = CLASSROOM.counts("micro.worth_migrating")
+            total = sum(worth.values())
+            st.metric("迁移决策为「值得迁移」的比例", f"{worth.get(True, 0) / total:.0%}" if total else "—",
+                      help=f"共 {total} 名学生完成迁移决策模块")
+            st.markdown("##### 💰 薪酬制度选择")
+            st.bar_chart(histogram("market.pay_mode"), height=220, horizontal=True)
+        with c2:
+            st.markdown("##### 🤖 AI 替代冲击设定 (%)")
+            st.bar_chart(histogram("macro.ai_risk", index=range(0, 101, 10), bin_width=10), height=260)
+            st.markdown("##### 🏛️ 政策组合")
+            policies = histogram("macro.policy", label=lambda combo: " + ".join(combo) or "无干预")
+            st.bar_chart(policies, height=260, horizontal=True)
+
+
+live_panel()
+
+if st.button("清空课堂汇总"):
+    CLASSROOM.reset()
+
+# ==========================================
+# 3. 批量导出实验报告
+# ==========================================
+st.divider()
+st.markdown("##### 📦 批量导出全班实验报告")
+st.caption("按操作日志中每位学生最后一次的参数，在多个进程中并行生成三个实验室的报告 (含附图)，打包为 ZIP。")
+if st.button("生成报告压缩包", type="primary"):
+    with st.spinner("正在生成全班报告..."):
+        path, n_reports = export_class_reports()
+    st.session_state["_export_path"] = (path.name, n_reports)
+if "_export_path" in st.session_state:
+    name, n_reports = st.session_state["_export_path"]
+    if not export_route_mounted():
+        st.warning("下载路由未挂载：请以 `streamlit run streamlit_app.py` 启动服务器后再下载。")
+    elif (EXPORT_DIR / name).is_file():
+        # 压缩包不在静态目录中，也不经过内存：链接指向一次性路由，按块从磁盘发送，发送后即删除
+        st.link_button(f"📥 下载全班报告 ({n_reports} 份) · {export_file_name(name)}", export_url(name), type="primary")
+        st.caption("链接只能使用一次，下载后压缩包即从服务器删除。")
+    else:
+        del st.session_state["_export_path"]
+
+# 讲师调试面板 (地址栏加 ?debug=<口令> 时显示)
+render_debug_panel()
@@ -0,0 +1,9 @@
+import streamlit as st
+
+from lmdt.reports import export_routes
+
+# ==========================================
+# 服务器入口:  streamlit run streamlit_app.py
+# ==========================================
+# 门户与 pages/ 照常运行，另外挂载讲师导出压缩包的一次性下载路由 (按块从磁盘发送，发送后删除)。
+app = st.App("🏠_综合门户首页.py", routes=export_routes())
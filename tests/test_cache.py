@@ -0,0 +1,76 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from lmdt.cache import RESULTS, LRUCache, cached_batch, cached_result, make_key, normalize
+
+
+def test_normalize_ignores_multiselect_order_and_float_noise():
+    assert normalize(["b", "a"]) == normalize(("a", "b")) == normalize({"a", "b"})
+    assert normalize(0.1 + 0.2) == normalize(0.3)
+    assert normalize(3.0) == normalize(np.int64(3)) == 3
+    assert make_key("ns", a=1, b=[2, 1]) != make_key("ns", a=1, b=[1, 2])   # 数值序列保持顺序
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 0)     # 命中，a 变为最近使用
+    cache.get_or_compute("c", lambda: 3)     # 淘汰 b
+    assert "a" in cache and "c" in cache and "b" not in cache
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+
+
+def test_concurrent_callers_compute_once():
+    cache = LRUCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [42] * 8 and len(calls) == 1
+
+
+def test_cached_results_are_read_only_all_the_way_down():
+    RESULTS.clear()
+    value = cached_result("test.freeze", lambda: {"a": np.arange(3.0), "nested": {"b": [np.ones(2)]}}, x=1)
+    assert cached_result("test.freeze", lambda: None, x=1) is value
+    with pytest.raises(TypeError):
+        value["a"] = 0
+    with pytest.raises(TypeError):
+        value["nested"]["c"] = 0
+    with pytest.raises(ValueError):
+        value["a"][0] = 1
+    assert isinstance(value["nested"]["b"], tuple)
+    with pytest.raises(ValueError):
+        value["nested"]["b"][0][0] = 1
+    assert dict(value)["a"] is value["a"]   # 需要修改时先复制外层
+
+
+def test_cached_batch_only_computes_missing_rows():
+    RESULTS.clear()
+    seen = []
+
+    def compute(x):
+        seen.append(list(x))
+        return {"y": np.asarray(x, dtype=float) * 2}
+
+    first = cached_batch("test.batch", compute, [{"x": 1}, {"x": 2}])
+    second = cached_batch("test.batch", compute, [{"x": 2}, {"x": 3}, {"x": 1}])
+    assert seen == [[1, 2], [3]]
+    assert [float(r["y"]) for r in second] == [4.0, 6.0, 2.0]
+    assert second[2] is first[0]
+    with pytest.raises(TypeError):
+        second[0]["y"] = 0
@@ -0,0 +1,47 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from lmdt.charts import compact_figure, lttb
+
+
+def test_lttb_keeps_endpoints_and_one_point_per_bucket():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 100, 10_000))
+    y = np.cumsum(rng.normal(size=10_000))
+    keep = lttb(x, y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    edges = np.linspace(1, len(x) - 1, 499).astype(np.int64)
+    np.testing.assert_array_equal(np.searchsorted(edges, keep[1:-1], side="right") - 1, np.arange(498))
+
+
+def test_lttb_keeps_isolated_peaks():
+    x = np.arange(5000.0)
+    y = np.zeros(5000)
+    y[[1234, 3000]] = [10.0, -7.0]
+    keep = lttb(x, y, 50)
+    assert 1234 in keep and 3000 in keep
+
+
+def test_lttb_short_series_is_untouched():
+    np.testing.assert_array_equal(lttb([0, 1, 2], [3, 1, 2], 10), [0, 1, 2])
+
+
+def test_compact_figure_downsamples_shared_x_together():
+    x = np.linspace(0, 10, 20_000)
+    fig = go.Figure([go.Scatter(x=x, y=np.sin(x), customdata=np.arange(20_000)),
+                     go.Scatter(x=x, y=np.cos(3 * x)),
+                     go.Scatter(x=[0.0, 1.0], y=[1.0, 2.0])], layout=dict(template="plotly_white"))
+    compact_figure(fig, uirevision="ns", max_points=300)
+    upper, lower, short = fig.data
+    # 两条共用 x 的曲线取选中点的并集，点位仍一一对齐
+    assert 300 <= len(upper.x) <= 600
+    np.testing.assert_array_equal(upper.x, lower.x)
+    np.testing.assert_allclose(upper.y, np.sin(upper.x), atol=1e-6)
+    np.testing.assert_allclose(x[upper.customdata], upper.x, atol=1e-6)
+    assert upper.x.dtype == np.float32 and upper.y.dtype == np.float32
+    assert len(short.x) == 2
+    assert fig.layout.uirevision == "ns"
+    # 模板只保留本图用到的图形类型
+    assert set(fig.layout.template.to_plotly_json()["data"]) == {"scatter"}
@@ -0,0 +1,30 @@
+from lmdt.classroom import ClassAggregates
+
+
+def test_counts_follow_current_values():
+    agg = ClassAggregates(timeout=100)
+    agg.update("s1", "micro", "edu", 16, now=0)
+    agg.update("s2", "micro", "edu", 16, now=1)
+    agg.update("s1", "micro", "edu", 18, now=2)     # 改变取值：旧取值 -1，新取值 +1
+    assert agg.counts("micro.edu", now=3) == {16: 1, 18: 1}
+    agg.update("s2", "macro", "ai_risk", 30, now=4)
+    assert agg.counts("page", now=5) == {"micro": 1, "macro": 1}
+    assert agg.active_sessions(now=5) == 2
+
+
+def test_multiselect_order_does_not_matter():
+    agg = ClassAggregates(timeout=100)
+    agg.update("s1", "macro", "policy", ["b", "a"], now=0)
+    agg.update("s2", "macro", "policy", ["a", "b"], now=0)
+    assert agg.counts("macro.policy", now=1) == {("a", "b"): 2}
+
+
+def test_idle_sessions_expire_with_their_counts():
+    agg = ClassAggregates(timeout=10)
+    agg.update("s1", "micro", "edu", 16, now=0)
+    agg.update("s2", "micro", "edu", 12, now=5)
+    agg.update("s1", "micro", "disc", 15, now=8)    # s1 仍然活跃
+    assert agg.counts("micro.edu", now=14) == {16: 1, 12: 1}
+    assert agg.counts("micro.edu", now=16) == {16: 1}
+    assert agg.counts("micro.edu", now=30) == {}
+    assert agg.active_sessions(now=30) == 0
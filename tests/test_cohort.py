@@ -0,0 +1,40 @@
+import numpy as np
+
+from lmdt.engine.cohort import CohortAccumulator, simulate_cohort
+
+
+def test_quantiles_match_sample_within_bin_width():
+    rng = np.random.default_rng(0)
+    exp = rng.uniform(0, 40, 400_000)
+    wage = np.exp(rng.normal(9 + 0.02 * exp, 0.4))
+    acc = CohortAccumulator().update(exp, wage)
+    q = acc.quantiles((0.1, 0.5, 0.9))
+    for i in (0, 20, 39):
+        sel = (exp >= i) & (exp < i + 1)
+        # ln(工资) 箱宽 0.01，箱内线性插值后误差约 1%
+        np.testing.assert_allclose(q[i], np.quantile(wage[sel], (0.1, 0.5, 0.9)), rtol=0.01)
+    np.testing.assert_allclose(acc.mean()[20], wage[(exp >= 20) & (exp < 21)].mean(), rtol=1e-12)
+
+
+def test_merge_equals_single_update():
+    rng = np.random.default_rng(1)
+    exp, wage = rng.uniform(0, 40, 10_000), np.exp(rng.normal(9, 0.5, 10_000))
+    whole = CohortAccumulator().update(exp, wage)
+    parts = CohortAccumulator().update(exp[:3000], wage[:3000]).merge(CohortAccumulator().update(exp[3000:], wage[3000:]))
+    np.testing.assert_array_equal(whole.counts, parts.counts)
+    np.testing.assert_allclose(whole.wage_sum, parts.wage_sum)
+
+
+def test_cohort_counts_everyone_and_workers_agree():
+    serial = simulate_cohort(120_000, 16, 5, 3, 10, chunk_size=50_000, workers=1)
+    parallel = simulate_cohort(120_000, 16, 5, 3, 10, chunk_size=50_000, workers=2)
+    assert serial.n == 120_000
+    np.testing.assert_array_equal(serial.counts, parallel.counts)
+    np.testing.assert_allclose(serial.wage_sum, parallel.wage_sum)
+
+
+def test_discrimination_scales_affected_wages():
+    # 全部受歧视时，同一种子下每人工资都乘以 (1 - disc)
+    fair = simulate_cohort(50_000, 16, 5, 3, 0, disc_share=1.0)
+    unfair = simulate_cohort(50_000, 16, 5, 3, 20, disc_share=1.0)
+    np.testing.assert_allclose(unfair.mean(), 0.8 * fair.mean(), rtol=1e-12)
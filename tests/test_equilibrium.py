@@ -0,0 +1,45 @@
+import numpy as np
+
+from lmdt.engine import ces_output, minimum_wage_statics, sample_markets, solve_equilibrium
+from lmdt.engine.equilibrium import market_demand, market_supply
+from lmdt.engine.production import MAX_LABOR_RATIO
+
+
+def _markets():
+    return sample_markets(2000, capital=100.0, prod_price=1.0, tech_type="中性技术", sigma=1.2, seed=1)
+
+
+def test_equilibrium_clears_markets():
+    markets = _markets()
+    wage, employment = solve_equilibrium(markets)
+    demand = market_demand(wage, markets)
+    np.testing.assert_allclose(demand, employment, rtol=1e-6)
+    np.testing.assert_allclose(market_supply(wage, markets), employment, rtol=1e-12)
+
+
+def test_equilibrium_residual_price_times_mpl_equals_wage():
+    # 出清工资下每个市场的边际产品价值等于工资 (CES 规模报酬不变，可按市场加总资本)
+    markets = _markets()
+    wage, employment = solve_equilibrium(markets)
+    inner = employment < 0.999 * MAX_LABOR_RATIO * markets["capital"]
+    assert inner.mean() > 0.9
+    args = [markets[k][inner] for k in ("capital", "sigma", "bias", "tfp")]
+    labor = employment[inner]
+    h = 1e-6 * labor
+
+    def output(L):
+        capital, sigma, bias, tfp = args
+        return ces_output(L, capital, sigma, bias, tfp)
+
+    mpl = (output(labor + h) - output(labor - h)) / (2 * h)
+    np.testing.assert_allclose(markets["prod_price"][inner] * mpl, wage[inner], rtol=1e-5)
+
+
+def test_minimum_wage_only_binds_above_equilibrium():
+    markets = _markets()
+    equilibrium = solve_equilibrium(markets)
+    floor = float(np.median(equilibrium[0]))
+    statics = minimum_wage_statics(markets, floor, equilibrium)
+    np.testing.assert_array_equal(statics["binding"], equilibrium[0] < floor)
+    assert np.all(statics["floor_employment"][statics["binding"]] <= statics["employment"][statics["binding"]] * (1 + 1e-9))
+    np.testing.assert_array_equal(statics["unemployment"][~statics["binding"]], 0)
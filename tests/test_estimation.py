@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from lmdt.engine.estimation import REGRESSORS, NormalEquations, data_file, design_matrix, estimate_mincer, write_sample
+from lmdt.engine.mincer import DEFAULT_COEF
+
+
+def _data(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = design_matrix(rng.integers(9, 22, n), rng.uniform(0, 40, n), rng.integers(0, 11, n), rng.integers(0, 11, n))
+    y = X @ np.array([DEFAULT_COEF[k] for k in REGRESSORS]) + rng.normal(0, 0.3, n)
+    return X, y
+
+
+def test_normal_equations_match_lstsq():
+    X, y = _data()
+    acc = NormalEquations()
+    for part in np.array_split(np.arange(len(y)), 7):
+        acc.update(X[part], y[part])
+    beta, se, r2 = acc.solve()
+    ref, ssr = np.linalg.lstsq(X, y, rcond=None)[:2]
+    np.testing.assert_allclose(beta, ref, rtol=1e-6, atol=1e-9)
+    sigma2 = ssr[0] / (len(y) - X.shape[1])
+    np.testing.assert_allclose(se, np.sqrt(np.diag(np.linalg.inv(X.T @ X)) * sigma2), rtol=1e-6)
+    assert r2 == pytest.approx(1 - ssr[0] / ((y - y.mean()) ** 2).sum(), rel=1e-9)
+
+
+def test_merge_and_inactive_columns():
+    X, y = _data()
+    whole = NormalEquations().update(X, y)
+    merged = NormalEquations().update(X[:2000], y[:2000]).merge(NormalEquations().update(X[2000:], y[2000:]))
+    np.testing.assert_allclose(merged.solve()[0], whole.solve()[0], rtol=1e-9)
+    # 未参与回归的列系数为 0、标准误为 NaN，其余列等于去掉这些列后的 OLS
+    active = np.array([True, True, False, False, True, True])
+    beta, se, _ = whole.solve(active)
+    assert np.all(beta[~active] == 0) and np.all(np.isnan(se[~active]))
+    np.testing.assert_allclose(beta[active], np.linalg.lstsq(X[:, active], y, rcond=None)[0], rtol=1e-6)
+
+
+def test_estimate_mincer_streams_csv(tmp_path):
+    X, y = _data(n=120_000, seed=1)
+    path = tmp_path / "survey.csv"
+    rows = ["wage,edu,exp,gen_t,spec_t"] + [f"{w:.6f},{e:g},{x:.6f},{g:g},{s:g}" for w, e, x, g, s in
+                                         zip(np.exp(y), X[:, 1], X[:, 4], X[:, 2] / X[:, 1], X[:, 3] / X[:, 1])]
+    rows += ["0,12,5,0,0", "-3,12,5,0,0", ",12,5,0,0"]   # 非正与缺失工资的行被丢弃
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    fit = estimate_mincer(path, chunk_rows=25_000)
+    assert fit["n"] == len(y)
+    np.testing.assert_allclose([fit["coef"][k] for k in REGRESSORS], np.linalg.lstsq(X, y, rcond=None)[0], rtol=1e-4, atol=1e-6)
+    for k in REGRESSORS:
+        assert fit["coef"][k] == pytest.approx(DEFAULT_COEF[k], abs=5 * fit["se"][k])
+
+
+def test_sample_file_has_the_survey_columns(tmp_path):
+    path = write_sample(tmp_path / "survey.csv", n=1000, chunk_rows=400)
+    fit = estimate_mincer(path)
+    assert fit["n"] == 1000
+    assert fit["columns"] == ["wage", "edu", "exp", "gen_t", "spec_t"]
+
+
+def test_data_file_stays_inside_data_dir(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "a.csv").write_text("wage,edu,exp\n", encoding="utf-8")
+    (root / "notes.txt").write_text("", encoding="utf-8")
+    (tmp_path / "outside.csv").write_text("", encoding="utf-8")
+    assert data_file("a.csv", root) == (root / "a.csv").resolve()
+    assert data_file("../outside.csv", root) is None
+    assert data_file(str(tmp_path / "outside.csv"), root) is None
+    assert data_file("notes.txt", root) is None
+    assert data_file("missing.csv", root) is None
@@ -0,0 +1,42 @@
+import json
+import sqlite3
+import time
+
+from lmdt.events import EventLog
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT session, page, widget, value FROM events ORDER BY id").fetchall()
+
+
+def test_background_writer_batches_events(tmp_path):
+    log = EventLog(tmp_path / "events.sqlite3", flush_interval=0.05, batch_size=100)
+    for i in range(250):
+        log.log("s1", "micro", "edu", i)
+    deadline = time.monotonic() + 5
+    while log.written < 250 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    log.close()
+    rows = _rows(log.path)
+    assert log.written == 250 and log.dropped == 0
+    assert [json.loads(r[3]) for r in rows] == list(range(250))   # 按入队顺序写入
+
+
+def test_close_flushes_pending_events(tmp_path):
+    log = EventLog(tmp_path / "events.sqlite3", flush_interval=60)
+    log.log("s1", "macro", "policy", ["失业救济金", "最低工资调整"])
+    log.close()
+    assert _rows(log.path) == [("s1", "macro", "policy", '["失业救济金", "最低工资调整"]')]
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    log = EventLog(tmp_path / "events.sqlite3", flush_interval=60, maxsize=10)
+    log._ensure_thread = lambda: None      # 不启动写线程，队列只进不出
+    t0 = time.perf_counter()
+    for i in range(25):
+        log.log("s1", "micro", "edu", i)
+    assert time.perf_counter() - t0 < 0.5
+    assert log.pending() == 10 and log.dropped == 15
+    log.flush()
+    assert len(_rows(log.path)) == 10
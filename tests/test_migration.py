@@ -0,0 +1,44 @@
+import numpy as np
+
+from lmdt.engine import calc_breakeven, calc_migration_npv, migration_surface
+
+
+def _cumsum_reference(w_diff, cost_move, cost_psych, rate, years):
+    _, cum = calc_migration_npv(0, w_diff, cost_move, cost_psych, years=years, rate=rate)
+    return calc_breakeven(cum), cum[..., -1]
+
+
+def test_surface_matches_cumsum_on_random_grid():
+    # 闭式解与逐年累加的结果逐点一致，贴现率包含 0
+    rng = np.random.default_rng(0)
+    n = 20_000
+    w_diff = rng.uniform(-500, 5000, n)
+    cost_move = rng.uniform(0, 100_000, n)
+    cost_psych = rng.uniform(0, 20_000, n)
+    rate = rng.choice(np.r_[0.0, np.round(np.arange(0.01, 0.105, 0.01), 2)], n)
+    breakeven, npv = migration_surface(w_diff, cost_move, cost_psych, rate=rate, years=20)
+    ref_breakeven, ref_npv = _cumsum_reference(w_diff, cost_move, cost_psych, rate, 20)
+    np.testing.assert_array_equal(breakeven, ref_breakeven)
+    np.testing.assert_allclose(npv, ref_npv, rtol=1e-9, atol=1e-6)
+
+
+def test_zero_rate_uses_simple_sum():
+    breakeven, npv = migration_surface(1000, 24_000, 0, rate=0.0, years=20)
+    assert npv == 12_000 * 20 - 24_000
+    assert breakeven == 3
+
+
+def test_exact_zero_npv_is_not_breakeven():
+    # 第 3 年累计净现值恰为 0 时不算回本，与 calc_breakeven 的 "> 0" 一致
+    for rate in (0.0, 0.05):
+        b = 12_000
+        cost_move = b * 3 * (1 + rate) if rate == 0 else b * (1 - (1 + rate) ** -3) / rate * (1 + rate)
+        breakeven, _ = migration_surface(1000, cost_move, 0, rate=rate, years=20)
+        ref_breakeven, _ = _cumsum_reference(1000, cost_move, 0, rate, 20)
+        assert breakeven == ref_breakeven == 4
+
+
+def test_unreachable_returns_zero():
+    # 每年净收益非正或到期仍未回本
+    breakeven, _ = migration_surface([-100, 0, 100], [1000, 1000, 1e9], 0, rate=[0.05, 0.0, 0.05], years=20)
+    np.testing.assert_array_equal(breakeven, [0, 0, 0])
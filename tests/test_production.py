@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from lmdt.engine import ces_labor_demand, ces_output, labor_share
+from lmdt.engine.production import MAX_LABOR_RATIO, TFP, labor_weight
+
+WAGES = np.linspace(20, 120, 11)
+
+
+def _mpl(labor, capital, sigma, bias=1.0, tfp=TFP):
+    # 中心差分求劳动的边际产品
+    h = 1e-6 * np.maximum(labor, 1.0)
+    return (ces_output(labor + h, capital, sigma, bias, tfp) - ces_output(labor - h, capital, sigma, bias, tfp)) / (2 * h)
+
+
+@pytest.mark.parametrize("bias", [0.6, 1.0, 1.6])
+def test_output_tends_to_cobb_douglas(bias):
+    # σ → 1 时 CES 产出收敛到 Cobb-Douglas (σ = 1 走闭式分支)
+    labor, capital = np.array([5.0, 40.0, 300.0]), np.array([100.0, 100.0, 20.0])
+    cd = ces_output(labor, capital, 1.0, bias)
+    for eps in (1e-3, 1e-4):
+        for sigma in (1 - eps, 1 + eps):
+            np.testing.assert_allclose(ces_output(labor, capital, sigma, bias), cd, rtol=20 * eps)
+
+
+def test_labor_demand_tends_to_cobb_douglas():
+    _, cd = ces_labor_demand(100.0, 1.0, 1.0, w=WAGES)
+    for sigma in (1 - 1e-4, 1 + 1e-4):
+        _, ces = ces_labor_demand(100.0, 1.0, sigma, w=WAGES)
+        np.testing.assert_allclose(ces, cd, rtol=1e-2)
+
+
+def test_labor_share_tends_to_cobb_douglas():
+    # Cobb-Douglas 的劳动份额恒为 a
+    a = labor_weight(1.0)
+    x = np.array([0.1, 1.0, 10.0])
+    np.testing.assert_allclose(labor_share(x, 1.0, a), a)
+    np.testing.assert_allclose(labor_share(x, 1 + 1e-5, a), a, rtol=1e-4)
+
+
+@pytest.mark.parametrize("sigma", [0.5, 1.0, 1.5])
+def test_demand_satisfies_first_order_condition(sigma):
+    # 未触及产能上限时，需求满足 P·MPL = w
+    capital, price = 100.0, 1.2
+    w, labor = ces_labor_demand(capital, price, sigma)
+    inner = (labor > 0) & (labor < MAX_LABOR_RATIO * capital)
+    assert inner.sum() >= 10
+    np.testing.assert_allclose(price * _mpl(labor[inner], capital, sigma), w[inner], rtol=1e-5)
@@ -0,0 +1,87 @@
+import asyncio
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from lmdt import reports
+from lmdt.cache import RESULTS, make_key
+from lmdt.reports import (
+    DEFAULTS, LABS, PLOTLY_JS, TEMPLATES, ReportTemplate, build_report, evaluate_micro, export_class_reports,
+    export_routes, report_body,
+)
+
+
+def test_template_matches_str_format():
+    text = "AI {ai_risk}% / u = {u:.1f}%{{不是字段}}\n{note}"
+    context = {"ai_risk": 30, "u": 9.6123, "note": "无"}
+    assert ReportTemplate(text).render(context) == text.format(**context)
+
+
+@pytest.mark.parametrize("text", ["{a.b}", "{a[0]}", "{a!r}"])
+def test_template_rejects_non_simple_fields(text):
+    with pytest.raises(ValueError):
+        ReportTemplate(text)
+
+
+def test_body_is_cached_per_parameters_and_header_is_fresh():
+    values = dict(DEFAULTS["macro"], ai_risk=85, policy=["技能重塑补贴(Reskilling)"])
+    first = build_report("macro", values, now=0)
+    assert make_key("macro.report", **values) in RESULTS
+    body = report_body("macro", values)
+    assert report_body("macro", dict(values, policy=list(values["policy"]))) is body   # 命中缓存，不重新渲染
+    assert first.endswith(body) and "85%" in body and "技能重塑补贴(Reskilling)" in body
+    later = build_report("macro", values, now=86_400)
+    assert later != first and later.endswith(body)
+
+
+def test_conditional_paragraphs_follow_values():
+    assert set(TEMPLATES) == set(DEFAULTS)
+    values, _ = evaluate_micro(DEFAULTS["micro"])
+    assert "15%** 的歧视系数" in report_body("micro", values)
+    values, _ = evaluate_micro(dict(DEFAULTS["micro"], disc=0))
+    assert "市场环境公平" in report_body("micro", values)
+    body = report_body("macro", DEFAULTS["macro"])
+    assert "政策组合：无。" in body and "缺乏针对性的培训政策" in body
+
+
+def _export(tmp_path):
+    sessions = {"s1": {"macro": (dict(DEFAULTS["macro"], ai_risk=85), 0.0)},
+                "s2": {"macro": (dict(DEFAULTS["macro"]), 0.0)}}
+    return export_class_reports(sessions, out_dir=tmp_path, workers=1, image=False)
+
+
+def test_export_writes_one_report_per_session_and_shared_plotly(tmp_path):
+    path, n = _export(tmp_path)
+    assert n == 2 and path.parent == tmp_path and not list(tmp_path.glob("*.tmp"))
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        report = zf.read(f"s1/{LABS['macro']}.md").decode("utf-8")
+    assert PLOTLY_JS in names and f"s2/{LABS['macro']}.md" in names
+    assert "85%" in report and "macro_贝弗里奇曲线.html" in report
+
+
+def test_download_route_serves_each_export_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, "_route_mounted", False)
+    path, _ = _export(tmp_path)
+    route, = export_routes(tmp_path)
+    assert reports.export_route_mounted()
+
+    def get(name):
+        return asyncio.run(route.endpoint(SimpleNamespace(path_params={"name": name})))
+
+    resp = get(path.name)
+    assert resp.status_code == 200 and resp.media_type == "application/zip"
+    assert path.name.rsplit("_", 1)[0] + ".zip" in resp.headers["content-disposition"]   # 不暴露随机后缀
+    assert not path.exists()
+    assert get(path.name).status_code == 404   # 一次性链接
+    asyncio.run(resp.background())
+    assert not list(tmp_path.iterdir())        # 发送完即删除
+
+
+@pytest.mark.parametrize("name", ["../reports.py", "class_reports_x.zip", "class_reports_20260101_000000_abc.zip.sending"])
+def test_download_route_rejects_other_names(tmp_path, monkeypatch, name):
+    monkeypatch.setattr(reports, "_route_mounted", False)
+    route, = export_routes(tmp_path)
+    resp = asyncio.run(route.endpoint(SimpleNamespace(path_params={"name": name})))
+    assert resp.status_code == 404
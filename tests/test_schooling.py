@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from lmdt.engine import calc_mincer, optimal_schooling, schooling_surface
+from lmdt.engine.schooling import COMPULSORY_EDU, EDU_AXIS, HORIZON, RETURN_DECAY
+
+
+def _lifetime(edu, rate, gen_t, spec_t, disc, tuition):
+    # 逐年累加：在读年份付学费，之后按明瑟工资工作到退休
+    earnings = tuition_pv = 0.0
+    for t in range(HORIZON):
+        d = (1 + rate) ** -t
+        if t < edu - COMPULSORY_EDU:
+            tuition_pv += tuition * d
+        else:
+            earnings += 12 * calc_mincer(edu, t - (edu - COMPULSORY_EDU), gen_t, spec_t, disc)[1] * d
+    return earnings, tuition_pv
+
+
+def test_surface_matches_year_by_year_sum():
+    surface = schooling_surface(edu=[9, 12, 16, 22], rate=[0.03, 0.08], gen_t=[0, 7], spec_t=[2], disc=10, tuition=8000)
+    for i, edu in enumerate((9, 12, 16, 22)):
+        for j, rate in enumerate((0.03, 0.08)):
+            for g, gen_t in enumerate((0, 7)):
+                earnings, tuition_pv = _lifetime(edu, rate, gen_t, 2, 10, 8000)
+                assert surface["earnings"][i, j, g, 0] == pytest.approx(earnings, rel=1e-10)
+                assert surface["net"][i, j, g, 0] == pytest.approx(earnings - tuition_pv, rel=1e-10)
+
+
+def test_constant_return_gives_corner_solutions():
+    # 默认不递减：与明瑟曲线一致，最优解要么 "不读"，要么接近 "读到底"
+    # (只有缩短的工作年限会让最后几年不再划算)
+    assert RETURN_DECAY == 0
+    best = optimal_schooling()
+    assert np.all((best["edu"] == EDU_AXIS[0]) | (best["edu"] >= EDU_AXIS[-1] - 3))
+    np.testing.assert_array_equal(best["edu"], optimal_schooling(decay=0)["edu"])
+
+
+def test_decaying_return_gives_interior_optimum_falling_with_rate():
+    best = optimal_schooling(gen_t=[5], spec_t=[3], decay=0.005)["edu"][:, 0, 0]
+    assert np.all(np.diff(best) <= 0)
+    assert ((best > EDU_AXIS[0]) & (best < EDU_AXIS[-1])).any()
+
+
+def test_edu_outside_horizon_is_rejected():
+    with pytest.raises(ValueError):
+        schooling_surface(edu=[8])
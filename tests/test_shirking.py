@@ -0,0 +1,37 @@
+import numpy as np
+
+from lmdt.engine import simulate_pay_schemes
+from lmdt.engine.shirking import HIRING_COST
+
+N = 50_000
+
+
+def _steady(traj, name):
+    return traj[name][:, -12:].mean(axis=1)
+
+
+def test_trajectories_are_consistent():
+    traj = simulate_pay_schemes(N, periods=24)
+    assert all(v.shape == (3, 24) for v in traj.values())
+    turnover = traj["quit_rate"] + traj["fire_rate"]
+    np.testing.assert_allclose(traj["output_per_cost"],
+                               traj["output_per_worker"] / (traj["cost_per_worker"] + HIRING_COST * turnover), rtol=1e-12)
+    # 计件制不抽查，不会有人被解雇
+    assert np.all(traj["fire_rate"][1] == 0)
+    assert np.all((traj["shirk_rate"] >= 0) & (traj["shirk_rate"] <= 1))
+
+
+def test_without_premium_efficiency_wage_is_a_time_wage():
+    shirk = _steady(simulate_pay_schemes(N, premium=1.0), "shirk_rate")
+    assert abs(shirk[2] - shirk[0]) < 0.005
+
+
+def test_monitoring_and_premium_reduce_shirking():
+    base = simulate_pay_schemes(N)
+    watched = simulate_pay_schemes(N, monitoring=0.6)
+    generous = simulate_pay_schemes(N, premium=1.4)
+    assert _steady(watched, "shirk_rate")[0] < 0.5 * _steady(base, "shirk_rate")[0]
+    # 溢价越高，效率工资下偷懒与离职越少，但人工成本上升
+    assert _steady(generous, "shirk_rate")[2] < _steady(base, "shirk_rate")[2] < _steady(base, "shirk_rate")[0]
+    assert _steady(generous, "quit_rate")[2] < _steady(base, "quit_rate")[2] < _steady(base, "quit_rate")[0]
+    assert _steady(generous, "cost_per_worker")[2] > _steady(base, "cost_per_worker")[2]
@@ -0,0 +1,49 @@
+import numpy as np
+
+from lmdt.engine.beveridge import beveridge_k
+from lmdt.engine.cohort import QUANTILES
+from lmdt.engine.transition import (
+    BASE_THETA, MATCH_EFFICIENCY, SEPARATION, SHOCK_QUARTER, sample_transitions, transition_paths,
+)
+
+
+def test_no_shock_stays_at_steady_state():
+    p = transition_paths(0, 0.5)
+    np.testing.assert_allclose(p["u"], p["u"][:, :1].repeat(p["u"].shape[1], axis=1), rtol=1e-9)
+    assert p["displaced"].max() == 0
+
+
+def test_paths_converge_to_post_shock_steady_state():
+    ai_risk = np.array([30.0, 60.0])
+    p = transition_paths(ai_risk, 0.8, quarters=120)
+    # 冲击平息后 u = s / (s + A·sqrt(θ))，A 按冲击后的 k 计算
+    a = MATCH_EFFICIENCY * np.sqrt(20 / beveridge_k(0.8, 0, ai_risk))
+    np.testing.assert_allclose(p["u"][:, -1], 100 * SEPARATION / (SEPARATION + a * np.sqrt(BASE_THETA)), rtol=1e-6)
+    np.testing.assert_array_equal(p["u"][:, :SHOCK_QUARTER], p["u"][:, :1].repeat(SHOCK_QUARTER, axis=1))
+    # 冲击越强，失业率越高
+    assert np.all(p["u"][1, SHOCK_QUARTER + 1:] > p["u"][0, SHOCK_QUARTER + 1:])
+
+
+def test_batch_rows_equal_single_runs():
+    batch = transition_paths([30, 60], [0.8, 0.3], reskill=[0, 1], min_wage=[1, 0])
+    for i, (ai_risk, mismatch, reskill, min_wage) in enumerate([(30, 0.8, 0, 1), (60, 0.3, 1, 0)]):
+        single = transition_paths(ai_risk, mismatch, reskill=reskill, min_wage=min_wage)
+        for name in ("u", "v", "displaced"):
+            np.testing.assert_allclose(batch[name][i], single[name][0], rtol=1e-12)
+
+
+def test_reskilling_works_only_after_training_lag():
+    base = transition_paths(60, 0.8)["u"][0]
+    reskill = transition_paths(60, 0.8, reskill=1, policy_quarter=4, reskill_lag=4)["u"][0]
+    first = SHOCK_QUARTER + 4 + 4   # 政策出台后再过一个培训周期
+    np.testing.assert_array_equal(base[:first + 1], reskill[:first + 1])
+    assert np.all(reskill[first + 1:] < base[first + 1:])
+
+
+def test_sampled_fan_is_reproducible_and_ordered():
+    a = sample_transitions(60, 0.8, n_paths=200, seed=3)
+    b = sample_transitions(60, 0.8, n_paths=200, seed=3)
+    np.testing.assert_array_equal(a["u"], b["u"])
+    assert a["u"].shape == (200, 41) and a["u_q"].shape == (len(QUANTILES), 41)
+    assert np.all(np.diff(a["u_q"], axis=0) >= 0)
+    np.testing.assert_allclose(a["u_q"][QUANTILES.index(0.5)], np.median(a["u"], axis=0))